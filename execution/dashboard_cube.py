@@ -0,0 +1,286 @@
+"""
+dashboard_cube.py
+5 Cypress Automation — Dashboard Analytics Service
+
+Aggregate cube for generate_dashboard.py. Everything the dashboards show
+from the data — measure totals, monthly trends, dimension breakdowns, the
+preview table — is rolled up once from the processed dataset and saved as
+aggregates.json next to it. The web, PBI and Tableau renderers read the
+cube, so rebuilding a dashboard with a new title or theme never re-reads
+the rows.
+
+The cube is stamped with the size and mtime of the data and schema files
+(or the data's Parquet part files) it was built from and is rebuilt
+automatically when either changes. An incremental processor run instead
+folds the cube of its new rows into the saved one with merge_cube() and
+restamps it.
+
+Rollups are kept as sums and counts so they can be combined:
+    measures       per measure: sum, count, min, max (mean = sum / count)
+    monthly        per month of the first date column: sum and count per measure
+    by_dimension   per group of the leading dimensions: sum per measure
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+CUBE_FILE = "aggregates.json"
+CUBE_VERSION = 1
+CUBE_DIMENSIONS = 3       # Leading dimension columns rolled up
+CUBE_MAX_GROUPS = 5_000   # Groups kept per dimension (then each measure's largest)
+PREVIEW_ROWS = 25         # Rows shown in the web dashboard's data preview table
+
+
+# ── Column Roles ──────────────────────────────────────────────────────────────
+
+def column_kinds(df: pd.DataFrame) -> dict[str, str]:
+    """numeric | datetime | other for every column, in frame order."""
+    kinds = {}
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            kinds[col] = "datetime"
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            kinds[col] = "numeric"
+        else:
+            kinds[col] = "other"
+    return kinds
+
+
+def columns_by_role(schema: dict, kinds: dict[str, str]) -> dict[str, list[str]]:
+    """Columns grouped by their inferred role from schema, or by dtype without one."""
+    roles: dict[str, list[str]] = {
+        "measures": [], "dimensions": [], "dates": [], "ids": [], "labels": []
+    }
+    if "columns" in schema:
+        for col in schema["columns"]:
+            role = col.get("suggested_role", "label")
+            name = col["name"].lower().replace(" ", "_")
+            if name in kinds:
+                if role == "measure":
+                    roles["measures"].append(name)
+                elif role == "dimension":
+                    roles["dimensions"].append(name)
+                elif role == "date":
+                    roles["dates"].append(name)
+                elif role == "id":
+                    roles["ids"].append(name)
+                else:
+                    roles["labels"].append(name)
+    else:
+        # Fallback: infer from dtypes
+        for col, kind in kinds.items():
+            if kind == "numeric":
+                roles["measures"].append(col)
+            elif kind == "datetime":
+                roles["dates"].append(col)
+            else:
+                roles["dimensions"].append(col)
+    return roles
+
+
+def rollup_columns(schema: dict) -> list[str] | None:
+    """Columns the cube reads (measures, dimensions, dates); None = all of them."""
+    if "columns" not in schema:
+        return None
+    return [
+        col["name"].lower().replace(" ", "_")
+        for col in schema["columns"]
+        if col.get("suggested_role") in ("measure", "dimension", "date")
+    ]
+
+
+# ── Build ─────────────────────────────────────────────────────────────────────
+
+def build_cube(df: pd.DataFrame, schema: dict, preview: pd.DataFrame, source: dict) -> dict[str, Any]:
+    """
+    Roll up `df` (at least the rollup_columns) in one grouped pass per axis.
+    `preview` is the first rows of every column; `source` is source_stamp().
+    """
+    kinds = column_kinds(df)
+    roles = columns_by_role(schema, kinds)
+    measures = [c for c in roles["measures"] if kinds[c] == "numeric"]
+
+    values = df[measures]
+    totals = values.sum()
+    counts = values.count()
+    lows, highs = values.min(), values.max()
+    measure_stats = {
+        m: {
+            "sum": _scalar(totals[m]), "count": int(counts[m]),
+            "min": _scalar(lows[m]), "max": _scalar(highs[m]),
+        }
+        for m in measures
+    }
+
+    monthly = None
+    if roles["dates"] and measures:
+        date_col = roles["dates"][0]
+        period = pd.to_datetime(df[date_col], errors="coerce").dt.to_period("M")
+        grouped = values.groupby(period)
+        sums, month_counts = grouped.sum(), grouped.count()
+        monthly = {
+            "date_col": date_col,
+            "periods": [str(p) for p in sums.index],
+            "sums": {m: sums[m].tolist() for m in measures},
+            "counts": {m: month_counts[m].tolist() for m in measures},
+        }
+
+    by_dimension = {}
+    for dim in roles["dimensions"][:CUBE_DIMENSIONS]:
+        if not measures:
+            break
+        grouped = values.groupby(df[dim], observed=True).sum()
+        kept = _top_groups(grouped)
+        by_dimension[dim] = {
+            "groups": len(grouped),
+            "labels": kept.index.astype(str).tolist(),
+            "sums": {m: kept[m].tolist() for m in measures},
+            "totals": {m: _scalar(grouped[m].sum()) for m in measures},
+        }
+
+    return {
+        "version": CUBE_VERSION,
+        "source": source,
+        "row_count": len(df),
+        "kinds": kinds,
+        "measures": measure_stats,
+        "monthly": monthly,
+        "by_dimension": by_dimension,
+        "preview_html": preview.head(PREVIEW_ROWS).to_html(index=False, classes='', border=0, na_rep='—'),
+    }
+
+
+def _top_groups(grouped: pd.DataFrame) -> pd.DataFrame:
+    """Groups in the CUBE_MAX_GROUPS largest of any measure, in their original order."""
+    if len(grouped) <= CUBE_MAX_GROUPS:
+        return grouped
+    keep = pd.Series(False, index=grouped.index)
+    for m in grouped.columns:
+        keep[grouped[m].nlargest(CUBE_MAX_GROUPS).index] = True
+    return grouped[keep.to_numpy()]
+
+
+def merge_cube(cube: dict, delta: dict, source: dict) -> dict[str, Any]:
+    """
+    Fold `delta`, the cube of newly appended rows, into `cube`; both come
+    from build_cube() with the same schema. Only the rollups are touched:
+    appended rows never reach a full preview table, so it is kept. Dimension
+    groups keep their order, new ones follow; past the group cap the merged
+    count of groups is a lower bound.
+    """
+    measures = dict(cube["measures"])
+    for m, new in delta["measures"].items():
+        old = measures.get(m)
+        if old is None or old["count"] == 0:
+            measures[m] = new
+        elif new["count"]:
+            measures[m] = {
+                "sum": old["sum"] + new["sum"], "count": old["count"] + new["count"],
+                "min": min(old["min"], new["min"]), "max": max(old["max"], new["max"]),
+            }
+
+    monthly = cube["monthly"]
+    if monthly is None or delta["monthly"] is None:
+        monthly = monthly or delta["monthly"]
+    else:
+        periods = sorted(set(monthly["periods"]) | set(delta["monthly"]["periods"]))
+        monthly = {
+            "date_col": monthly["date_col"],
+            "periods": periods,
+            "sums": _add_by_label(periods, monthly, delta["monthly"], "sums"),
+            "counts": _add_by_label(periods, monthly, delta["monthly"], "counts"),
+        }
+
+    by_dimension = dict(cube["by_dimension"])
+    for dim, new in delta["by_dimension"].items():
+        old = by_dimension.get(dim)
+        if old is None:
+            by_dimension[dim] = new
+            continue
+        known = set(old["labels"])
+        labels = old["labels"] + [label for label in new["labels"] if label not in known]
+        merged = pd.DataFrame(_add_by_label(labels, old, new, "sums"), index=labels)
+        kept = _top_groups(merged)
+        by_dimension[dim] = {
+            "groups": max(old["groups"], new["groups"], len(labels)),
+            "labels": kept.index.tolist(),
+            "sums": {m: kept[m].tolist() for m in kept.columns},
+            "totals": {m: old["totals"].get(m, 0) + new["totals"].get(m, 0)
+                       for m in {**old["totals"], **new["totals"]}},
+        }
+
+    return {
+        **cube,
+        "source": source,
+        "row_count": cube["row_count"] + delta["row_count"],
+        "kinds": {**cube["kinds"], **{c: k for c, k in delta["kinds"].items() if c not in cube["kinds"]}},
+        "measures": measures,
+        "monthly": monthly,
+        "by_dimension": by_dimension,
+    }
+
+
+def _add_by_label(labels: list[str], old: dict, new: dict, key: str) -> dict[str, list]:
+    """Per-measure lists over `labels`, adding old[key] and new[key] label by label."""
+    totals = {}
+    for m in {**old[key], **new[key]}:
+        by_label = dict.fromkeys(labels, 0)
+        for side in (old, new):
+            side_labels = side["labels"] if "labels" in side else side["periods"]
+            for label, value in zip(side_labels, side[key].get(m, [])):
+                by_label[label] += value
+        totals[m] = list(by_label.values())
+    return totals
+
+
+def _scalar(value: Any) -> Any:
+    """NumPy scalar → plain Python for JSON; NaN (empty column) → None."""
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+# ── Persist ───────────────────────────────────────────────────────────────────
+
+def parquet_parts(path: Path) -> list[Path]:
+    """
+    The files of a Parquet dataset directory, in row order (part names sort
+    by the order they were written), or [path] for a single Parquet file.
+    Names starting with "." or "_" (files still being written, metadata)
+    are skipped, as pyarrow skips them.
+    """
+    if not path.is_dir():
+        return [path]
+    return sorted(p for p in path.iterdir() if p.is_file() and p.name[0] not in "._")
+
+
+def source_stamp(*paths: Path) -> dict[str, dict]:
+    """Size and mtime of the files a cube is built from (summed over a dataset's parts)."""
+    stamp = {}
+    for path in paths:
+        if path.exists():
+            stats = [part.stat() for part in parquet_parts(path)]
+            stamp[path.name] = {"size": sum(s.st_size for s in stats),
+                                "mtime_ns": max((s.st_mtime_ns for s in stats), default=0)}
+    return stamp
+
+
+def load_cube(path: Path, source: dict) -> dict | None:
+    """The saved cube, or None when missing, unreadable or built from other data."""
+    try:
+        cube = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if cube.get("version") != CUBE_VERSION or cube.get("source") != source:
+        return None
+    return cube
+
+
+def save_cube(cube: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(cube), encoding="utf-8")
+    tmp.replace(path)
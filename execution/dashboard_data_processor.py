@@ -9,21 +9,48 @@ Usage:
     python execution/dashboard_data_processor.py \
         --client nexairi \
         --file clients/nexairi/data/raw/sales_data.csv \
-        [--dry-run]
+        [--dry-run] [--chunk-size 250000] [--csv] [--incremental]
+
+Large CSVs (over MAX_FILE_SIZE_MB, or any CSV with --chunk-size) are processed
+in fixed-size row chunks: the column profile is built incrementally and each
+chunk is cleaned and appended to the output, so peak memory stays bounded by
+the chunk size. Output matches the in-memory path.
+
+The canonical output is cleaned_data.parquet, a Parquet dataset directory:
+typed columns, categories dictionary-encoded, dates as timestamps.
+generate_dashboard.py reads it with column projection. Pass --csv for a CSV copy; without pyarrow installed the
+processor falls back to writing CSV only.
+
+With --incremental, a run also saves a snapshot (refresh_state.pkl) and the
+next --incremental run only profiles and cleans rows of the file that are not
+in it — matched on the --dedupe-on columns, or whole rows — so a monthly
+re-export costs about one month of processing. The new rows are appended to
+the cleaned data and folded into the schema statistics and the dashboard's
+aggregate cube; each refresh adds one part file to cleaned_data.parquet
+rather than rewriting it. Rows repeated from earlier exports are skipped,
+not counted as duplicates.
 
 Output:
     clients/{client}/data/processed/
-        ├── cleaned_data.csv          ← Dashboard-ready dataset
+        ├── cleaned_data.parquet/     ← Dashboard-ready dataset (typed): part-00000.parquet, ...
+        ├── cleaned_data.csv          ← Same data as CSV (--csv, or no pyarrow)
         ├── data_quality_report.md    ← Human-readable quality report
         ├── schema.json               ← Column types, roles, stats
-        └── processing_summary.json   ← Processing metadata
+        ├── processing_summary.json   ← Processing metadata
+        └── refresh_state.pkl         ← Snapshot for the next --incremental run
 """
 
 import argparse
+import io
 import json
 import os
+import pickle
+import shutil
 import sys
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 from datetime import datetime, date
 from pathlib import Path
 from typing import Any
@@ -38,6 +65,18 @@ import pandas as pd
 import numpy as np
 from pydantic import BaseModel, field_validator, model_validator
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+sys.path.insert(0, str(Path(__file__).parent))
+from dashboard_cube import (
+    CUBE_FILE, PREVIEW_ROWS, build_cube, load_cube, merge_cube, parquet_parts, save_cube, source_stamp,
+)
+
 # ── Logging ──────────────────────────────────────────────────────────────────
 logging.basicConfig(
     level=logging.INFO,
@@ -51,6 +90,54 @@ SUPPORTED_EXTENSIONS = {".csv", ".xlsx", ".xls"}
 MAX_FILE_SIZE_MB = 100  # Warn if file exceeds this
 NULL_THRESHOLD = 0.10   # Flag columns with >10% nulls
 DUPLICATE_STRATEGY = "drop_exact"  # drop_exact | flag_only
+DEFAULT_CHUNK_ROWS = 250_000  # Rows per chunk in streaming mode
+UNIQUE_EXACT_CAP = 100_000    # Distinct values tracked exactly per column, then HyperLogLog
+PROFILE_HEAD_ROWS = 100       # Leading non-null values kept per column for type sniffing
+BOOLEAN_TOKENS = {"true", "false", "yes", "no", "1", "0", "y", "n"}
+CLEANED_TYPES = {"date", "currency", "category"}  # Inferred types that change how a column is stored
+REFRESH_STATE_FILE = "refresh_state.pkl"  # Snapshot an --incremental run refreshes from
+REFRESH_STATE_VERSION = 1
+PARQUET_PART = "part-{:05d}.parquet"  # Part files of cleaned_data.parquet, one per full run or refresh
+
+try:  # pandas >= 2.2
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pragma: no cover
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+
+def _is_text_dtype(dtype: Any) -> bool:
+    """object (pandas 2) or the dedicated str dtype pandas 3 uses for strings."""
+    return dtype == object or isinstance(dtype, pd.StringDtype)
+
+
+def _normalize_columns(columns: pd.Index) -> pd.Index:
+    """Normalize column names (lowercase, underscores, strip special chars)."""
+    return (
+        columns.str.strip()
+        .str.lower()
+        .str.replace(r"[^\w\s]", "", regex=True)
+        .str.replace(r"\s+", "_", regex=True)
+    )
+
+
+def _all_boolean(values: pd.Series) -> bool:
+    """True when every value spells a boolean (True/false, yes/no, y/n, 1/0)."""
+    return set(values.astype(str).str.lower().unique()) <= BOOLEAN_TOKENS
+
+
+def _value_kind(series: pd.Series) -> str:
+    """What read_csv made of a column in one chunk: empty | bool | int | float | string."""
+    if series.isna().all():
+        return "empty"
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return "bool"
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return "int"
+    if pd.api.types.is_float_dtype(series.dtype):
+        return "float"
+    if pd.api.types.infer_dtype(series, skipna=True) == "boolean":
+        return "bool"  # True/False with NaN comes back as object
+    return "string"
 
 # ── Pydantic Models ───────────────────────────────────────────────────────────
 
@@ -60,6 +147,25 @@ class ProcessorConfig(BaseModel):
     file_path: Path
     dry_run: bool = False
     sheet_name: str | None = None  # For multi-sheet Excel files
+    chunk_size: int | None = None  # Rows per chunk; None = load the whole file
+    write_csv: bool = False        # Also write cleaned_data.csv next to the Parquet file
+    workers: int = 1               # Processes for per-column work (profiling, cleaning)
+    dedupe_keys: list[str] | None = None  # Columns that identify a duplicate; None = whole row
+    incremental: bool = False      # Process only rows not in the last snapshot (see refresh())
+
+    @field_validator("workers")
+    @classmethod
+    def workers_positive(cls, v: int) -> int:
+        if v < 1:
+            raise ValueError("workers must be at least 1")
+        return v
+
+    @field_validator("chunk_size")
+    @classmethod
+    def chunk_size_positive(cls, v: int | None) -> int | None:
+        if v is not None and v < 1:
+            raise ValueError("chunk_size must be a positive number of rows")
+        return v
 
     @field_validator("client_id")
     @classmethod
@@ -85,9 +191,16 @@ class ProcessorConfig(BaseModel):
     def check_file_size(self) -> "ProcessorConfig":
         size_mb = self.file_path.stat().st_size / (1024 * 1024)
         if size_mb > MAX_FILE_SIZE_MB:
-            log.warning(
-                f"Large file detected: {size_mb:.1f}MB. Processing may be slow."
-            )
+            if self.chunk_size is None and self.file_path.suffix.lower() == ".csv":
+                self.chunk_size = DEFAULT_CHUNK_ROWS
+                log.warning(
+                    f"Large file detected: {size_mb:.1f}MB. "
+                    f"Streaming in chunks of {DEFAULT_CHUNK_ROWS:,} rows."
+                )
+            else:
+                log.warning(
+                    f"Large file detected: {size_mb:.1f}MB. Processing may be slow."
+                )
         return self
 
 
@@ -118,6 +231,306 @@ class DataQualityReport(BaseModel):
     warnings: list[str]
     errors: list[str]
 
+# ── Streaming Building Blocks ─────────────────────────────────────────────────
+
+class HyperLogLog:
+    """Approximate distinct counter fed with 64-bit hashes (~0.8% error at p=14)."""
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        idx = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes << np.uint64(self.p)
+        # Leading zeros of the remaining bits, exact via two 32-bit halves
+        hi = (rest >> np.uint64(32)).astype(np.float64)
+        lo = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        with np.errstate(divide="ignore"):
+            lz = np.where(hi > 0, 31 - np.floor(np.log2(hi)),
+                          np.where(lo > 0, 63 - np.floor(np.log2(lo)), 64 - self.p))
+        rank = np.minimum(lz + 1, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def count(self) -> int:
+        m = len(self.registers)
+        estimate = (0.7213 / (1 + 1.079 / m)) * m * m / np.sum(np.exp2(-self.registers.astype(float)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # linear counting for small cardinalities
+        return int(round(estimate))
+
+
+class ColumnProfile:
+    """
+    Column statistics gathered in a single pass over the values.
+
+    Holds everything analyze() and type inference need: row and null counts,
+    the distinct count, the first PROFILE_HEAD_ROWS non-null values and
+    whether every value looks boolean. Chunks are profiled independently (in
+    parallel if need be) and folded together with merge(), which counts
+    distinct values exactly via 64-bit hashes up to `unique_cap`, then with
+    HyperLogLog.
+    """
+
+    def __init__(self, name: str, unique_cap: int | None = UNIQUE_EXACT_CAP):
+        self.name = name
+        self.dtype: Any = None
+        self.rows = 0
+        self.null_count = 0
+        self.head: list[Any] = []
+        self.bool_like = True
+        self.unique_cap = unique_cap
+        self._unique = 0
+        self._distinct: Any = None  # distinct values of a from_series() profile, for merge()
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._hll: HyperLogLog | None = None
+
+    @classmethod
+    def from_series(cls, series: pd.Series, keep_distinct: bool = True) -> "ColumnProfile":
+        """
+        Exact profile of a whole column or one chunk of it. Pass
+        keep_distinct=False when the profile will not be merged, so a worker
+        process does not send every distinct value back.
+        """
+        profile = cls(series.name, unique_cap=None)
+        profile.dtype = series.dtype
+        profile.rows = len(series)
+        values = series.dropna()
+        profile.null_count = len(series) - len(values)
+        head = values.iloc[:PROFILE_HEAD_ROWS]
+        profile.head = head.tolist()
+        distinct = values.unique()
+        profile._unique = len(distinct)
+        # The head rules out almost every non-boolean column before the full check
+        profile.bool_like = _all_boolean(head) and _all_boolean(pd.Series(distinct))
+        profile._distinct = distinct if keep_distinct else None
+        return profile
+
+    def merge(self, other: "ColumnProfile") -> None:
+        """Fold in the from_series() profile of the next chunk of this column."""
+        self.dtype = other.dtype
+        self.rows += other.rows
+        self.null_count += other.null_count
+        if len(self.head) < PROFILE_HEAD_ROWS:
+            self.head.extend(other.head[: PROFILE_HEAD_ROWS - len(self.head)])
+        self.bool_like = self.bool_like and other.bool_like
+
+        distinct = _canonical(pd.Series(other._distinct))
+        hashes = pd.util.hash_pandas_object(distinct, index=False).to_numpy()
+        if self._hll is not None:
+            self._hll.add_hashes(hashes)
+            return
+        self._hashes = pd.unique(np.concatenate([self._hashes, hashes]))
+        self._unique = len(self._hashes)
+        if self.unique_cap is not None and self._unique > self.unique_cap:
+            self._hll = HyperLogLog()
+            self._hll.add_hashes(self._hashes)
+            self._hashes = None
+
+    @property
+    def unique_count(self) -> int:
+        return self._hll.count() if self._hll is not None else self._unique
+
+    @property
+    def head_series(self) -> pd.Series:
+        """Leading non-null values with the column's dtype."""
+        try:
+            return pd.Series(self.head, dtype=self.dtype)
+        except (TypeError, ValueError):
+            return pd.Series(self.head)
+
+
+class FingerprintSet:
+    """
+    Set of 64-bit row fingerprints kept as sorted NumPy runs, 8 bytes per
+    distinct row. Runs are merged like a binary counter, so each lookup
+    touches O(log n) arrays.
+    """
+
+    def __init__(self):
+        self._runs: list[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(r) for r in self._runs)
+
+    @classmethod
+    def from_array(cls, hashes: np.ndarray) -> "FingerprintSet":
+        """Restore a set saved with to_array()."""
+        seen = cls()
+        if len(hashes):
+            seen._runs.append(np.sort(np.asarray(hashes, dtype=np.uint64)))
+        return seen
+
+    def to_array(self) -> np.ndarray:
+        """Every fingerprint in the set, sorted."""
+        return np.sort(np.concatenate(self._runs)) if self._runs else np.empty(0, dtype=np.uint64)
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """Add fingerprints; return a mask that is True where one is new."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        new = ~pd.Series(hashes).duplicated().to_numpy()
+        for run in self._runs:
+            pos = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            new &= run[pos] != hashes
+        if new.any():
+            self._runs.append(np.sort(hashes[new]))
+            while len(self._runs) > 1 and len(self._runs[-2]) <= len(self._runs[-1]):
+                last = self._runs.pop()
+                self._runs[-1] = np.sort(np.concatenate([self._runs[-1], last]))
+        return new
+
+
+class FingerprintCounts:
+    """
+    Multiset of 64-bit row fingerprints: how many copies of each row an
+    earlier run processed. take() matches a file's rows against those
+    copies one for one, so copies beyond them count as new rows.
+    """
+
+    def __init__(self):
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._counts = np.empty(0, dtype=np.int64)
+        self._left = self._counts
+        self._added: list[np.ndarray] = []
+
+    @classmethod
+    def from_array(cls, hashes: np.ndarray) -> "FingerprintCounts":
+        """Restore counts saved with to_array()."""
+        seen = cls()
+        seen._keys, seen._counts = np.unique(np.asarray(hashes, dtype=np.uint64), return_counts=True)
+        seen._left = seen._counts.copy()
+        return seen
+
+    def to_array(self) -> np.ndarray:
+        """One fingerprint per copy, sorted."""
+        return np.sort(np.concatenate([np.repeat(self._keys, self._counts), *self._added]))
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Count one more copy of each row."""
+        self._added.append(np.asarray(hashes, dtype=np.uint64))
+
+    def take(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Mask that is True where a row matches a copy the earlier run
+        processed and not yet taken; those copies are used up.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        taken = np.zeros(len(hashes), dtype=bool)
+        if not len(self._keys):
+            return taken
+        pos = np.minimum(np.searchsorted(self._keys, hashes), len(self._keys) - 1)
+        hit = self._keys[pos] == hashes
+        slots = pos[hit]
+        # Copies of one row within this batch are matched in order
+        rank = pd.Series(slots).groupby(slots).cumcount().to_numpy()
+        matched = rank < self._left[slots]
+        taken[hit] = matched
+        used, n = np.unique(slots[matched], return_counts=True)
+        self._left[used] -= n
+        return taken
+
+
+def _canonical(values: pd.Series) -> pd.Series:
+    """
+    One representation per value, whatever dtype the column loaded as, for
+    hashing: datetimes at one resolution, bools as objects (as True/False
+    with blanks loads), ints as floats (as ints with blanks load) and -0.0
+    folded into 0.0.
+    """
+    if pd.api.types.is_datetime64_dtype(values.dtype) and values.dtype != "datetime64[ns]":
+        return values.astype("datetime64[us]")  # s/ms/us: whichever a chunk parsed to
+    if pd.api.types.is_bool_dtype(values.dtype):
+        return values.astype(object)
+    if pd.api.types.is_integer_dtype(values.dtype) and (values.empty or values.abs().max() < 2**53):
+        return values.astype("float64")
+    if pd.api.types.is_float_dtype(values.dtype):
+        return values + 0.0
+    return values
+
+
+def _row_fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """
+    64-bit hash per row, equal for rows drop_duplicates() treats as equal.
+    Columns are hashed one at a time and folded together, so no row tuples
+    or frame copies are built. Datetimes are hashed at one resolution, -0.0
+    is folded into 0.0, and mixed object columns also hash each value's type
+    (1 and "1" are different values). A value hashes the same whatever its
+    column's dtype (ints as floats, bools as objects), so fingerprints from
+    files that typed a column differently still match.
+    """
+    fingerprints = np.zeros(len(df), dtype=np.uint64)
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        parts = [_canonical(col)]
+        if col.dtype == object and pd.api.types.infer_dtype(col, skipna=True) not in ("string", "boolean", "empty"):
+            parts.append(col.map(lambda v: type(v).__name__))
+        for part in parts:
+            # categorize=False: factorizing first only pays off on low-cardinality text
+            hashes = pd.util.hash_pandas_object(part, index=False, categorize=False).to_numpy()
+            # boost::hash_combine, widened to 64 bits
+            fingerprints ^= hashes + np.uint64(0x9E3779B97F4A7C15) + (fingerprints << np.uint64(6)) + (fingerprints >> np.uint64(2))
+    return fingerprints
+
+
+class CleanStats:
+    """Per-column outcomes of date/currency conversion, summed over chunks."""
+
+    def __init__(self):
+        self.nat_counts: dict[str, int] = {}
+        self.date_errors: dict[str, str] = {}
+        self.has_time: set[str] = set()
+        self.numeric_dtypes: dict[str, set] = {}
+
+    def add(self, col: str, outcome: dict[str, Any]) -> None:
+        """Record what _clean_column() reported for one column of one frame."""
+        if "nat" in outcome:
+            self.nat_counts[col] = self.nat_counts.get(col, 0) + outcome["nat"]
+        if "error" in outcome:
+            self.date_errors.setdefault(col, outcome["error"])
+        if outcome.get("has_time"):
+            self.has_time.add(col)
+        if "numeric_dtype" in outcome:
+            self.numeric_dtypes.setdefault(col, set()).add(outcome["numeric_dtype"])
+
+
+def _clean_column(series: pd.Series, kind: str | None, date_format: str | None = None,
+                  track_time: bool = False) -> tuple[pd.Series, dict[str, Any]]:
+    """
+    Clean one column: strip whitespace, then parse dates or currency as
+    `kind` says. Runs in a worker process when cleaning in parallel, so it
+    takes and returns a single column rather than the frame. The outcome
+    dict feeds CleanStats.add().
+    """
+    outcome: dict[str, Any] = {}
+
+    # Strip leading/trailing whitespace (True/False with blanks also loads
+    # as object, but has nothing to strip)
+    if _is_text_dtype(series.dtype) and pd.api.types.infer_dtype(series, skipna=True) != "boolean":
+        series = series.str.strip()
+
+    if kind == "date":
+        try:
+            series = pd.to_datetime(series, errors="coerce", **({"format": date_format} if date_format else {}))
+            outcome["nat"] = int(series.isna().sum())
+            if track_time:
+                parsed = series.dropna()
+                outcome["has_time"] = bool((parsed != parsed.dt.normalize()).any())
+        except Exception as e:
+            outcome["error"] = str(e)
+
+    # Parse currency (strip $, commas, spaces)
+    elif kind == "currency" and _is_text_dtype(series.dtype):
+        series = pd.to_numeric(
+            series.astype(str).str.replace(r"[$,€£\s]", "", regex=True).str.strip(),
+            errors="coerce",
+        )
+        outcome["numeric_dtype"] = series.dtype
+
+    return series, outcome
+
+
 # ── Core Processor ────────────────────────────────────────────────────────────
 
 class DashboardDataProcessor:
@@ -132,17 +545,55 @@ class DashboardDataProcessor:
         self.warnings: list[str] = []
         self.errors: list[str] = []
         self.col_schemas: list[ColumnSchema] = []
+        self.profiles: dict[str, ColumnProfile] = {}
+        self.row_count_raw = 0
+        self.row_count_clean = 0
+        self.duplicate_rows_removed = 0
+        self.clean_columns: list[str] = []
         self.output_dir = (
             Path("clients") / config.client_id / "data" / "processed"
         )
+        # Chunked mode: dtypes settled by the dtype scan, applied to every chunk
+        self._columns: list[str] = []
+        self._parse_dtypes: dict[str, Any] = {}
+        self._casts: dict[str, Any] = {}
+        # Incremental mode: fingerprints of cleaned rows (dedupe) and raw rows (already seen)
+        self._seen = FingerprintSet()
+        self._raw_seen: FingerprintCounts | None = None
+        self._stats = CleanStats()
+        self._refresh_state: dict[str, Any] | None = None
+        self._float_columns: set[str] = set()
+
+    @property
+    def chunked(self) -> bool:
+        """True when the file is streamed in chunks instead of loaded whole."""
+        return self.config.chunk_size is not None and self.config.file_path.suffix.lower() == ".csv"
+
+    @property
+    def writes_csv(self) -> bool:
+        """CSV is an export option, or the fallback when pyarrow is missing."""
+        return self.config.write_csv or not PARQUET_AVAILABLE
 
     # ── Load ─────────────────────────────────────────────────────────────────
 
-    def load(self) -> pd.DataFrame:
-        """Load raw data from CSV or Excel."""
+    def load(self) -> pd.DataFrame | None:
+        """
+        Load raw data from CSV or Excel. In chunked mode this only scans the
+        file to settle column dtypes; analyze() and clean() stream the rows.
+        """
         path = self.config.file_path
         log.info(f"Loading: {path}")
 
+        if self.chunked:
+            self._scan_dtypes()
+            log.info(
+                f"Scanned {self.row_count_raw:,} rows × {len(self._columns)} columns "
+                f"(chunks of {self.config.chunk_size:,} rows)"
+            )
+            return None
+        if self.config.chunk_size is not None:
+            log.warning("Chunked mode supports CSV only; loading the Excel file in memory.")
+
         if path.suffix.lower() == ".csv":
             df = pd.read_csv(path, low_memory=False)
         else:
@@ -160,43 +611,87 @@ class DashboardDataProcessor:
 
         log.info(f"Loaded {len(df):,} rows × {len(df.columns)} columns")
         self.df_raw = df
+        self.row_count_raw = len(df)
         return df
 
+    def _scan_dtypes(self) -> None:
+        """
+        Chunked mode, first pass: settle one dtype per column. read_csv infers
+        dtypes per chunk, so a column can come back int in one chunk and
+        float or str in the next; this picks what a whole-file read would.
+        """
+        kinds: dict[str, set[str]] = {}
+        has_nulls: dict[str, bool] = {}
+        rows = 0
+        for chunk in pd.read_csv(self.config.file_path, chunksize=self.config.chunk_size):
+            rows += len(chunk)
+            for col in chunk.columns:
+                kinds.setdefault(col, set()).add(_value_kind(chunk[col]))
+                has_nulls[col] = has_nulls.get(col, False) or bool(chunk[col].isna().any())
+
+        self._columns = list(kinds)
+        self.row_count_raw = rows
+        for col, col_kinds in kinds.items():
+            col_kinds = col_kinds - {"empty"}
+            if "string" in col_kinds or ("bool" in col_kinds and len(col_kinds) > 1):
+                self._parse_dtypes[col] = str
+            elif col_kinds == {"int"}:
+                if has_nulls[col]:
+                    self._casts[col] = "float64"
+            elif col_kinds == {"int", "float"}:
+                self._casts[col] = "float64"
+            elif col_kinds == {"bool"} and has_nulls[col]:
+                self._casts[col] = object
+
+    def _iter_chunks(self, usecols: list[str] | None = None):
+        """Yield raw chunks with the dtypes settled by _scan_dtypes()."""
+        reader = pd.read_csv(
+            self.config.file_path,
+            chunksize=self.config.chunk_size,
+            dtype={c: t for c, t in self._parse_dtypes.items() if usecols is None or c in usecols} or None,
+            usecols=usecols,
+        )
+        for chunk in reader:
+            for col, dtype in self._casts.items():
+                if col in chunk.columns:
+                    chunk[col] = chunk[col].astype(dtype)
+            yield chunk
+
     # ── Infer Types ───────────────────────────────────────────────────────────
 
-    def _infer_column_type(self, series: pd.Series, col_name: str) -> tuple[str, str]:
+    def _infer_column_type(self, profile: ColumnProfile, col_name: str) -> tuple[str, str]:
         """
         Returns (inferred_type, suggested_role).
         inferred_type: date | currency | numeric | category | text | id | boolean
         suggested_role: dimension | measure | date | id | label
         """
         col_lower = col_name.lower()
-        sample = series.dropna()
+        sample = profile.head_series
+        row_count = max(profile.rows, 1)
 
         # Boolean detection
-        unique_vals = set(sample.astype(str).str.lower().unique())
-        if unique_vals <= {"true", "false", "yes", "no", "1", "0", "y", "n"}:
+        if profile.bool_like:
             return "boolean", "dimension"
 
         # ID column heuristic
         id_keywords = ["id", "key", "code", "uuid", "ref", "number", "num", "#"]
         if any(kw in col_lower for kw in id_keywords):
-            if series.nunique() / max(len(series), 1) > 0.8:
+            if profile.unique_count / row_count > 0.8:
                 return "id", "id"
 
         # Date detection
         date_keywords = ["date", "time", "day", "month", "year", "period", "week", "at", "on"]
         if any(kw in col_lower for kw in date_keywords):
             try:
-                pd.to_datetime(sample.head(100), infer_datetime_format=True)
+                pd.to_datetime(sample.head(100))
                 return "date", "date"
             except Exception:
                 pass
-        if pd.api.types.is_datetime64_any_dtype(series):
+        if pd.api.types.is_datetime64_any_dtype(profile.dtype):
             return "date", "date"
 
         # Numeric types
-        if pd.api.types.is_numeric_dtype(series):
+        if pd.api.types.is_numeric_dtype(profile.dtype):
             currency_keywords = ["price", "cost", "revenue", "sales", "amount", "total",
                                   "fee", "charge", "payment", "balance", "profit", "margin",
                                   "spend", "budget", "invoice", "earning", "wage", "salary"]
@@ -205,7 +700,7 @@ class DashboardDataProcessor:
             return "numeric", "measure"
 
         # Try parsing numeric from string (e.g., "$1,234.56")
-        if series.dtype == object:
+        if _is_text_dtype(profile.dtype):
             cleaned = sample.astype(str).str.replace(r"[$,€£%\s]", "", regex=True)
             try:
                 pd.to_numeric(cleaned.head(100))
@@ -217,9 +712,9 @@ class DashboardDataProcessor:
                 pass
 
         # Category vs. free text
-        if series.dtype == object:
-            cardinality_ratio = series.nunique() / max(len(series), 1)
-            if cardinality_ratio < 0.15 or series.nunique() <= 30:
+        if _is_text_dtype(profile.dtype):
+            cardinality_ratio = profile.unique_count / row_count
+            if cardinality_ratio < 0.15 or profile.unique_count <= 30:
                 return "category", "dimension"
             return "text", "label"
 
@@ -227,23 +722,62 @@ class DashboardDataProcessor:
 
     # ── Quality Analysis ──────────────────────────────────────────────────────
 
+    def _column_pool(self):
+        """Process pool for per-column work; a no-op context on one worker."""
+        if self.config.workers > 1:
+            return ProcessPoolExecutor(max_workers=self.config.workers)
+        return nullcontext()
+
+    @staticmethod
+    def _profile_columns(df: pd.DataFrame, pool: ProcessPoolExecutor | None,
+                         keep_distinct: bool = True) -> list[ColumnProfile]:
+        """Profile every column of `df`, one task per column when a pool is given."""
+        profile = partial(ColumnProfile.from_series, keep_distinct=keep_distinct)
+        columns = [df.iloc[:, i] for i in range(df.shape[1])]
+        if pool is None:
+            return [profile(s) for s in columns]
+        return list(pool.map(profile, columns))
+
     def analyze(self) -> list[ColumnSchema]:
         """Build ColumnSchema for every column and flag issues."""
-        df = self.df_raw
+        with self._column_pool() as pool:
+            if self.chunked:
+                profiles: dict[str, ColumnProfile] = {}
+                for chunk in self._iter_chunks():
+                    for col, chunk_profile in zip(chunk.columns, self._profile_columns(chunk, pool)):
+                        profiles.setdefault(col, ColumnProfile(col)).merge(chunk_profile)
+            else:
+                # Incremental runs keep mergeable profiles for the next refresh
+                keep = self.config.incremental
+                profiles = dict(zip(
+                    self.df_raw.columns,
+                    self._profile_columns(self.df_raw, pool, keep_distinct=keep),
+                ))
+                if keep:
+                    for col, whole in profiles.items():
+                        profiles[col] = ColumnProfile(col)
+                        profiles[col].merge(whole)
+        self.profiles = profiles
+        return self._build_schemas()
+
+    def _build_schemas(self, pinned: dict[str, tuple[str, str]] | None = None) -> list[ColumnSchema]:
+        """
+        ColumnSchema and quality warnings for every profiled column. `pinned`
+        maps columns to the (inferred_type, suggested_role) their stored rows
+        were cleaned as; a refresh keeps those when re-inferring would clean
+        or store the column differently.
+        """
         schemas = []
 
-        for col in df.columns:
-            series = df[col]
-            null_count = int(series.isna().sum())
-            null_pct = null_count / max(len(series), 1)
-            unique_count = int(series.nunique(dropna=True))
-            inferred_type, suggested_role = self._infer_column_type(series, col)
-
-            sample_vals = (
-                series.dropna()
-                .head(5)
-                .tolist()
-            )
+        for col, profile in self.profiles.items():
+            null_count = profile.null_count
+            null_pct = null_count / max(profile.rows, 1)
+            unique_count = profile.unique_count
+            inferred_type, suggested_role = self._infer_column_type(profile, col)
+            if pinned and {inferred_type, pinned[col][0]} & CLEANED_TYPES:
+                inferred_type, suggested_role = pinned[col]
+
+            sample_vals = profile.head[:5]
             # Make sample values JSON-serializable
             sample_vals = [
                 str(v) if isinstance(v, (pd.Timestamp, date)) else v
@@ -260,7 +794,7 @@ class DashboardDataProcessor:
                     f"Column '{col}': {null_pct:.0%} nulls ({null_count:,} rows)"
                 )
 
-            if unique_count == 1 and len(series) > 1:
+            if unique_count == 1 and profile.rows > 1:
                 flagged = True
                 flag_reason = "Only one unique value — this column may not be useful"
                 self.warnings.append(f"Column '{col}': only one unique value '{sample_vals[0] if sample_vals else ''}'")
@@ -272,7 +806,7 @@ class DashboardDataProcessor:
 
             schema = ColumnSchema(
                 name=col,
-                dtype_raw=str(series.dtype),
+                dtype_raw=str(profile.dtype),
                 inferred_type=inferred_type,
                 suggested_role=suggested_role,
                 null_count=null_count,
@@ -289,70 +823,530 @@ class DashboardDataProcessor:
 
     # ── Clean ────────────────────────────────────────────────────────────────
 
-    def clean(self) -> pd.DataFrame:
+    def clean(self) -> pd.DataFrame | None:
         """Apply standard cleaning operations."""
+        if self.chunked:
+            self._clean_chunked()
+            return None
+
+        dedupe_keys = self._dedupe_keys()
         df = self.df_raw.copy()
         raw_rows = len(df)
+        stats = self._stats
+        with self._column_pool() as pool:
+            df = self._clean_frame(df, stats, pool=pool)
+        self._add_conversion_warnings(stats)
 
-        # Strip leading/trailing whitespace from string columns
-        str_cols = df.select_dtypes(include="object").columns
-        df[str_cols] = df[str_cols].apply(lambda s: s.str.strip() if s.dtype == "object" else s)
+        # Remove duplicate rows
+        df, dupes_removed = self._drop_duplicates(df, self._seen, dedupe_keys)
+        self._add_duplicate_warning(dupes_removed, dedupe_keys)
+
+        # Remove completely empty rows
+        df = df.dropna(how="all")
+
+        clean_rows = len(df)
+        log.info(f"Cleaned: {raw_rows:,} → {clean_rows:,} rows ({raw_rows - clean_rows:,} removed)")
+        self.df_clean = df
+        self._float_columns = self._float_columns_of(df)
+        self.row_count_clean = clean_rows
+        self.clean_columns = list(df.columns)
+        return df
+
+    def _clean_frame(self, df: pd.DataFrame, stats: CleanStats,
+                     date_formats: dict[str, str | None] | None = None,
+                     pool: ProcessPoolExecutor | None = None) -> pd.DataFrame:
+        """
+        Rename, strip and convert one frame (the whole file or one chunk).
+        Conversion outcomes are added to `stats` rather than warned about, so
+        chunks can be summed first. Pass `date_formats` to pin each date
+        column's format instead of letting pandas guess it per frame. With a
+        pool, each column that needs work is cleaned in a worker process.
+        """
+        df.columns = _normalize_columns(df.columns)
 
-        # Normalize column names (lowercase, underscores, strip special chars)
-        df.columns = (
-            df.columns.str.strip()
-            .str.lower()
-            .str.replace(r"[^\w\s]", "", regex=True)
-            .str.replace(r"\s+", "_", regex=True)
+        kinds = {
+            schema.name.strip().lower().replace(" ", "_"): schema.inferred_type
+            for schema in self.col_schemas
+            if schema.inferred_type in ("date", "currency")
+        }
+        work = [
+            i for i, col in enumerate(df.columns)
+            if col in kinds or _is_text_dtype(df.iloc[:, i].dtype)
+        ]
+        names = [df.columns[i] for i in work]
+        args = (
+            [df.iloc[:, i] for i in work],
+            [kinds.get(col) for col in names],
+            [(date_formats or {}).get(col) for col in names],
+            [date_formats is not None] * len(work),
         )
+        results = pool.map(_clean_column, *args) if pool else map(_clean_column, *args)
+        for i, col, (series, outcome) in zip(work, names, results):
+            df.isetitem(i, series)
+            stats.add(col, outcome)
 
-        # Parse date columns
-        for schema in self.col_schemas:
-            col_normalized = (
-                schema.name.strip().lower()
-                .replace(" ", "_")
-            )
-            if schema.inferred_type == "date" and col_normalized in df.columns:
-                try:
-                    df[col_normalized] = pd.to_datetime(
-                        df[col_normalized], infer_datetime_format=True, errors="coerce"
-                    )
-                    nat_count = df[col_normalized].isna().sum()
-                    if nat_count > 0:
-                        self.warnings.append(
-                            f"Column '{col_normalized}': {nat_count} dates could not be parsed (set to NaT)"
-                        )
-                except Exception as e:
-                    self.warnings.append(f"Could not parse dates in '{col_normalized}': {e}")
-
-        # Parse currency columns (strip $, commas, spaces)
+        return df
+
+    def _add_conversion_warnings(self, stats: CleanStats) -> None:
         for schema in self.col_schemas:
             col_normalized = schema.name.strip().lower().replace(" ", "_")
-            if schema.inferred_type == "currency" and col_normalized in df.columns:
-                if df[col_normalized].dtype == object:
-                    df[col_normalized] = (
-                        df[col_normalized]
-                        .astype(str)
-                        .str.replace(r"[$,€£\s]", "", regex=True)
-                        .str.strip()
-                    )
-                    df[col_normalized] = pd.to_numeric(df[col_normalized], errors="coerce")
+            if col_normalized in stats.date_errors:
+                self.warnings.append(
+                    f"Could not parse dates in '{col_normalized}': {stats.date_errors[col_normalized]}"
+                )
+            elif stats.nat_counts.get(col_normalized, 0) > 0:
+                self.warnings.append(
+                    f"Column '{col_normalized}': {stats.nat_counts[col_normalized]} dates could not be parsed (set to NaT)"
+                )
 
-        # Remove duplicate rows
-        before = len(df)
-        df = df.drop_duplicates()
-        dupes_removed = before - len(df)
-        if dupes_removed > 0:
+    def _dedupe_keys(self) -> list[str] | None:
+        """Normalized dedupe key columns, checked against the file's columns."""
+        if not self.config.dedupe_keys:
+            return None
+        keys = list(_normalize_columns(pd.Index(self.config.dedupe_keys)))
+        columns = set(_normalize_columns(pd.Index([s.name for s in self.col_schemas])))
+        unknown = [k for k, key in zip(self.config.dedupe_keys, keys) if key not in columns]
+        if unknown:
+            raise ValueError(f"Dedupe key column(s) not in file: {', '.join(unknown)}")
+        return keys
+
+    @staticmethod
+    def _drop_duplicates(df: pd.DataFrame, seen: FingerprintSet,
+                         keys: list[str] | None = None) -> tuple[pd.DataFrame, int]:
+        """
+        Drop rows whose fingerprint (over `keys`, or every column) is already
+        in `seen`, keeping the first. Returns the frame and the rows dropped.
+        """
+        new = seen.add(_row_fingerprints(df[keys] if keys else df))
+        return df[new], int((~new).sum())
+
+    def _add_duplicate_warning(self, dupes_removed: int, keys: list[str] | None = None) -> None:
+        self.duplicate_rows_removed = dupes_removed
+        if dupes_removed > 0 and keys:
+            self.warnings.append(f"Removed {dupes_removed:,} rows with duplicate {', '.join(keys)}")
+        elif dupes_removed > 0:
             self.warnings.append(f"Removed {dupes_removed:,} exact duplicate rows")
 
-        # Remove completely empty rows
-        df = df.dropna(how="all")
+    def _date_formats(self) -> dict[str, str | None]:
+        """
+        One format per date column, guessed from its first non-null value the
+        way pandas does for a whole column; "mixed" when no format fits.
+        """
+        formats: dict[str, str | None] = {}
+        for schema in self.col_schemas:
+            if schema.inferred_type != "date":
+                continue
+            head = self.profiles[schema.name].head
+            if head and isinstance(head[0], str):
+                formats[schema.name.strip().lower().replace(" ", "_")] = (
+                    guess_datetime_format(head[0].strip()) or "mixed"
+                )
+        return formats
 
-        clean_rows = len(df)
+    def _clean_chunked(self) -> None:
+        """
+        Chunked mode: clean each chunk and append it to partial output files
+        that export() moves into place. Duplicates are dropped across chunks
+        by row fingerprint.
+        """
+        with self._column_pool() as pool:
+            self._clean_chunks(pool)
+
+    def _clean_chunks(self, pool: ProcessPoolExecutor | None) -> None:
+        dedupe_keys = self._dedupe_keys()
+        date_formats = self._date_formats()
+
+        # Settle converted dtypes first: currency columns go int64 or float64
+        # and dates print with or without a time depending on the whole column
+        converted = [s.name for s in self.col_schemas if s.inferred_type in ("date", "currency")]
+        settled = CleanStats()
+        if converted:
+            for chunk in self._iter_chunks(usecols=converted):
+                self._clean_frame(chunk, settled, date_formats, pool)
+        float_cols = [c for c, dtypes in settled.numeric_dtypes.items() if len(dtypes) > 1]
+        date_cols = [c for c in date_formats]
+
+        out = parquet = None
+        arrow_schema = None
+        if not self.config.dry_run:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            if self.writes_csv:
+                out = open(self.output_dir / "cleaned_data.csv.partial", "w", newline="", encoding="utf-8")
+
+        stats = self._stats
+        seen = self._seen
+        dupes_removed = clean_rows = 0
+        header = True
+        try:
+            for chunk in self._iter_chunks():
+                chunk = self._clean_frame(chunk, stats, date_formats, pool)
+                for col in float_cols:
+                    chunk[col] = chunk[col].astype("float64")
+
+                chunk, dropped = self._drop_duplicates(chunk, seen, dedupe_keys)
+                dupes_removed += dropped
+                chunk = chunk.dropna(how="all")
+                clean_rows += len(chunk)
+                self.clean_columns = list(chunk.columns)
+                self._float_columns |= self._float_columns_of(chunk)
+
+                if not self.config.dry_run and PARQUET_AVAILABLE:
+                    table = self._to_arrow(chunk, arrow_schema)
+                    if parquet is None:
+                        arrow_schema = table.schema
+                        parquet = pq.ParquetWriter(self.output_dir / "cleaned_data.parquet.partial", arrow_schema)
+                    parquet.write_table(table)
+                if out:
+                    for col in date_cols:
+                        if col in chunk.columns and pd.api.types.is_datetime64_any_dtype(chunk[col].dtype):
+                            fmt = "%Y-%m-%d %H:%M:%S" if col in settled.has_time else "%Y-%m-%d"
+                            chunk[col] = chunk[col].dt.strftime(fmt)
+                    chunk.to_csv(out, header=header, index=False)
+                    header = False
+        finally:
+            if out:
+                out.close()
+            if parquet:
+                parquet.close()
+
+        self._add_conversion_warnings(stats)
+        self._add_duplicate_warning(dupes_removed, dedupe_keys)
+        self.row_count_clean = clean_rows
+        raw_rows = self.row_count_raw
         log.info(f"Cleaned: {raw_rows:,} → {clean_rows:,} rows ({raw_rows - clean_rows:,} removed)")
+
+    # ── Parquet ───────────────────────────────────────────────────────────────
+
+    def _to_arrow(self, df: pd.DataFrame, schema: "pa.Schema | None" = None) -> "pa.Table":
+        """
+        Arrow table for the whole cleaned frame or one chunk. Category columns
+        are dictionary-encoded. Chunks are cast to the first chunk's schema so
+        every row group in the file agrees.
+        """
+        inferred = {
+            s.name.strip().lower().replace(" ", "_"): s.inferred_type for s in self.col_schemas
+        }
+        df = df.copy(deep=False)
+        for col in df.columns:
+            if inferred.get(col) == "category":
+                df[col] = df[col].astype("category")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if schema is None:
+            schema = self._arrow_schema(table, inferred)
+        return table.cast(schema)
+
+    @staticmethod
+    def _arrow_schema(table: "pa.Table", inferred: dict[str, str]) -> "pa.Schema":
+        """
+        Widen a first-chunk schema so later chunks fit: int32 dictionary
+        indices (pandas picks int8 for small categories) and real types for
+        columns that happened to be all-null in the first chunk.
+        """
+        null_types = {
+            "numeric": pa.float64(), "currency": pa.float64(),
+            "boolean": pa.bool_(), "date": pa.timestamp("ns"),
+        }
+        fields = []
+        for field in table.schema:
+            if pa.types.is_dictionary(field.type):
+                values = pa.string() if pa.types.is_null(field.type.value_type) else field.type.value_type
+                field = field.with_type(pa.dictionary(pa.int32(), values))
+            elif pa.types.is_null(field.type):
+                field = field.with_type(null_types.get(inferred.get(field.name), pa.string()))
+            fields.append(field)
+        return pa.schema(fields, metadata=table.schema.metadata)
+
+    # ── Incremental Refresh ───────────────────────────────────────────────────
+
+    def _read_text(self):
+        """Yield the raw file as untyped text ("" for blanks), in chunks for CSV."""
+        path = self.config.file_path
+        if path.suffix.lower() == ".csv":
+            yield from pd.read_csv(path, dtype=str, keep_default_na=False,
+                                   chunksize=self.config.chunk_size or DEFAULT_CHUNK_ROWS)
+            return
+        yield pd.read_excel(path, sheet_name=self.config.sheet_name or 0, dtype=str).fillna("")
+
+    def _raw_fingerprints(self, text: pd.DataFrame) -> np.ndarray:
+        """
+        Fingerprints of raw rows over the dedupe keys, or every column. Taken
+        from the text, so a column that types differently in a new export
+        (ints one month, floats the next) still matches.
+        """
+        keys = self._dedupe_keys()
+        if keys is None:
+            return _row_fingerprints(text)
+        normalized = _normalize_columns(text.columns)
+        return _row_fingerprints(text.loc[:, normalized.isin(keys)])
+
+    @staticmethod
+    def _float_columns_of(df: pd.DataFrame) -> set[str]:
+        return {col for col in df.columns if pd.api.types.is_float_dtype(df[col].dtype)}
+
+    def _load_refresh_state(self) -> dict[str, Any] | None:
+        """
+        The snapshot a refresh extends, or None (reason logged) when there is
+        none or it no longer fits this file and options, so the whole file is
+        processed instead.
+        """
+        path = self.output_dir / REFRESH_STATE_FILE
+        if not path.exists():
+            log.info("No snapshot to refresh yet; processing the whole file.")
+            return None
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+
+        file_path = self.config.file_path
+        if file_path.suffix.lower() == ".csv":
+            header = pd.read_csv(file_path, nrows=0).columns.tolist()
+        else:
+            header = pd.read_excel(file_path, sheet_name=self.config.sheet_name or 0, nrows=0).columns.tolist()
+        outputs = [self.output_dir / "cleaned_data.parquet"] if PARQUET_AVAILABLE else []
+        if self.writes_csv:
+            outputs.append(self.output_dir / "cleaned_data.csv")
+        missing = [o.name for o in outputs if not o.exists()]
+
+        reason = None
+        if state.get("version") != REFRESH_STATE_VERSION:
+            reason = "it was saved by another version"
+        elif state["columns"] != header:
+            reason = "the file's columns changed"
+        elif state["dedupe_keys"] != self.config.dedupe_keys:
+            reason = "--dedupe-on changed"
+        elif missing:
+            reason = f"{missing[0]} is missing"
+        if reason:
+            log.warning(f"Cannot refresh the last snapshot ({reason}); processing the whole file.")
+            return None
+        return state
+
+    def refresh(self, state: dict[str, Any]) -> pd.DataFrame:
+        """
+        Incremental mode: find the rows of the file that are not in the last
+        snapshot (by --dedupe-on key, or whole row), then profile and clean
+        only those. Column profiles, schema statistics, warnings and counters
+        are updated from the snapshot's; export() appends the new rows to the
+        processed data and the aggregate cube. Column types stay as the
+        snapshot inferred them.
+        """
+        self._refresh_state = state
+        self.profiles = state["profiles"]
+        self.col_schemas = [ColumnSchema(**schema) for schema in state["schemas"]]
+        self._stats = state["stats"]
+        self._seen = FingerprintSet.from_array(state["clean_fingerprints"])
+        self._raw_seen = FingerprintCounts.from_array(state["raw_fingerprints"])
+        self._float_columns = state["float_columns"]
+        dedupe_keys = self._dedupe_keys()
+
+        # Skip as many copies of each row as the snapshot processed; further
+        # copies go through the usual dedupe, so they are counted as a full
+        # run counts them
+        new_rows = []
+        for chunk in self._read_text():
+            hashes = self._raw_fingerprints(chunk)
+            fresh = ~self._raw_seen.take(hashes)
+            new_rows.append(chunk[fresh])
+            self._raw_seen.add(hashes[fresh])
+        text = (pd.concat(new_rows, ignore_index=True) if new_rows
+                else pd.DataFrame(columns=state["columns"], dtype=str))
+        df = self._parse_new_rows(text, state["raw_dtypes"])
+        self.df_raw = df
+        self.row_count_raw = state["row_count_raw"] + len(df)
+        log.info(f"Refresh: {len(df):,} new rows since the last snapshot ({state['row_count_clean']:,} clean rows)")
+
+        pinned = {s.name: (s.inferred_type, s.suggested_role) for s in self.col_schemas}
+        with self._column_pool() as pool:
+            if len(df):
+                for col, profile in zip(df.columns, self._profile_columns(df, pool)):
+                    self.profiles[col].merge(profile)
+            self._build_schemas(pinned)
+            df = self._clean_frame(df, self._stats, state["date_formats"], pool)
+        self._add_conversion_warnings(self._stats)
+
+        df, dropped = self._drop_duplicates(df, self._seen, dedupe_keys)
+        self._add_duplicate_warning(state["duplicate_rows_removed"] + dropped, dedupe_keys)
+        df = df.dropna(how="all")
+        for col in self._float_columns - self._float_columns_of(df):
+            if pd.api.types.is_integer_dtype(df[col].dtype):
+                df[col] = df[col].astype("float64")  # int in the new rows, float in the snapshot
+        self._float_columns |= self._float_columns_of(df)
+
         self.df_clean = df
+        self.row_count_clean = state["row_count_clean"] + len(df)
+        self.clean_columns = state["clean_columns"]
         return df
 
+    @staticmethod
+    def _parse_new_rows(text: pd.DataFrame, raw_dtypes: dict[str, str]) -> pd.DataFrame:
+        """
+        Type new rows the way the snapshot's raw columns were typed rather
+        than re-inferring from a handful of rows: text stays text, numeric
+        columns are coerced (to float once blanks appear).
+        """
+        text_columns = {col: str for col, kind in raw_dtypes.items() if kind == "text"}
+        df = pd.read_csv(io.StringIO(text.to_csv(index=False)), dtype=text_columns, low_memory=False)
+        for col, kind in raw_dtypes.items():
+            if kind in ("text", "bool") or df[col].dtype == kind:
+                continue
+            if kind == "object":
+                df[col] = df[col].astype(object)
+            elif pd.api.types.is_numeric_dtype(np.dtype(kind)):
+                values = pd.to_numeric(df[col], errors="coerce")
+                df[col] = values.astype("float64" if values.isna().any() else kind)
+        return df
+
+    def _raw_dtypes(self) -> dict[str, str]:
+        """
+        How each raw column loaded, from its profile: "text", "object" (bools
+        with blanks) or the dtype name (bool, int64, float64, ...).
+        """
+        kinds = {}
+        for col, profile in self.profiles.items():
+            if not _is_text_dtype(profile.dtype):
+                kinds[col] = str(profile.dtype)
+            elif pd.api.types.infer_dtype(profile.head, skipna=True) == "boolean":
+                kinds[col] = "object"
+            else:
+                kinds[col] = "text"
+        return kinds
+
+    def _save_refresh_state(self) -> Path:
+        """Save what the next --incremental run needs to extend this output."""
+        if self._raw_seen is None:
+            # Full run: fingerprint every raw row once, as refresh() will
+            self._raw_seen = FingerprintCounts()
+            for chunk in self._read_text():
+                self._raw_seen.add(self._raw_fingerprints(chunk))
+
+        if self._refresh_state is not None:
+            date_formats = self._refresh_state["date_formats"]
+        else:
+            date_formats = self._date_formats()
+            if self.df_clean is not None:
+                # In memory, dates were parsed without tracking times
+                for col in date_formats.keys() & set(self.df_clean.columns):
+                    parsed = self.df_clean[col].dropna()
+                    if pd.api.types.is_datetime64_any_dtype(parsed.dtype) and (parsed != parsed.dt.normalize()).any():
+                        self._stats.has_time.add(col)
+
+        state = {
+            "version": REFRESH_STATE_VERSION,
+            "columns": list(self.profiles),
+            "dedupe_keys": self.config.dedupe_keys,
+            "raw_dtypes": self._raw_dtypes(),
+            "profiles": self.profiles,
+            "schemas": [s.model_dump() for s in self.col_schemas],
+            "date_formats": date_formats,
+            "stats": self._stats,
+            "float_columns": self._float_columns,
+            "raw_fingerprints": self._raw_seen.to_array(),
+            "clean_fingerprints": self._seen.to_array(),
+            "row_count_raw": self.row_count_raw,
+            "row_count_clean": self.row_count_clean,
+            "duplicate_rows_removed": self.duplicate_rows_removed,
+            "clean_columns": self.clean_columns,
+        }
+        path = self.output_dir / REFRESH_STATE_FILE
+        partial = path.with_name(path.name + ".partial")
+        with open(partial, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        partial.replace(path)
+        return path
+
+    @staticmethod
+    def _replace_parquet(path: Path, part: Path) -> None:
+        """Full run: make `part` the only part of the dataset at `path`."""
+        staging = path.with_name(path.name + ".new")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        part.replace(staging / PARQUET_PART.format(0))
+        if path.exists():
+            old = path.with_name(path.name + ".old")
+            shutil.rmtree(old, ignore_errors=True)
+            path.replace(old)
+            staging.replace(path)
+            if old.is_dir():
+                shutil.rmtree(old)
+            else:
+                old.unlink()  # A single-file output from before datasets
+        else:
+            staging.replace(path)
+
+    def _append_parquet(self, path: Path) -> None:
+        """
+        Refresh: write the new rows as the dataset's next part file; existing
+        parts are left alone. Only when the new rows came out wider (int →
+        float) are the existing parts rewritten, widened to match.
+        """
+        if path.is_file():
+            # Output from before datasets: it becomes the first part
+            single = path.with_name(path.name + ".old")
+            path.replace(single)
+            path.mkdir()
+            single.replace(path / PARQUET_PART.format(0))
+
+        parts = parquet_parts(path)
+        new = self._to_arrow(self.df_clean)
+        old_schema = pq.read_schema(parts[0])
+        schema = self._widen_schema(old_schema, new.schema)
+        if not schema.equals(old_schema):
+            for part in parts:
+                widened = pq.read_table(part).cast(schema)
+                partial = part.with_name(f".{part.name}.partial")
+                pq.write_table(widened, partial)
+                partial.replace(part)
+        if new.num_rows:
+            part = path / PARQUET_PART.format(int(parts[-1].stem.rsplit("-", 1)[1]) + 1)
+            partial = part.with_name(f".{part.name}.partial")  # Hidden from readers until complete
+            pq.write_table(new.cast(schema), partial)
+            partial.replace(part)
+
+    @staticmethod
+    def _widen_schema(old: "pa.Schema", new: "pa.Schema") -> "pa.Schema":
+        """The snapshot's schema, with int columns widened to float where the new rows need it."""
+        fields = []
+        for field in old:
+            incoming = new.field(field.name).type
+            numeric = [pa.types.is_integer(t) or pa.types.is_floating(t) for t in (field.type, incoming)]
+            if all(numeric) and not pa.types.is_floating(field.type) and pa.types.is_floating(incoming):
+                field = field.with_type(pa.float64())
+            elif not (incoming == field.type or pa.types.is_null(incoming) or all(numeric)
+                      or pa.types.is_dictionary(field.type)
+                      or (pa.types.is_timestamp(field.type) and pa.types.is_timestamp(incoming))):
+                raise ValueError(
+                    f"Column '{field.name}' changed type ({field.type} → {incoming}); "
+                    "run without --incremental to reprocess the whole file"
+                )
+            fields.append(field)
+        return pa.schema(fields, metadata=old.metadata)
+
+    def _append_csv(self, path: Path) -> None:
+        """Refresh: append the new rows, dates printed as the snapshot printed them."""
+        df = self.df_clean.copy(deep=False)
+        for col in self._refresh_state["date_formats"].keys() & set(df.columns):
+            if pd.api.types.is_datetime64_any_dtype(df[col].dtype):
+                fmt = "%Y-%m-%d %H:%M:%S" if col in self._stats.has_time else "%Y-%m-%d"
+                df[col] = df[col].dt.strftime(fmt)
+        with open(path, "a", newline="", encoding="utf-8") as out:
+            df.to_csv(out, header=False, index=False)
+
+    def _data_file(self) -> Path:
+        """The data generate_dashboard.py reads: the Parquet dataset when pyarrow is installed."""
+        return self.output_dir / ("cleaned_data.parquet" if PARQUET_AVAILABLE else "cleaned_data.csv")
+
+    def _update_cube(self, cube: dict | None, schema_data: dict) -> None:
+        """
+        Refresh: fold the new rows into the dashboard's aggregate cube. A
+        cube that was already stale, or too short to have a full preview
+        table, is left for generate_dashboard.py to rebuild.
+        """
+        if cube is None or cube["row_count"] < PREVIEW_ROWS:
+            return
+        delta = build_cube(self.df_clean, schema_data, self.df_clean.head(0), {})
+        source = source_stamp(self._data_file(), self.output_dir / "schema.json")
+        save_cube(merge_cube(cube, delta, source), self.output_dir / CUBE_FILE)
+        log.info(f"Updated aggregate cube: +{len(self.df_clean):,} rows")
+
     # ── Export ────────────────────────────────────────────────────────────────
 
     def export(self) -> dict[str, Path]:
@@ -363,12 +1357,38 @@ class DashboardDataProcessor:
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
         outputs: dict[str, Path] = {}
-
-        # 1. Cleaned CSV
-        clean_csv = self.output_dir / "cleaned_data.csv"
-        self.df_clean.to_csv(clean_csv, index=False)
-        outputs["cleaned_data"] = clean_csv
-        log.info(f"Exported: {clean_csv}")
+        appending = self._refresh_state is not None
+        if appending:
+            # Find the dashboard's cube while its stamp still matches the old files
+            cube = load_cube(self.output_dir / CUBE_FILE,
+                             source_stamp(self._data_file(), self.output_dir / "schema.json"))
+
+        # 1. Cleaned data (already streamed to partial files in chunked mode,
+        #    appended to the snapshot's files on a refresh)
+        if PARQUET_AVAILABLE:
+            clean_parquet = self.output_dir / "cleaned_data.parquet"
+            if appending:
+                self._append_parquet(clean_parquet)
+            else:
+                partial = self.output_dir / "cleaned_data.parquet.partial"
+                if not self.chunked:
+                    pq.write_table(self._to_arrow(self.df_clean), partial)
+                self._replace_parquet(clean_parquet, partial)
+            outputs["cleaned_data"] = clean_parquet
+            log.info(f"Exported: {clean_parquet}")
+        else:
+            log.warning("pyarrow is not installed; writing cleaned_data.csv only.")
+
+        if self.writes_csv:
+            clean_csv = self.output_dir / "cleaned_data.csv"
+            if appending:
+                self._append_csv(clean_csv)
+            elif self.chunked:
+                (self.output_dir / "cleaned_data.csv.partial").replace(clean_csv)
+            else:
+                self.df_clean.to_csv(clean_csv, index=False)
+            outputs["cleaned_data_csv" if PARQUET_AVAILABLE else "cleaned_data"] = clean_csv
+            log.info(f"Exported: {clean_csv}")
 
         # 2. Schema JSON
         schema_json = self.output_dir / "schema.json"
@@ -388,9 +1408,9 @@ class DashboardDataProcessor:
             "client_id": self.config.client_id,
             "source_file": str(self.config.file_path),
             "processed_at": datetime.utcnow().isoformat(),
-            "row_count_raw": len(self.df_raw),
-            "row_count_clean": len(self.df_clean),
-            "col_count": len(self.df_clean.columns),
+            "row_count_raw": self.row_count_raw,
+            "row_count_clean": self.row_count_clean,
+            "col_count": len(self.clean_columns),
             "warnings": self.warnings,
             "errors": self.errors,
         }
@@ -404,6 +1424,13 @@ class DashboardDataProcessor:
         outputs["quality_report"] = report_md
         log.info(f"Exported: {report_md}")
 
+        # 5. Incremental mode: update the dashboard cube and save the new snapshot
+        if appending:
+            self._update_cube(cube, schema_data)
+        if self.config.incremental:
+            outputs["refresh_state"] = self._save_refresh_state()
+            log.info(f"Exported: {outputs['refresh_state']}")
+
         return outputs
 
     # ── Report Builder ────────────────────────────────────────────────────────
@@ -425,9 +1452,9 @@ class DashboardDataProcessor:
             f"",
             f"| Metric | Value |",
             f"|---|---|",
-            f"| Raw rows | {len(self.df_raw):,} |",
-            f"| Clean rows | {len(self.df_clean):,} |",
-            f"| Rows removed | {len(self.df_raw) - len(self.df_clean):,} |",
+            f"| Raw rows | {self.row_count_raw:,} |",
+            f"| Clean rows | {self.row_count_clean:,} |",
+            f"| Rows removed | {self.row_count_raw - self.row_count_clean:,} |",
             f"| Columns | {len(self.col_schemas)} |",
             f"| Flagged columns | {len(flagged_cols)} |",
             f"| Warnings | {len(self.warnings)} |",
@@ -478,7 +1505,7 @@ class DashboardDataProcessor:
             "1. Review all ⚠️ warnings above with the client before proceeding",
             "2. Resolve ❌ errors — do not proceed until all errors are cleared",
             "3. Confirm flagged columns are expected (or fix the data export)",
-            "4. Pass `processed/cleaned_data.csv` and `schema.json` to `generate_dashboard.py`",
+            "4. Pass `processed/cleaned_data.parquet` and `schema.json` to `generate_dashboard.py`",
         ]
 
         return "\n".join(lines)
@@ -489,9 +1516,13 @@ class DashboardDataProcessor:
         """Execute full processing pipeline."""
         log.info(f"=== Dashboard Data Processor | Client: {self.config.client_id} ===")
 
-        self.load()
-        self.analyze()
-        self.clean()
+        state = self._load_refresh_state() if self.config.incremental else None
+        if state is not None:
+            self.refresh(state)
+        else:
+            self.load()
+            self.analyze()
+            self.clean()
         outputs = self.export()
 
         # Print summary
@@ -499,7 +1530,7 @@ class DashboardDataProcessor:
         print("\n" + "=" * 60)
         print(f"  PROCESSING COMPLETE — {self.config.client_id}")
         print("=" * 60)
-        print(f"  Rows:     {len(self.df_raw):,} raw → {len(self.df_clean):,} clean")
+        print(f"  Rows:     {self.row_count_raw:,} raw → {self.row_count_clean:,} clean")
         print(f"  Columns:  {len(self.col_schemas)}")
         print(f"  Warnings: {len(self.warnings)}")
         print(f"  Errors:   {len(self.errors)}")
@@ -541,6 +1572,29 @@ def main():
         "--dry-run", action="store_true",
         help="Analyze and report without writing output files"
     )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Processes for per-column profiling and cleaning (default: 1)"
+    )
+    parser.add_argument(
+        "--dedupe-on", default=None,
+        type=lambda v: [c.strip() for c in v.split(",") if c.strip()],
+        help="Comma-separated columns that identify a duplicate row (default: all columns)"
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Process only rows not already in the last --incremental output "
+             "(matched on --dedupe-on columns, or whole rows)"
+    )
+    parser.add_argument(
+        "--csv", action="store_true",
+        help="Also write cleaned_data.csv (always written when pyarrow is not installed)"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=None,
+        help=f"Stream CSVs in chunks of N rows to bound memory "
+             f"(default: whole file; {DEFAULT_CHUNK_ROWS:,}-row chunks above {MAX_FILE_SIZE_MB}MB)"
+    )
     args = parser.parse_args()
 
     try:
@@ -549,6 +1603,11 @@ def main():
             file_path=Path(args.file),
             dry_run=args.dry_run,
             sheet_name=args.sheet,
+            chunk_size=args.chunk_size,
+            write_csv=args.csv,
+            workers=args.workers,
+            dedupe_keys=args.dedupe_on,
+            incremental=args.incremental,
         )
     except Exception as e:
         log.error(f"Configuration error: {e}")
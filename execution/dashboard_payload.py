@@ -0,0 +1,89 @@
+"""
+dashboard_payload.py
+5 Cypress Automation — Dashboard Analytics Service
+
+Chart data for the self-contained web dashboard. generate_dashboard.py
+inlines every series into dashboard.html, so what it embeds is kept small
+enough to open quickly on a client laptop whatever the dataset looks like:
+    lttb()             long time series → at most MAX_SERIES_POINTS points,
+                       keeping the peaks and dips a line chart shows
+    fold_other()       high-cardinality dimensions → top N groups + "Other"
+    compact_numbers()  values rounded for display, whole numbers as ints
+    encode_payload()   minified JSON, safe inside a <script> block
+
+The encoded payload should fit in PAYLOAD_BUDGET_BYTES; the generator halves
+the series length until it does (down to MIN_SERIES_POINTS).
+"""
+
+import json
+import math
+from typing import Any, Sequence
+
+import numpy as np
+
+PAYLOAD_BUDGET_BYTES = 48_000  # Inlined chart data per dashboard
+MAX_SERIES_POINTS = 1_000      # Points per line series (about one per pixel of chart width)
+MIN_SERIES_POINTS = 60         # Never downsample below this to meet the budget
+TOP_CATEGORIES = 10            # Bars in a category breakdown, "Other" not counted
+OTHER_LABEL = "Other"
+
+
+def lttb(values: Sequence[float], threshold: int) -> list[int]:
+    """
+    Indices of the points Largest-Triangle-Three-Buckets keeps to draw
+    `values` (evenly spaced) with `threshold` points. The first and last
+    points are always kept; from each bucket in between, the point forming
+    the largest triangle with the previous pick and the next bucket's mean.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    y = np.asarray(values, dtype="float64")
+    every = (n - 2) / (threshold - 2)
+    picked = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start, end = int(i * every) + 1, int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = (end + next_end - 1) / 2
+        avg_y = y[end:next_end].mean()
+        xs = np.arange(start, end)
+        areas = np.abs((a - avg_x) * (y[start:end] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        picked.append(a)
+    picked.append(n - 1)
+    return picked
+
+
+def fold_other(labels: Sequence[str], values: Sequence[float], total: float,
+               groups: int, top_n: int = TOP_CATEGORIES) -> tuple[list[str], list[float]]:
+    """
+    The `top_n` largest groups, largest first, then one "Other" bar for the
+    rest. `total` and `groups` cover every group, including any the cube did
+    not keep individually.
+    """
+    order = sorted(range(len(values)), key=lambda i: values[i], reverse=True)[:top_n]
+    kept_labels = [labels[i] for i in order]
+    kept_values = [values[i] for i in order]
+    if groups > len(kept_labels):
+        kept_labels.append(OTHER_LABEL)
+        kept_values.append(total - sum(kept_values))
+    return kept_labels, kept_values
+
+
+def compact_numbers(values: Sequence[float], decimals: int = 2) -> list[Any]:
+    """Round for display; whole numbers become ints (120 not 120.0), NaN/inf null."""
+    out = []
+    for v in values:
+        if v is None or not math.isfinite(v):
+            out.append(None)
+            continue
+        v = round(float(v), decimals)
+        out.append(int(v) if v.is_integer() and abs(v) < 2**53 else v)
+    return out
+
+
+def encode_payload(data: Any) -> str:
+    """Minified JSON for a <script type="application/json"> block."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).replace("</", "<\\/")
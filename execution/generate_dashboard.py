@@ -15,7 +15,11 @@ Usage:
         [--version 1] \
         [--dry-run]
 
+    --format all (or e.g. --format web,pbi) builds several formats from one
+    load, into web/, pbi/ and tableau/ subfolders of the version folder.
+
 Output:
+    clients/{client}/data/processed/aggregates.json   (aggregate cube, reused across builds)
     clients/{client}/deliverables/dashboard-v{n}/
         Web:     dashboard.html
         PBI:     data-model.csv, dax-measures.txt, power-query.txt,
@@ -27,8 +31,11 @@ Output:
 import argparse
 import json
 import os
+import shutil
 import sys
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -43,6 +50,23 @@ import pandas as pd
 import numpy as np
 from pydantic import BaseModel, field_validator
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+sys.path.insert(0, str(Path(__file__).parent))
+from dashboard_cube import (
+    CUBE_FILE, PREVIEW_ROWS, build_cube, columns_by_role, load_cube, parquet_parts, rollup_columns,
+    save_cube, source_stamp,
+)
+from dashboard_payload import (
+    MAX_SERIES_POINTS, MIN_SERIES_POINTS, OTHER_LABEL, PAYLOAD_BUDGET_BYTES, compact_numbers,
+    encode_payload, fold_other, lttb,
+)
+
 # ── Logging ──────────────────────────────────────────────────────────────────
 logging.basicConfig(
     level=logging.INFO,
@@ -73,11 +97,13 @@ BRAND = {
     "website": "www.5cypress.com",
 }
 
+FORMATS = ("web", "pbi", "tableau")
+
 # ── Config Model ──────────────────────────────────────────────────────────────
 
 class DashboardConfig(BaseModel):
     client_id: str
-    format: str
+    format: str          # One format, a comma-separated list, or "all"
     title: str
     version: int = 1
     dry_run: bool = False
@@ -85,10 +111,16 @@ class DashboardConfig(BaseModel):
     @field_validator("format")
     @classmethod
     def valid_format(cls, v: str) -> str:
-        allowed = {"web", "pbi", "tableau"}
-        if v.lower() not in allowed:
-            raise ValueError(f"Format must be one of: {', '.join(allowed)}")
-        return v.lower()
+        requested = {f.strip() for f in v.lower().split(",") if f.strip()}
+        if requested == {"all"}:
+            requested = set(FORMATS)
+        if not requested or not requested <= set(FORMATS):
+            raise ValueError(f"Format must be one or more of: {', '.join(FORMATS)}, or all")
+        return ",".join(f for f in FORMATS if f in requested)
+
+    @property
+    def formats(self) -> list[str]:
+        return self.format.split(",")
 
     @field_validator("client_id")
     @classmethod
@@ -109,68 +141,137 @@ class DashboardGenerator:
             Path("clients") / config.client_id / "deliverables"
             / f"dashboard-v{config.version}"
         )
-        self.df: pd.DataFrame | None = None
+        self.df: pd.DataFrame | None = None      # Full table, read only for row exports
+        self.cube: dict = {}
         self.schema: dict = {}
+        self.data_path: Path | None = None
+        self.web_report: dict | None = None       # HTML and chart data size of the last web build
+        self._shared: tuple[dict, list[dict]] | None = None
+        self._rows_csv: Path | None = None        # First row export; later ones link to it
+        self._rows_lock = threading.Lock()
 
     # ── Load Processed Data ───────────────────────────────────────────────────
 
     def load(self):
-        """Load cleaned dataset and schema from processor output."""
+        """
+        Load schema and the aggregate cube for the processor output.
+
+        The cube (aggregates.json, see dashboard_cube.py) is reused while it
+        matches the data and schema files, so no rows are read. Otherwise
+        only the measure, dimension and date columns are read — from the
+        typed cleaned_data.parquet dataset (every part file) when present,
+        else cleaned_data.csv — and the cube is rebuilt and saved.
+        """
+        clean_parquet = self.processed_dir / "cleaned_data.parquet"
         clean_csv = self.processed_dir / "cleaned_data.csv"
         schema_json = self.processed_dir / "schema.json"
 
-        if not clean_csv.exists():
+        if schema_json.exists():
+            self.schema = json.loads(schema_json.read_text())
+
+        if PARQUET_AVAILABLE and clean_parquet.exists():
+            self.data_path = clean_parquet
+        elif clean_csv.exists():
+            self.data_path = clean_csv
+        else:
             raise FileNotFoundError(
-                f"Processed data not found: {clean_csv}\n"
+                f"Processed data not found: {clean_parquet} or {clean_csv}\n"
                 "Run dashboard_data_processor.py first."
             )
 
-        self.df = pd.read_csv(clean_csv, low_memory=False)
-        # Parse dates
-        for col in self.df.columns:
+        source = source_stamp(self.data_path, schema_json)
+        cube_path = self.processed_dir / CUBE_FILE
+        cube = load_cube(cube_path, source)
+        if cube is not None:
+            self.cube = cube
+            log.info(f"Loaded aggregate cube: {cube['row_count']:,} rows from {cube_path.name}")
+            return
+
+        columns = rollup_columns(self.schema)
+        df = self._read_rows(columns)
+        if columns is None:
+            self.df = df
+        self.cube = build_cube(df, self.schema, self._read_preview(), source)
+        log.info(f"Built aggregate cube: {len(df):,} rows × {len(df.columns)} cols "
+                 f"from {self.data_path.name}")
+        if not self.config.dry_run:
+            save_cube(self.cube, cube_path)
+
+    def _read_rows(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """Rows of the processed data, optionally only `columns` (kept in file order)."""
+        if self.data_path.suffix == ".parquet":
+            if columns is not None:
+                columns = [c for c in pq.read_schema(parquet_parts(self.data_path)[0]).names if c in set(columns)]
+            return pd.read_parquet(self.data_path, columns=columns)
+
+        usecols = None
+        if columns is not None:
+            header = pd.read_csv(self.data_path, nrows=0).columns
+            usecols = [c for c in header if c in set(columns)]
+        return self._parse_dates(pd.read_csv(self.data_path, usecols=usecols, low_memory=False))
+
+    def _read_preview(self) -> pd.DataFrame:
+        """First PREVIEW_ROWS rows, every column."""
+        if self.data_path.suffix == ".parquet":
+            batches = []
+            for part in parquet_parts(self.data_path):
+                wanted = PREVIEW_ROWS - sum(b.num_rows for b in batches)
+                if wanted <= 0:
+                    break
+                first = next(pq.ParquetFile(part).iter_batches(batch_size=wanted), None)
+                if first is not None:
+                    batches.append(first)
+            if batches:
+                return pa.Table.from_batches(batches).to_pandas()
+            return pd.read_parquet(self.data_path).head(0)
+        return self._parse_dates(pd.read_csv(self.data_path, nrows=PREVIEW_ROWS, low_memory=False))
+
+    @staticmethod
+    def _parse_dates(df: pd.DataFrame) -> pd.DataFrame:
+        """CSV has no types: parse columns named like dates."""
+        for col in df.columns:
             if "date" in col.lower() or "time" in col.lower():
                 try:
-                    self.df[col] = pd.to_datetime(self.df[col], errors="coerce")
+                    df[col] = pd.to_datetime(df[col], errors="coerce")
                 except Exception:
                     pass
-
-        if schema_json.exists():
-            self.schema = json.loads(schema_json.read_text())
-
-        log.info(f"Loaded processed data: {len(self.df):,} rows × {len(self.df.columns)} cols")
+        return df
+
+    def _rows(self) -> pd.DataFrame:
+        """The full table, for the PBI/Tableau data exports."""
+        if self.df is None:
+            self.df = self._read_rows()
+        return self.df
+
+    def _write_rows(self, path: Path) -> None:
+        """
+        Export the full table as CSV. The first export is serialised; any
+        later one in the same run (PBI and Tableau both ship the data) is a
+        hard link to it, or a file copy where links aren't supported.
+        """
+        with self._rows_lock:
+            if self._rows_csv is None:
+                self._rows().to_csv(path, index=False)
+                self._rows_csv = path
+                return
+        path.unlink(missing_ok=True)
+        try:
+            os.link(self._rows_csv, path)
+        except OSError:
+            shutil.copyfile(self._rows_csv, path)
 
     # ── Identify Column Roles ─────────────────────────────────────────────────
 
     def _get_columns_by_role(self) -> dict[str, list[str]]:
         """Returns columns grouped by their inferred role from schema."""
-        roles: dict[str, list[str]] = {
-            "measures": [], "dimensions": [], "dates": [], "ids": [], "labels": []
-        }
-        if "columns" in self.schema:
-            for col in self.schema["columns"]:
-                role = col.get("suggested_role", "label")
-                name = col["name"].lower().replace(" ", "_")
-                if name in self.df.columns:
-                    if role == "measure":
-                        roles["measures"].append(name)
-                    elif role == "dimension":
-                        roles["dimensions"].append(name)
-                    elif role == "date":
-                        roles["dates"].append(name)
-                    elif role == "id":
-                        roles["ids"].append(name)
-                    else:
-                        roles["labels"].append(name)
-        else:
-            # Fallback: infer from dtypes
-            for col in self.df.columns:
-                if pd.api.types.is_numeric_dtype(self.df[col]):
-                    roles["measures"].append(col)
-                elif pd.api.types.is_datetime64_any_dtype(self.df[col]):
-                    roles["dates"].append(col)
-                else:
-                    roles["dimensions"].append(col)
-        return roles
+        return columns_by_role(self.schema, self.cube["kinds"])
+
+    def _roles_and_kpis(self) -> tuple[dict, list[dict]]:
+        """Column roles and KPI cards, computed once and shared by every format."""
+        if self._shared is None:
+            roles = self._get_columns_by_role()
+            self._shared = (roles, self._compute_kpis(roles))
+        return self._shared
 
     # ── Compute KPIs ──────────────────────────────────────────────────────────
 
@@ -180,20 +281,15 @@ class DashboardGenerator:
         measures = roles["measures"][:6]  # Cap at 6 KPIs
 
         for col in measures:
-            series = self.df[col].dropna()
-            if len(series) == 0:
+            # The cube only rolls up numeric measures (datetimes can't be summed)
+            stats = self.cube["measures"].get(col)
+            if not stats or stats["count"] == 0:
                 continue
 
-            # Skip datetime columns — they can't be summed
-            if pd.api.types.is_datetime64_any_dtype(series):
-                continue
-            if not pd.api.types.is_numeric_dtype(series):
-                continue
-
-            total = series.sum()
-            mean = series.mean()
-            max_val = series.max()
-            min_val = series.min()
+            total = stats["sum"]
+            mean = stats["sum"] / stats["count"]
+            max_val = stats["max"]
+            min_val = stats["min"]
 
             # Detect if currency-like
             is_currency = any(
@@ -231,68 +327,111 @@ class DashboardGenerator:
 
     # ── Build Trend Data ──────────────────────────────────────────────────────
 
-    def _build_trend_data(self, roles: dict) -> dict | None:
-        """Build monthly trend for the first date + measure combination."""
+    def _build_trend_data(self, roles: dict, max_points: int = MAX_SERIES_POINTS) -> dict | None:
+        """
+        Build the trend for the first date + measure combination, one point
+        per period, downsampled with LTTB past `max_points`.
+        """
         if not roles["dates"] or not roles["measures"]:
             return None
 
-        date_col = roles["dates"][0]
+        monthly = self.cube["monthly"]
         measure_col = roles["measures"][0]
+        if not monthly or measure_col not in monthly["sums"]:
+            return None
 
-        df_trend = self.df[[date_col, measure_col]].dropna()
-        df_trend[date_col] = pd.to_datetime(df_trend[date_col], errors="coerce")
-        df_trend = df_trend.dropna(subset=[date_col])
-        df_trend["period"] = df_trend[date_col].dt.to_period("M")
-
-        monthly = (
-            df_trend.groupby("period")[measure_col]
-            .sum()
-            .reset_index()
-            .sort_values("period")
-        )
-
-        if len(monthly) < 2:
+        # Months with no values for this measure are not plotted
+        points = [
+            (period, total)
+            for period, total, count in zip(
+                monthly["periods"], monthly["sums"][measure_col], monthly["counts"][measure_col]
+            )
+            if count
+        ]
+        if len(points) < 2:
             return None
 
+        kept = [points[i] for i in lttb([v for _, v in points], max_points)]
         return {
-            "labels": [str(p) for p in monthly["period"]],
-            "values": [round(v, 2) for v in monthly[measure_col]],
+            "labels": [period for period, _ in kept],
+            "values": compact_numbers([v for _, v in kept]),
             "measure_label": measure_col.replace("_", " ").title(),
+            "points": len(points),
         }
 
     # ── Build Category Breakdown ──────────────────────────────────────────────
 
     def _build_category_data(self, roles: dict) -> dict | None:
-        """Build a category breakdown for the first dimension + measure pair."""
+        """
+        Build a category breakdown for the first dimension + measure pair:
+        the largest groups, then the rest folded into one "Other" bar.
+        """
         if not roles["dimensions"] or not roles["measures"]:
             return None
 
         dim_col = roles["dimensions"][0]
         measure_col = roles["measures"][0]
+        rollup = self.cube["by_dimension"].get(dim_col)
+        if not rollup or measure_col not in rollup["sums"]:
+            return None
 
-        grouped = (
-            self.df.groupby(dim_col)[measure_col]
-            .sum()
-            .reset_index()
-            .sort_values(measure_col, ascending=False)
-            .head(10)
+        labels, values = fold_other(
+            rollup["labels"], rollup["sums"][measure_col],
+            total=rollup["totals"][measure_col] or 0, groups=rollup["groups"],
         )
-
         return {
-            "labels": grouped[dim_col].astype(str).tolist(),
-            "values": [round(v, 2) for v in grouped[measure_col]],
+            "labels": labels,
+            "values": compact_numbers(values),
             "dimension_label": dim_col.replace("_", " ").title(),
             "measure_label": measure_col.replace("_", " ").title(),
         }
 
+    def _chart_payload(self, roles: dict) -> tuple[dict | None, dict | None, str]:
+        """
+        Trend and category data for the web dashboard, plus the JSON the page
+        inlines for them. The trend is halved until that JSON fits
+        PAYLOAD_BUDGET_BYTES or reaches MIN_SERIES_POINTS.
+        """
+        category = self._build_category_data(roles)
+        if category:
+            colors = [BRAND["primary_light"], BRAND["accent"], BRAND["primary_mid"],
+                      BRAND["accent_light"], "#A78BFA", "#60A5FA", "#F472B6",
+                      "#34D399", "#FBBF24", "#F87171"]
+            category["colors"] = [
+                BRAND["text_muted"] if label == OTHER_LABEL else colors[i % len(colors)]
+                for i, label in enumerate(category["labels"])
+            ]
+
+        max_points = MAX_SERIES_POINTS
+        while True:
+            trend = self._build_trend_data(roles, max_points)
+            data = {}
+            if trend:
+                data["trend"] = {k: trend[k] for k in ("labels", "values", "measure_label")}
+            if category:
+                data["category"] = {k: category[k] for k in ("labels", "values", "measure_label", "colors")}
+            encoded = encode_payload(data)
+            size = len(encoded.encode("utf-8"))
+            if size <= PAYLOAD_BUDGET_BYTES or not trend or len(trend["labels"]) <= MIN_SERIES_POINTS:
+                break
+            max_points = max(MIN_SERIES_POINTS, len(trend["labels"]) // 2)
+        if size > PAYLOAD_BUDGET_BYTES:
+            log.warning(f"Chart data is {size:,} bytes, over the {PAYLOAD_BUDGET_BYTES:,}-byte budget")
+        return trend, category, encoded
+
+    def _format_dir(self, fmt: str) -> Path:
+        """Output folder for one format; a multi-format run gives each its own subfolder."""
+        if len(self.config.formats) == 1:
+            return self.output_dir
+        return self.output_dir / fmt
+
     # ── WEB DASHBOARD ─────────────────────────────────────────────────────────
 
     def generate_web(self) -> Path:
         """Generate a self-contained HTML dashboard."""
-        roles = self._get_columns_by_role()
-        kpis = self._compute_kpis(roles)
-        trend = self._build_trend_data(roles)
-        category = self._build_category_data(roles)
+        roles, kpis = self._roles_and_kpis()
+        out_dir = self._format_dir("web")
+        trend, category, chart_data = self._chart_payload(roles)
 
         kpi_html = ""
         for kpi in kpis[:4]:
@@ -310,14 +449,14 @@ class DashboardGenerator:
             new Chart(document.getElementById('trendChart'), {{
                 type: 'line',
                 data: {{
-                    labels: {json.dumps(trend['labels'])},
+                    labels: DATA.trend.labels,
                     datasets: [{{
-                        label: '{trend["measure_label"]}',
-                        data: {json.dumps(trend['values'])},
+                        label: DATA.trend.measure_label,
+                        data: DATA.trend.values,
                         borderColor: '{BRAND["primary_light"]}',
                         backgroundColor: '{BRAND["primary_light"]}22',
                         borderWidth: 2,
-                        pointRadius: 3,
+                        pointRadius: {3 if len(trend['labels']) <= MIN_SERIES_POINTS else 0},
                         tension: 0.4,
                         fill: true,
                     }}]
@@ -343,18 +482,15 @@ class DashboardGenerator:
         category_js = ""
         category_section = ""
         if category:
-            colors = [BRAND["primary_light"], BRAND["accent"], BRAND["primary_mid"],
-                      BRAND["accent_light"], "#A78BFA", "#60A5FA", "#F472B6",
-                      "#34D399", "#FBBF24", "#F87171"]
             category_js = f"""
             new Chart(document.getElementById('categoryChart'), {{
                 type: 'bar',
                 data: {{
-                    labels: {json.dumps(category['labels'])},
+                    labels: DATA.category.labels,
                     datasets: [{{
-                        label: '{category["measure_label"]}',
-                        data: {json.dumps(category['values'])},
-                        backgroundColor: {json.dumps(colors[:len(category['labels'])])},
+                        label: DATA.category.measure_label,
+                        data: DATA.category.values,
+                        backgroundColor: DATA.category.colors,
                         borderRadius: 4,
                     }}]
                 }},
@@ -378,7 +514,7 @@ class DashboardGenerator:
             </div>"""
 
         now = datetime.utcnow().strftime("%B %Y")
-        row_count = f"{len(self.df):,}"
+        row_count = f"{self.cube['row_count']:,}"
 
         html = f"""<!DOCTYPE html>
 <html lang="en">
@@ -387,7 +523,7 @@ class DashboardGenerator:
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
 <title>{self.config.title}</title>
 <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Playfair+Display:wght@600;700&display=swap" rel="stylesheet">
-<script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
+<script defer src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
 <style>
   *, *::before, *::after {{ box-sizing: border-box; margin: 0; padding: 0; }}
   :root {{
@@ -574,7 +710,7 @@ class DashboardGenerator:
   <!-- Data Preview Table -->
   <div class="data-table-card">
     <h3>Data Preview (first 25 rows)</h3>
-    {self.df.head(25).to_html(index=False, classes='', border=0, na_rep='—')}
+    {self.cube['preview_html']}
   </div>
 
 </div>
@@ -584,40 +720,66 @@ class DashboardGenerator:
   &nbsp;·&nbsp; {now} &nbsp;·&nbsp; {row_count} records processed
 </footer>
 
+<script type="application/json" id="chartData">{chart_data}</script>
 <script>
+// Chart.js is deferred so the page paints before it loads; charts draw once it has
+document.addEventListener('DOMContentLoaded', () => {{
+  const DATA = JSON.parse(document.getElementById('chartData').textContent);
 {trend_js}
 {category_js}
+  // Time from open to first paint, and to the first frame with charts drawn
+  requestAnimationFrame(() => {{
+    const paint = performance.getEntriesByName('first-contentful-paint')[0];
+    window.dashboardTiming = {{
+      firstPaintMs: paint ? Math.round(paint.startTime) : null,
+      chartsDrawnMs: Math.round(performance.now()),
+    }};
+    console.info('Dashboard timing (ms)', window.dashboardTiming);
+  }});
+}});
 </script>
 
 </body>
 </html>"""
 
+        self.web_report = {
+            "html_bytes": len(html.encode("utf-8")),
+            "chart_data_bytes": len(chart_data.encode("utf-8")),
+            "trend_points": len(trend["labels"]) if trend else 0,
+            "trend_periods": trend["points"] if trend else 0,
+        }
+        log.info(
+            f"Web dashboard: {self.web_report['html_bytes'] / 1024:.1f} KB, "
+            f"chart data {self.web_report['chart_data_bytes'] / 1024:.1f} KB, "
+            f"trend {self.web_report['trend_points']} of {self.web_report['trend_periods']} points"
+        )
+
         if not self.config.dry_run:
-            self.output_dir.mkdir(parents=True, exist_ok=True)
-            out_path = self.output_dir / "dashboard.html"
+            out_dir.mkdir(parents=True, exist_ok=True)
+            out_path = out_dir / "dashboard.html"
             out_path.write_text(html, encoding="utf-8")
             log.info(f"Web dashboard written: {out_path}")
             return out_path
         else:
             log.info("[DRY RUN] Web dashboard HTML generated (not written)")
-            return self.output_dir / "dashboard.html"
+            return out_dir / "dashboard.html"
 
     # ── PBI PREP PACKAGE ──────────────────────────────────────────────────────
 
     def generate_pbi(self) -> dict[str, Path]:
         """Generate Power BI prep package."""
-        roles = self._get_columns_by_role()
-        kpis = self._compute_kpis(roles)
+        roles, kpis = self._roles_and_kpis()
+        out_dir = self._format_dir("pbi")
 
         if not self.config.dry_run:
-            self.output_dir.mkdir(parents=True, exist_ok=True)
+            out_dir.mkdir(parents=True, exist_ok=True)
 
         outputs: dict[str, Path] = {}
 
         # 1. Data model CSV (same as cleaned data)
-        data_path = self.output_dir / "data-model.csv"
+        data_path = out_dir / "data-model.csv"
         if not self.config.dry_run:
-            self.df.to_csv(data_path, index=False)
+            self._write_rows(data_path)
         outputs["data_model"] = data_path
 
         # 2. DAX measures
@@ -659,7 +821,7 @@ class DashboardGenerator:
                 "",
             ]
 
-        dax_path = self.output_dir / "dax-measures.txt"
+        dax_path = out_dir / "dax-measures.txt"
         if not self.config.dry_run:
             dax_path.write_text("\n".join(dax_lines), encoding="utf-8")
         outputs["dax_measures"] = dax_path
@@ -699,7 +861,7 @@ class DashboardGenerator:
         else:
             pq_lines += ["in", "    PromoteHeaders"]
 
-        pq_path = self.output_dir / "power-query.txt"
+        pq_path = out_dir / "power-query.txt"
         if not self.config.dry_run:
             pq_path.write_text("\n".join(pq_lines), encoding="utf-8")
         outputs["power_query"] = pq_path
@@ -760,7 +922,7 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d')}
 - No grid lines on charts (clean look)
 - Round all measure values to 2 decimal places in card format strings
 """
-        wireframe_path = self.output_dir / "layout-wireframe.md"
+        wireframe_path = out_dir / "layout-wireframe.md"
         if not self.config.dry_run:
             wireframe_path.write_text(wireframe, encoding="utf-8")
         outputs["wireframe"] = wireframe_path
@@ -808,7 +970,7 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d')}
 - Text: "Built by 5 Cypress Automation | www.5cypress.com"
 - Font: Segoe UI, 8pt, color: #6B7280
 """
-        design_path = self.output_dir / "design-spec.md"
+        design_path = out_dir / "design-spec.md"
         if not self.config.dry_run:
             design_path.write_text(design, encoding="utf-8")
         outputs["design_spec"] = design_path
@@ -818,7 +980,7 @@ Generated: {datetime.utcnow().strftime('%Y-%m-%d')}
 Run these checks BEFORE presenting to client.
 
 ## Row Counts
-- Source CSV rows: **{len(self.df):,}**
+- Source CSV rows: **{self.cube['row_count']:,}**
 - After PBI import, confirm row count matches: _____ rows
 
 ## Totals to Verify
@@ -845,30 +1007,30 @@ Run these checks BEFORE presenting to client.
 ## Sign-off
 - [ ] Nick reviewed before client presentation
 """
-        validation_path = self.output_dir / "data-validation.md"
+        validation_path = out_dir / "data-validation.md"
         if not self.config.dry_run:
             validation_path.write_text(validation, encoding="utf-8")
         outputs["validation"] = validation_path
 
-        log.info(f"PBI prep package written to: {self.output_dir}")
+        log.info(f"PBI prep package written to: {out_dir}")
         return outputs
 
     # ── TABLEAU PREP PACKAGE ──────────────────────────────────────────────────
 
     def generate_tableau(self) -> dict[str, Path]:
         """Generate Tableau prep package."""
-        roles = self._get_columns_by_role()
-        kpis = self._compute_kpis(roles)
+        roles, kpis = self._roles_and_kpis()
+        out_dir = self._format_dir("tableau")
 
         if not self.config.dry_run:
-            self.output_dir.mkdir(parents=True, exist_ok=True)
+            out_dir.mkdir(parents=True, exist_ok=True)
 
         outputs: dict[str, Path] = {}
 
         # 1. Data source CSV
-        data_path = self.output_dir / "data-source.csv"
+        data_path = out_dir / "data-source.csv"
         if not self.config.dry_run:
-            self.df.to_csv(data_path, index=False)
+            self._write_rows(data_path)
         outputs["data_source"] = data_path
 
         # 2. Calculated fields
@@ -920,7 +1082,7 @@ Run these checks BEFORE presenting to client.
             "",
         ]
 
-        calc_path = self.output_dir / "calculated-fields.md"
+        calc_path = out_dir / "calculated-fields.md"
         if not self.config.dry_run:
             calc_path.write_text("\n".join(calc_lines), encoding="utf-8")
         outputs["calculated_fields"] = calc_path
@@ -982,7 +1144,7 @@ Horizontal layout, equal-width text sheets:
 - Apply custom color palette via Preferences.tps or Color Picker
 - Match colors to spec in design-spec.md
 """
-        wireframe_path = self.output_dir / "layout-wireframe.md"
+        wireframe_path = out_dir / "layout-wireframe.md"
         if not self.config.dry_run:
             wireframe_path.write_text(wireframe, encoding="utf-8")
         outputs["wireframe"] = wireframe_path
@@ -1019,7 +1181,7 @@ Horizontal layout, equal-width text sheets:
 ## Highlight Actions
 - Hovering over a category in the category chart highlights that category across all views
 """
-        filter_path = self.output_dir / "filter-spec.md"
+        filter_path = out_dir / "filter-spec.md"
         if not self.config.dry_run:
             filter_path.write_text(filter_spec, encoding="utf-8")
         outputs["filter_spec"] = filter_path
@@ -1056,44 +1218,70 @@ Horizontal layout, equal-width text sheets:
 - Footer text: "Built by 5 Cypress Automation | www.5cypress.com"
 - Add as floating text box, bottom-right, 8pt, #6B7280
 """
-        design_path = self.output_dir / "design-spec.md"
+        design_path = out_dir / "design-spec.md"
         if not self.config.dry_run:
             design_path.write_text(design, encoding="utf-8")
         outputs["design_spec"] = design_path
 
-        log.info(f"Tableau prep package written to: {self.output_dir}")
+        log.info(f"Tableau prep package written to: {out_dir}")
         return outputs
 
     # ── Run ───────────────────────────────────────────────────────────────────
 
+    def _render(self, fmt: str) -> dict[str, Path]:
+        if fmt == "web":
+            return {"dashboard": self.generate_web()}
+        if fmt == "pbi":
+            return self.generate_pbi()
+        if fmt == "tableau":
+            return self.generate_tableau()
+        raise ValueError(f"Unknown format: {fmt}")
+
     def run(self) -> dict[str, Path]:
+        """
+        Build every requested format from one load. Roles and KPIs are
+        computed up front; with several formats the renderers then run
+        concurrently, each writing its own subfolder. Outputs are keyed
+        as "<format>/<file key>" in that case.
+        """
         log.info(f"=== Dashboard Generator | Client: {self.config.client_id} | Format: {self.config.format} ===")
 
         self.load()
+        self._roles_and_kpis()
 
-        if self.config.format == "web":
-            out_path = self.generate_web()
-            outputs = {"dashboard": out_path}
-        elif self.config.format == "pbi":
-            outputs = self.generate_pbi()
-        elif self.config.format == "tableau":
-            outputs = self.generate_tableau()
+        formats = self.config.formats
+        if len(formats) == 1:
+            results = {formats[0]: self._render(formats[0])}
         else:
-            raise ValueError(f"Unknown format: {self.config.format}")
+            with ThreadPoolExecutor(max_workers=len(formats)) as pool:
+                results = dict(zip(formats, pool.map(self._render, formats)))
 
         print("\n" + "=" * 60)
         print(f"  DASHBOARD GENERATED — {self.config.client_id}")
         print("=" * 60)
-        print(f"  Format:  {self.config.format.upper()}")
         print(f"  Title:   {self.config.title}")
-        print(f"  Output:  {self.output_dir}/")
+        for fmt, outputs in results.items():
+            self._print_summary(fmt, outputs)
+        print("=" * 60 + "\n")
+
+        if len(formats) == 1:
+            return results[formats[0]]
+        return {f"{fmt}/{key}": path for fmt, outputs in results.items() for key, path in outputs.items()}
+
+    def _print_summary(self, fmt: str, outputs: dict[str, Path]) -> None:
+        print(f"\n  Format:  {fmt.upper()}")
+        print(f"  Output:  {self._format_dir(fmt)}/")
         print(f"  Files:")
         for key, path in outputs.items():
             print(f"    • {path.name}")
-        if self.config.format == "web":
+        if fmt == "web":
+            report = self.web_report
+            print(f"  Size:    {report['html_bytes'] / 1024:.1f} KB "
+                  f"(chart data {report['chart_data_bytes'] / 1024:.1f} KB)")
             print(f"\n  Open in browser to preview:")
             print(f"    {outputs['dashboard']}")
-        elif self.config.format == "pbi":
+            print(f"  Time to first paint is logged to the browser console (window.dashboardTiming)")
+        elif fmt == "pbi":
             print(f"\n  Next steps:")
             print(f"    1. Open Power BI Desktop")
             print(f"    2. Import data-model.csv")
@@ -1102,7 +1290,7 @@ Horizontal layout, equal-width text sheets:
             print(f"    5. Follow layout-wireframe.md to arrange visuals")
             print(f"    6. Apply design-spec.md for colors/fonts")
             print(f"    7. Run data-validation.md checklist before presenting")
-        elif self.config.format == "tableau":
+        elif fmt == "tableau":
             print(f"\n  Next steps:")
             print(f"    1. Open Tableau Desktop")
             print(f"    2. Connect to data-source.csv")
@@ -1110,9 +1298,6 @@ Horizontal layout, equal-width text sheets:
             print(f"    4. Build sheets per layout-wireframe.md")
             print(f"    5. Add filters per filter-spec.md")
             print(f"    6. Apply design-spec.md for styling")
-        print("=" * 60 + "\n")
-
-        return outputs
 
 
 # ── CLI ───────────────────────────────────────────────────────────────────────
@@ -1120,8 +1305,8 @@ Horizontal layout, equal-width text sheets:
 def main():
     parser = argparse.ArgumentParser(description="5 Cypress — Dashboard Generator")
     parser.add_argument("--client", required=True, help="Client ID")
-    parser.add_argument("--format", required=True, choices=["web", "pbi", "tableau"],
-                        help="Output format")
+    parser.add_argument("--format", required=True,
+                        help="Output format: web, pbi, tableau, a comma-separated list, or all")
     parser.add_argument("--title", required=True, help="Dashboard title")
     parser.add_argument("--version", type=int, default=1, help="Version number (default: 1)")
     parser.add_argument("--dry-run", action="store_true",
@@ -22,6 +22,13 @@ Usage:
         --zip 30022 \
         --radius 30
 
+Place Details are fetched concurrently (--workers), once per place_id per run
+even when a business matches several niches. Geocodes, text searches and
+Place Details are cached in .tmp/cache/api_cache.sqlite (geocode 180 days,
+--search-ttl-days, --details-ttl-days), so re-runs skip unchanged searches
+and their page-token sleeps and only pay for new places. --refresh re-fetches
+everything (and updates the cache); --no-cache bypasses it.
+
 Required env vars (.env):
     GOOGLE_PLACES_API_KEY   — Google Maps Places API key
     SLACK_WEBHOOK_URL       — (optional) Slack webhook for run summary
@@ -34,13 +41,20 @@ import logging
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
+import pandas as pd
 import requests
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from execution.shared.api_cache import DEFAULT_DB_PATH, ApiCache, CachePolicy, DAY
+from lead_scoring import ScoringModel, score_places
+
 load_dotenv()
 
 logging.basicConfig(
@@ -64,21 +78,42 @@ PLACE_DETAIL_FIELDS = (
     "website,rating,user_ratings_total,business_status,types,url"
 )
 
+# Per-request prices (USD); Place Details with Contact + Atmosphere fields
+GEOCODE_COST_USD = 0.005
+TEXT_SEARCH_COST_USD = 0.032
+PLACE_DETAILS_COST_USD = 0.025
+
+GEOCODE_TTL_DAYS = 180
+SEARCH_TTL_DAYS = 14
+DETAILS_TTL_DAYS = 30
+DEFAULT_DETAIL_WORKERS = 8
+
 
 # ---------------------------------------------------------------------------
 # Geocoding helpers
 # ---------------------------------------------------------------------------
 
-def zip_to_latlng(zip_code: str, api_key: str) -> Optional[tuple[float, float]]:
+def zip_to_latlng(zip_code: str, api_key: str,
+                  session: Optional[requests.Session] = None,
+                  cache: Optional[ApiCache] = None) -> Optional[tuple[float, float]]:
     """Convert a US zip code to (lat, lng) using Geocoding API."""
+    cache_key = {"address": zip_code}
+    cached = cache.get("geocode", cache_key) if cache else None
+    if cached is not None:
+        return tuple(cached)
+
     params = {"address": zip_code, "key": api_key}
-    resp = requests.get(GEOCODE_URL, params=params, timeout=10)
+    start = time.perf_counter()
+    resp = (session or requests).get(GEOCODE_URL, params=params, timeout=10)
     resp.raise_for_status()
     data = resp.json()
     if data.get("status") != "OK" or not data.get("results"):
         logger.error("Geocoding failed for zip %s: %s", zip_code, data.get("status"))
         return None
     loc = data["results"][0]["geometry"]["location"]
+    if cache:
+        cache.put("geocode", cache_key, [loc["lat"], loc["lng"]],
+                  latency_s=time.perf_counter() - start)
     return loc["lat"], loc["lng"]
 
 
@@ -87,10 +122,15 @@ def zip_to_latlng(zip_code: str, api_key: str) -> Optional[tuple[float, float]]:
 # ---------------------------------------------------------------------------
 
 def search_places(keyword: str, lat: float, lng: float, radius_meters: int,
-                  api_key: str) -> List[Dict]:
+                  api_key: str, session: Optional[requests.Session] = None,
+                  cache: Optional[ApiCache] = None) -> List[Dict]:
     """
     Text search for businesses matching `keyword` within radius.
     Handles pagination (up to 3 pages = ~60 results per keyword).
+
+    With a `cache`, the results of a fully-paginated search are stored as
+    one entry; page tokens expire within minutes, so pages are never cached
+    individually.
     """
     results = []
     params = {
@@ -98,18 +138,25 @@ def search_places(keyword: str, lat: float, lng: float, radius_meters: int,
         "location": f"{lat},{lng}",
         "radius": radius_meters,
         "type": "establishment",
-        "key": api_key,
     }
+    cached = cache.get("text_search", params) if cache else None
+    if cached is not None:
+        logger.info("  Found %d raw results for keyword: %s (cached)", len(cached), keyword)
+        return cached
+    cache_key = dict(params)
+    params["key"] = api_key
 
     page = 0
     next_page_token = None
+    complete = False
+    start = time.perf_counter()
 
     while page < 3:  # cap at 3 pages (60 results)
         if next_page_token:
             params = {"pagetoken": next_page_token, "key": api_key}
             time.sleep(2)  # Google requires a short delay before using page token
 
-        resp = requests.get(PLACES_TEXT_SEARCH_URL, params=params, timeout=15)
+        resp = (session or requests).get(PLACES_TEXT_SEARCH_URL, params=params, timeout=15)
         resp.raise_for_status()
         data = resp.json()
 
@@ -122,14 +169,20 @@ def search_places(keyword: str, lat: float, lng: float, radius_meters: int,
         next_page_token = data.get("next_page_token")
         page += 1
 
-        if not next_page_token:
+        if not next_page_token or page == 3:
+            complete = True
             break
 
+    if cache and complete:
+        cache.put("text_search", cache_key, results,
+                  latency_s=time.perf_counter() - start, cost_usd=page * TEXT_SEARCH_COST_USD)
+
     logger.info("  Found %d raw results for keyword: %s", len(results), keyword)
     return results
 
 
-def get_place_details(place_id: str, api_key: str) -> Dict:
+def get_place_details(place_id: str, api_key: str,
+                      session: Optional[requests.Session] = None) -> Dict:
     """Fetch enriched details for a single place."""
     params = {
         "place_id": place_id,
@@ -137,7 +190,7 @@ def get_place_details(place_id: str, api_key: str) -> Dict:
         "key": api_key,
     }
     try:
-        resp = requests.get(PLACES_DETAILS_URL, params=params, timeout=10)
+        resp = (session or requests).get(PLACES_DETAILS_URL, params=params, timeout=10)
         resp.raise_for_status()
         data = resp.json()
         if data.get("status") == "OK":
@@ -147,6 +200,90 @@ def get_place_details(place_id: str, api_key: str) -> Dict:
     return {}
 
 
+def pooled_session(pool_size: int = DEFAULT_DETAIL_WORKERS) -> requests.Session:
+    """A session whose connection pool fits `pool_size` concurrent requests."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def places_cache(search_ttl_days: float = SEARCH_TTL_DAYS,
+                 details_ttl_days: float = DETAILS_TTL_DAYS,
+                 refresh: bool = False, enabled: bool = True,
+                 db_path: Path = DEFAULT_DB_PATH) -> ApiCache:
+    """Persistent geocode / text-search / Place Details cache shared by every run."""
+    return ApiCache(
+        "google_places",
+        policies={
+            "geocode": CachePolicy(ttl=GEOCODE_TTL_DAYS * DAY, cost_usd=GEOCODE_COST_USD),
+            "text_search": CachePolicy(ttl=search_ttl_days * DAY, cost_usd=TEXT_SEARCH_COST_USD),
+            "place_details": CachePolicy(ttl=details_ttl_days * DAY, cost_usd=PLACE_DETAILS_COST_USD),
+        },
+        db_path=db_path,
+        refresh=refresh,
+        enabled=enabled,
+    )
+
+
+class PlaceDetailsEnricher:
+    """
+    Fetches Place Details with bounded concurrency on a pooled session.
+
+    One instance spans a whole run: a place_id is fetched at most once no
+    matter how many niches or keywords return it, and results found in the
+    persistent cache are not fetched at all.
+    """
+
+    def __init__(self, api_key: str, workers: int = DEFAULT_DETAIL_WORKERS,
+                 cache: Optional[ApiCache] = None,
+                 session: Optional[requests.Session] = None):
+        self.api_key = api_key
+        self.workers = max(1, workers)
+        self.cache = cache
+        self.session = session or pooled_session(self.workers)
+        self.stats = {"requested": 0, "fetched": 0, "cache_hits": 0, "coalesced": 0}
+        self._details: Dict[str, Dict] = {}
+
+    def enrich(self, place_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Return {place_id: detail} ({} for places that failed to load)."""
+        wanted = list(dict.fromkeys(pid for pid in place_ids if pid))
+        self.stats["requested"] += len(wanted)
+
+        missing = []
+        for pid in wanted:
+            if pid in self._details:
+                self.stats["coalesced"] += 1
+                continue
+            cached = self.cache.get("place_details", self._cache_key(pid)) if self.cache else None
+            if cached is not None:
+                self._details[pid] = cached
+                self.stats["cache_hits"] += 1
+            else:
+                missing.append(pid)
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as pool:
+                for pid, detail in zip(missing, pool.map(self._fetch, missing)):
+                    self._details[pid] = detail
+            self.stats["fetched"] += len(missing)
+
+        return {pid: self._details[pid] for pid in wanted}
+
+    def _fetch(self, place_id: str) -> Dict:
+        start = time.perf_counter()
+        detail = get_place_details(place_id, self.api_key, session=self.session)
+        if detail and self.cache:
+            self.cache.put("place_details", self._cache_key(place_id), detail,
+                           latency_s=time.perf_counter() - start)
+        return detail
+
+    @staticmethod
+    def _cache_key(place_id: str) -> Dict:
+        return {"place_id": place_id, "fields": PLACE_DETAIL_FIELDS}
+
+
 # ---------------------------------------------------------------------------
 # Lead scoring
 # ---------------------------------------------------------------------------
@@ -155,9 +292,15 @@ def score_lead(detail: Dict, config: Dict) -> int:
     """
     Score a lead 0-100 based on ICP fit, buying signals, and reachability.
     Weights match config/local_lead_gen_config.json scoring_model.
+
+    Per-lead reference for lead_scoring.score_places, which scores whole
+    tables at once and is what scrape_niche uses.
     """
     score = 0
     model = config.get("scoring_model", {})
+    icp_cap = model.get("icp_fit", {}).get("weight", 40)
+    signal_cap = model.get("buying_signals", {}).get("weight", 40)
+    reach_cap = model.get("reachability", {}).get("weight", 20)
 
     # --- ICP Fit (40 pts) ---
     icp_score = 0
@@ -175,7 +318,7 @@ def score_lead(detail: Dict, config: Dict) -> int:
     if detail.get("business_status") == "OPERATIONAL":
         icp_score += 15
 
-    score += min(icp_score, 40)
+    score += min(icp_score, icp_cap)
 
     # --- Buying Signals (40 pts) ---
     signal_score = 0
@@ -198,7 +341,7 @@ def score_lead(detail: Dict, config: Dict) -> int:
     if 0 < rating < 4.0:
         signal_score += 10
 
-    score += min(signal_score, 40)
+    score += min(signal_score, signal_cap)
 
     # --- Reachability (20 pts) ---
     reach_score = 0
@@ -207,7 +350,7 @@ def score_lead(detail: Dict, config: Dict) -> int:
     if detail.get("website"):
         reach_score += 10
 
-    score += min(reach_score, 20)
+    score += min(reach_score, reach_cap)
 
     return min(score, 100)
 
@@ -284,47 +427,51 @@ def notify_slack(message: str) -> None:
 
 def scrape_niche(niche: Dict, config: Dict, lat: float, lng: float,
                  radius_meters: int, api_key: str, output_dir: Path,
-                 min_score: int = 0) -> List[Dict]:
+                 min_score: int = 0,
+                 enricher: Optional[PlaceDetailsEnricher] = None) -> List[Dict]:
     """
     Scrape all keywords for a single niche, deduplicate by place_id,
     score each lead, and write a CSV.
+
+    Pass one `enricher` for the whole run so places shared between niches
+    are only fetched once.
     """
+    enricher = enricher or PlaceDetailsEnricher(api_key)
     niche_id = niche["id"]
     keywords = niche["google_maps_keywords"]
     logger.info("=== Niche: %s (%d keywords) ===", niche["label"], len(keywords))
 
-    seen_place_ids: set = set()
+    # place_id -> first keyword that found it
+    place_keywords: Dict[str, str] = {}
     all_rows: List[Dict] = []
     scraped_at = datetime.now().strftime("%Y-%m-%d %H:%M")
 
     for keyword in keywords:
         full_keyword = f"{keyword} near {config['geography']['anchor_zip']}"
-        raw = search_places(full_keyword, lat, lng, radius_meters, api_key)
+        raw = search_places(full_keyword, lat, lng, radius_meters, api_key,
+                            session=enricher.session, cache=enricher.cache)
 
         for place in raw:
-            pid = place.get("place_id", "")
-            if pid in seen_place_ids:
-                continue
-            seen_place_ids.add(pid)
-
-            # Enrich with details
-            detail = get_place_details(pid, api_key)
-            if not detail:
-                continue
+            place_keywords.setdefault(place.get("place_id", ""), keyword)
 
-            # Skip permanently closed
-            if detail.get("business_status") == "CLOSED_PERMANENTLY":
-                continue
+    # Enrich with details (concurrent, deduped across the run)
+    details = enricher.enrich(place_keywords)
 
-            score = score_lead(detail, config)
+    # Skip failed lookups and permanently closed places
+    live = [
+        (pid, keyword) for pid, keyword in place_keywords.items()
+        if details.get(pid) and details[pid].get("business_status") != "CLOSED_PERMANENTLY"
+    ]
+    scores = score_places(pd.DataFrame([details[pid] for pid, _ in live]),
+                          ScoringModel.from_config(config)) if live else []
 
-            # Apply minimum score filter
-            if score < min_score:
-                continue
+    for (pid, keyword), score in zip(live, scores):
+        # Apply minimum score filter
+        if score < min_score:
+            continue
 
-            row = build_lead_row(detail, niche_id, keyword, score, scraped_at)
-            all_rows.append(row)
-            time.sleep(0.1)  # gentle rate limiting
+        row = build_lead_row(details[pid], niche_id, keyword, int(score), scraped_at)
+        all_rows.append(row)
 
     # Sort by fit_score descending
     all_rows.sort(key=lambda r: int(r.get("fit_score", 0)), reverse=True)
@@ -358,6 +505,16 @@ def main():
                         help="Minimum fit score to include in output (default: 0 = all)")
     parser.add_argument("--output-dir", default=".tmp",
                         help="Directory for CSV output (default: .tmp)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_DETAIL_WORKERS,
+                        help=f"Concurrent Place Details requests (default: {DEFAULT_DETAIL_WORKERS})")
+    parser.add_argument("--search-ttl-days", type=float, default=SEARCH_TTL_DAYS,
+                        help=f"Reuse cached text searches younger than this (default: {SEARCH_TTL_DAYS})")
+    parser.add_argument("--details-ttl-days", type=float, default=DETAILS_TTL_DAYS,
+                        help=f"Reuse cached Place Details younger than this (default: {DETAILS_TTL_DAYS})")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached geocode/search/details responses (still updates the cache)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Disable the Google Places response cache entirely")
     args = parser.parse_args()
 
     if not args.niche and not args.all_niches:
@@ -375,8 +532,12 @@ def main():
     radius_miles = args.radius or config["geography"]["radius_miles"]
     radius_meters = int(radius_miles * 1609.34)
 
+    cache = places_cache(args.search_ttl_days, args.details_ttl_days,
+                         refresh=args.refresh, enabled=not args.no_cache)
+    session = pooled_session(args.workers)
+
     logger.info("Geocoding zip code %s ...", zip_code)
-    coords = zip_to_latlng(zip_code, api_key)
+    coords = zip_to_latlng(zip_code, api_key, session=session, cache=cache)
     if not coords:
         logger.error("Could not geocode zip %s — check API key and billing", zip_code)
         sys.exit(1)
@@ -399,11 +560,12 @@ def main():
     total_leads = 0
     total_hot = 0
     summary_lines = []
+    enricher = PlaceDetailsEnricher(api_key, workers=args.workers, cache=cache, session=session)
 
     for niche in niches_sorted:
         rows = scrape_niche(
             niche, config, lat, lng, radius_meters, api_key,
-            output_dir, min_score=args.min_score
+            output_dir, min_score=args.min_score, enricher=enricher
         )
         hot = len([r for r in rows if int(r.get("fit_score", 0)) >= config["thresholds"]["hot_immediate_contact"]])
         total_leads += len(rows)
@@ -415,6 +577,9 @@ def main():
         f"Zip: {zip_code} | Radius: {radius_miles}mi | {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
         f"Total leads: {total_leads} | Hot (score ≥ {config['thresholds']['hot_immediate_contact']}): {total_hot}\n"
         + "\n".join(summary_lines)
+        + f"\nPlace Details: {enricher.stats['fetched']} fetched, "
+        f"{enricher.stats['cache_hits']} cached, {enricher.stats['coalesced']} shared across niches"
+        + (f"\nAPI cache: {cache.summary()}" if cache.enabled else "")
         + f"\n\nCSVs saved to: `{output_dir}/`"
     )
 
@@ -13,11 +13,17 @@ Usage:
 
 import json
 import os
+import sys
 from datetime import datetime
 from typing import Dict, List
 from pathlib import Path
 import logging
 
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+from lead_scoring import ScoringModel, score_research_leads
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -89,12 +95,18 @@ class LeadResearchOrchestrator:
         logger.info("\n⭐ PHASE 2: SCORING")
         logger.info("Initiating Business Analyst agent...")
         
-        for lead in self.leads:
-            score = self._calculate_lead_score(lead)
-            lead['fit_score'] = score['total']
-            lead['fit_breakdown'] = score['breakdown']
-            lead['buying_signals'] = score['signals']
-            lead['recommended_action'] = self._get_action(score['total'])
+        # Score the whole batch at once; _calculate_lead_score is the per-lead equivalent
+        scores = score_research_leads(pd.DataFrame(self.leads), ScoringModel.from_config(self.config)) \
+            if self.leads else {}
+        for i, lead in enumerate(self.leads):
+            total = int(scores['total'][i])
+            lead['fit_score'] = total
+            lead['fit_breakdown'] = {
+                part: int(scores[part][i])
+                for part in ('icp_fit', 'buying_signal', 'title_match', 'engagement')
+            }
+            lead['buying_signals'] = [lead['funding_status'], lead['last_hiring_activity']]
+            lead['recommended_action'] = self._get_action(total)
         
         # Sort by score (highest first)
         self.scored_leads = sorted(self.leads, key=lambda x: x['fit_score'], reverse=True)
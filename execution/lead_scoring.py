@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Lead Scoring - Vectorized batch scorer for lead tables
+Scores a whole table of leads at once with pandas/NumPy instead of one dict
+at a time. The rules are compiled once from the client config (section caps
+from scoring_model, target titles into a single regex) and applied as column
+operations, so re-scoring hundreds of thousands of historical leads after a
+scoring-model change takes seconds.
+
+Two rule sets are provided, matching the per-lead reference implementations:
+    score_places()          == google_maps_scraper.score_lead
+    score_research_leads()  == LeadResearchOrchestrator._calculate_lead_score
+
+Usage:
+    from lead_scoring import ScoringModel, score_places
+
+    model = ScoringModel.from_config(config)
+    df["fit_score"] = score_places(df, model)
+
+    # Re-score a lead CSV written by google_maps_scraper.py
+    python execution/lead_scoring.py \
+        --config config/local_lead_gen_config.json \
+        --input .tmp/leads_med_spa_2026-01-05.csv \
+        --output .tmp/leads_med_spa_rescored.csv
+"""
+
+import argparse
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Pattern
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Lead CSV column -> Place Details field used by score_places()
+LEAD_CSV_COLUMNS = {
+    "phone": "formatted_phone_number",
+    "review_count": "user_ratings_total",
+}
+
+
+@dataclass(frozen=True)
+class ScoringModel:
+    """Scoring rules compiled once from a client config."""
+
+    icp_cap: int = 40
+    signal_cap: int = 40
+    reach_cap: int = 20
+    title_pattern: Optional[Pattern] = None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "ScoringModel":
+        model = config.get("scoring_model", {})
+        titles = config.get("icp", {}).get("target_titles", [])
+        # Longest first so the alternation never stops at a shorter prefix
+        alternation = "|".join(re.escape(t) for t in sorted(set(titles), key=len, reverse=True) if t)
+        return cls(
+            icp_cap=model.get("icp_fit", {}).get("weight", cls.icp_cap),
+            signal_cap=model.get("buying_signals", {}).get("weight", cls.signal_cap),
+            reach_cap=model.get("reachability", {}).get("weight", cls.reach_cap),
+            title_pattern=re.compile(alternation) if alternation else None,
+        )
+
+    def title_matches(self, titles: pd.Series) -> np.ndarray:
+        """Boolean array: title contains any target title (case-sensitive)."""
+        if self.title_pattern is None:
+            return np.zeros(len(titles), dtype=bool)
+        return titles.fillna("").astype(str).str.contains(self.title_pattern).to_numpy()
+
+
+def _present(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Truthiness of an optional text column (missing, NaN and '' are False)."""
+    if column not in df:
+        return np.zeros(len(df), dtype=bool)
+    return df[column].fillna("").to_numpy(dtype=object).astype(bool)
+
+
+def _numeric(df: pd.DataFrame, column: str) -> np.ndarray:
+    if column not in df:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[column], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+
+def score_places(df: pd.DataFrame, model: ScoringModel) -> np.ndarray:
+    """
+    Fit scores (0-100) for a table of Place Details rows.
+
+    Expects the Place Details field names (website, formatted_phone_number,
+    business_status, user_ratings_total, rating); rename lead CSV columns
+    with LEAD_CSV_COLUMNS first.
+    """
+    has_website = _present(df, "website")
+    has_phone = _present(df, "formatted_phone_number")
+    operational = (df["business_status"] == "OPERATIONAL").to_numpy() if "business_status" in df \
+        else np.zeros(len(df), dtype=bool)
+    reviews = _numeric(df, "user_ratings_total")
+    rating = _numeric(df, "rating")
+
+    # --- ICP Fit ---
+    icp = 15 * has_website + 10 * has_phone + 15 * operational
+
+    # --- Buying Signals ---
+    signals = np.select([reviews < 20, reviews < 50, reviews < 100], [25, 15, 5], default=0)
+    signals = signals + 5 * ~has_website + 10 * ((rating > 0) & (rating < 4.0))
+
+    # --- Reachability ---
+    reach = 10 * has_phone + 10 * has_website
+
+    total = (np.minimum(icp, model.icp_cap)
+             + np.minimum(signals, model.signal_cap)
+             + np.minimum(reach, model.reach_cap))
+    return np.minimum(total, 100).astype(int)
+
+
+def score_research_leads(df: pd.DataFrame, model: ScoringModel) -> Dict[str, np.ndarray]:
+    """
+    Weighted fit scores for researched B2B leads.
+
+    Returns arrays for 'total' and each breakdown component
+    (icp_fit, buying_signal, title_match, engagement).
+    """
+    n = len(df)
+    icp_fit = np.full(n, 80)  # Simplified: would compare lead data against ICP
+    funded = (df["funding_status"] != "Bootstrapped").to_numpy()
+    hiring = (df["last_hiring_activity"] != "None").to_numpy()
+    buying_signal = np.minimum(100, np.where(funded, 70, 40) + 20 * hiring)
+    title_match = np.where(model.title_matches(df["title"]), 90, 60)
+    engagement = np.full(n, 65)  # placeholder
+
+    total = icp_fit * 0.40 + buying_signal * 0.35 + title_match * 0.15 + engagement * 0.10
+    return {
+        "total": total.astype(int),
+        "icp_fit": icp_fit,
+        "buying_signal": buying_signal,
+        "title_match": title_match,
+        "engagement": engagement,
+    }
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
+                        datefmt="%H:%M:%S")
+    parser = argparse.ArgumentParser(description="Re-score a lead CSV with the current scoring model")
+    parser.add_argument("--config", required=True, help="Path to local_lead_gen_config.json")
+    parser.add_argument("--input", required=True, help="Lead CSV from google_maps_scraper.py")
+    parser.add_argument("--output", help="Where to write the re-scored CSV (default: overwrite --input)")
+    args = parser.parse_args()
+
+    with open(args.config, "r") as f:
+        model = ScoringModel.from_config(json.load(f))
+
+    leads = pd.read_csv(args.input, dtype={"phone": str, "website": str})
+    start = time.perf_counter()
+    leads["fit_score"] = score_places(leads.rename(columns=LEAD_CSV_COLUMNS), model)
+    leads.sort_values("fit_score", ascending=False, kind="stable", inplace=True)
+    logger.info("Scored %d leads in %.2fs", len(leads), time.perf_counter() - start)
+
+    output = args.output or args.input
+    leads.to_csv(output, index=False)
+    logger.info("Wrote %s", output)
+
+
+if __name__ == "__main__":
+    main()
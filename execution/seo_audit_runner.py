@@ -2,12 +2,19 @@ import os
 import json
 import sys
 import argparse
+import asyncio
 import requests
 import base64
 import time
+from pathlib import Path
 from typing import Dict, List, Any, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from execution.shared.api_cache import ApiCache, CachePolicy, DAY
+
 try:
     from openai import OpenAI
     HAS_OPENAI = True
@@ -15,24 +22,62 @@ except ImportError:
     HAS_OPENAI = False
 
 
+def _auth_headers() -> Dict[str, str]:
+    username = os.environ.get("DATAFORSEO_USERNAME")
+    password = os.environ.get("DATAFORSEO_PASSWORD")
+    if not username or not password:
+        raise ValueError("Missing DATAFORSEO_USERNAME or DATAFORSEO_PASSWORD environment variables.")
+
+    token = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return {
+        "Authorization": f"Basic {token}",
+        "Content-Type": "application/json"
+    }
+
+
+# Cached DataForSEO endpoints: TTL reflects how fast the data changes,
+# cost_usd is the approximate per-task price credited on every cache hit.
+DATAFORSEO_CACHE_POLICIES = {
+    "/backlinks/summary/live": CachePolicy(ttl=7 * DAY, cost_usd=0.02),
+    "/dataforseo_labs/google/bulk_keyword_difficulty/live": CachePolicy(ttl=30 * DAY, cost_usd=0.01),
+    "/on_page/lighthouse/live/json": CachePolicy(ttl=1 * DAY, cost_usd=0.00425),
+}
+
+
+def open_cache(refresh: bool = False, enabled: bool = True) -> ApiCache:
+    """The shared DataForSEO response cache (.tmp/cache/api_cache.sqlite)."""
+    return ApiCache("dataforseo", policies=DATAFORSEO_CACHE_POLICIES,
+                    refresh=refresh, enabled=enabled)
+
+
+def _cacheable(body: Dict) -> bool:
+    """Only cache responses where the call and every task succeeded (20000)."""
+    tasks = body.get("tasks") or []
+    return body.get("status_code") == 20000 and bool(tasks) and all(
+        t.get("status_code") == 20000 for t in tasks
+    )
+
+
 class DataForSEOClient:
-    def __init__(self):
-        self.username = os.environ.get("DATAFORSEO_USERNAME")
-        self.password = os.environ.get("DATAFORSEO_PASSWORD")
-        if not self.username or not self.password:
-            raise ValueError("Missing DATAFORSEO_USERNAME or DATAFORSEO_PASSWORD environment variables.")
-
-        token = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
-        self.headers = {
-            "Authorization": f"Basic {token}",
-            "Content-Type": "application/json"
-        }
-        self.base_url = "https://api.dataforseo.com/v3"
+    BASE_URL = "https://api.dataforseo.com/v3"
+
+    def __init__(self, cache: Optional[ApiCache] = None):
+        self.headers = _auth_headers()
+        self.base_url = self.BASE_URL
+        self.cache = cache
 
     def post(self, endpoint: str, data: List[Dict]) -> Dict:
+        if self.cache:
+            cached = self.cache.get(endpoint, data)
+            if cached is not None:
+                return cached
+        start = time.perf_counter()
         response = requests.post(f"{self.base_url}{endpoint}", headers=self.headers, json=data, timeout=60)
         response.raise_for_status()
-        return response.json()
+        body = response.json()
+        if self.cache and _cacheable(body):
+            self.cache.put(endpoint, data, body, latency_s=time.perf_counter() - start)
+        return body
 
     def get(self, endpoint: str) -> Dict:
         response = requests.get(f"{self.base_url}{endpoint}", headers=self.headers, timeout=60)
@@ -51,6 +96,56 @@ class DataForSEOClient:
         return items[0] if items else None
 
 
+class AsyncDataForSEOClient:
+    """
+    asyncio DataForSEO client. All requests share one pooled httpx connection.
+
+    Usage:
+        async with AsyncDataForSEOClient(cache=open_cache()) as client:
+            res = await client.post("/backlinks/summary/live", [{"target": "example.com"}])
+    """
+
+    def __init__(self, max_connections: int = 10, timeout: float = 60,
+                 cache: Optional[ApiCache] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.cache = cache
+        self._client = httpx.AsyncClient(
+            base_url=DataForSEOClient.BASE_URL,
+            headers=_auth_headers(),
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncDataForSEOClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def post(self, endpoint: str, data: List[Dict]) -> Dict:
+        if self.cache:
+            cached = self.cache.get(endpoint, data)
+            if cached is not None:
+                return cached
+        start = time.perf_counter()
+        response = await self._client.post(endpoint, json=data)
+        response.raise_for_status()
+        body = response.json()
+        if self.cache and _cacheable(body):
+            self.cache.put(endpoint, data, body, latency_s=time.perf_counter() - start)
+        return body
+
+    async def get(self, endpoint: str) -> Dict:
+        response = await self._client.get(endpoint)
+        response.raise_for_status()
+        return response.json()
+
+
 def enrich_with_ai(module_name: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Use OpenAI to generate AI insights for a specific audit module.
@@ -115,176 +210,150 @@ def enrich_with_ai(module_name: str, data: Dict[str, Any]) -> Optional[Dict[str,
         return None
 
 
-def run_audit(url: str, keywords: List[str] = None, modules: List[str] = None, competitors: List[str] = None) -> Dict:
-    client = DataForSEOClient()
-    modules = modules or ["on_page"]
+async def _audit_on_page(client: AsyncDataForSEOClient, url: str, data: Dict) -> None:
+    print(f"[*] Analyzing on-page factors for {url}...")
+    try:
+        onpage_payload = [{"url": url, "enable_javascript": True, "enable_browser_rendering": True}]
+        onpage_res = await client.post("/on_page/instant_pages", onpage_payload)
+        task_result = onpage_res.get("tasks", [{}])[0].get("result", [{}])[0]
+        items = task_result.get("items", [{}])
+        item = items[0] if items else {}
+
+        meta = item.get("meta", {})
+        score = item.get("onpage_score", 0)
+        data["score"] = round(score) if score else 65
+
+        r = data["full_report"]["on_page"]
+        title = meta.get("title", "")
+        desc = meta.get("description", "")
+        h1 = item.get("h1", [])
+        internal = item.get("internal_links_count", 0)
+        external = item.get("external_links_count", 0)
+        images_no_alt = item.get("images_without_alt_attributes_count", 0)
+        word_count = meta.get("content", {}).get("plain_text_word_count", 0)
+
+        r.append(["Title Tag", title[:60] + "…" if len(title) > 60 else (title or "Missing"), "Pass" if title else "Fail"])
+        r.append(["Meta Description", f"{len(desc)} chars" if desc else "Missing", "Pass" if 120 <= len(desc) <= 160 else ("Warning" if desc else "Fail")])
+        r.append(["H1 Tag", h1[0][:50] if h1 else "Missing", "Pass" if len(h1) == 1 else ("Warning: Multiple H1" if len(h1) > 1 else "Fail")])
+        r.append(["Word Count", f"{word_count:,} words", "Pass" if word_count >= 300 else "Warning"])
+        r.append(["Internal Links", str(internal), "Pass" if internal >= 3 else "Warning"])
+        r.append(["Images Missing Alt", str(images_no_alt), "Pass" if images_no_alt == 0 else "Fail"])
+        r.append(["SSL / HTTPS", "Enabled" if url.startswith("https") else "Not found", "Pass" if url.startswith("https") else "Fail"])
+
+        # Build smart recap
+        issues = []
+        if not title: issues.append("missing title tag")
+        if not desc: issues.append("no meta description")
+        if len(h1) != 1: issues.append("H1 hierarchy problem")
+        if images_no_alt > 0: issues.append(f"{images_no_alt} images missing alt text")
+        if word_count < 300: issues.append("thin content (under 300 words)")
+
+        if issues:
+            data["full_report"]["recap"] = (
+                f"Audit of {url} flagged the following structural issues: {', '.join(issues)}. "
+                f"The on-page score is {data['score']}/100. "
+                f"Addressing these items in priority order will have the highest impact on indexability and keyword rankings."
+            )
+            for i in issues[:3]:
+                data["improvements"].append(f"Fix: {i.capitalize()}")
 
-    # Normalize URL
-    if not url.startswith("http"):
-        url = "https://" + url
+    except Exception as e:
+        print(f"[!] On-Page error: {e}")
+        data["full_report"]["on_page"].append(["Analysis Error", str(e)[:80], "Error"])
 
-    results = {
-        "status": "success",
-        "data": {
-            "score": 72,
-            "domain": url,
-            "page_speed": {"score": 0, "metrics": {}},
-            "keyword_analysis": {"primary_keywords": {}, "missing_keywords": []},
-            "technical_health": {"ssl_secure": True, "mobile_friendly": True, "broken_links": []},
-            "improvements": [],
-            "backlinks": {},
-            "keywords": [],
-            "full_report": {
-                "on_page": [],
-                "technical": [],
-                "recap": f"Structural analysis of {url} is complete. Review the tab findings below for prioritized recommendations."
+
+async def _audit_speed(client: AsyncDataForSEOClient, url: str, data: Dict) -> None:
+    print(f"[*] Running Lighthouse speed test for {url}...")
+    try:
+        lh_payload = [{"url": url, "for_mobile": False}]
+        lh_res = await client.post("/on_page/lighthouse/live/json", lh_payload)
+        lh_task = lh_res.get("tasks", [{}])[0]
+        lh_result = lh_task.get("result", [{}])[0] if lh_task.get("result") else {}
+        categories = lh_result.get("categories", {})
+        audits = lh_result.get("audits", {})
+
+        perf_score = round((categories.get("performance", {}).get("score", 0) or 0) * 100)
+        seo_score = round((categories.get("seo", {}).get("score", 0) or 0) * 100)
+        a11y_score = round((categories.get("accessibility", {}).get("score", 0) or 0) * 100)
+
+        lcp_val = audits.get("largest-contentful-paint", {}).get("displayValue", "N/A")
+        cls_val = audits.get("cumulative-layout-shift", {}).get("displayValue", "N/A")
+        ttfb_val = audits.get("server-response-time", {}).get("displayValue", "N/A")
+        fid_val = audits.get("max-potential-fid", {}).get("displayValue", "N/A")
+        tbt_val = audits.get("total-blocking-time", {}).get("displayValue", "N/A")
+
+        data["page_speed"] = {
+            "score": perf_score,
+            "seo_score": seo_score,
+            "accessibility_score": a11y_score,
+            "metrics": {
+                "LCP": lcp_val,
+                "TTFB": ttfb_val,
+                "CLS": cls_val,
+                "FID": fid_val,
+                "TBT": tbt_val,
+                "Performance": f"{perf_score}/100",
+                "SEO": f"{seo_score}/100",
+                "Accessibility": f"{a11y_score}/100"
             }
         }
-    }
+        print(f"[✓] Speed: LCP={lcp_val}, Performance={perf_score}/100")
 
-    # 1. On-Page Analysis
-    if "on_page" in modules:
-        print(f"[*] Analyzing on-page factors for {url}...")
-        try:
-            onpage_payload = [{"url": url, "enable_javascript": True, "enable_browser_rendering": True}]
-            onpage_res = client.post("/on_page/instant_pages", onpage_payload)
-            task_result = onpage_res.get("tasks", [{}])[0].get("result", [{}])[0]
-            items = task_result.get("items", [{}])
-            item = items[0] if items else {}
-
-            meta = item.get("meta", {})
-            score = item.get("onpage_score", 0)
-            results["data"]["score"] = round(score) if score else 65
-
-            r = results["data"]["full_report"]["on_page"]
-            title = meta.get("title", "")
-            desc = meta.get("description", "")
-            h1 = item.get("h1", [])
-            internal = item.get("internal_links_count", 0)
-            external = item.get("external_links_count", 0)
-            images_no_alt = item.get("images_without_alt_attributes_count", 0)
-            word_count = meta.get("content", {}).get("plain_text_word_count", 0)
-
-            r.append(["Title Tag", title[:60] + "…" if len(title) > 60 else (title or "Missing"), "Pass" if title else "Fail"])
-            r.append(["Meta Description", f"{len(desc)} chars" if desc else "Missing", "Pass" if 120 <= len(desc) <= 160 else ("Warning" if desc else "Fail")])
-            r.append(["H1 Tag", h1[0][:50] if h1 else "Missing", "Pass" if len(h1) == 1 else ("Warning: Multiple H1" if len(h1) > 1 else "Fail")])
-            r.append(["Word Count", f"{word_count:,} words", "Pass" if word_count >= 300 else "Warning"])
-            r.append(["Internal Links", str(internal), "Pass" if internal >= 3 else "Warning"])
-            r.append(["Images Missing Alt", str(images_no_alt), "Pass" if images_no_alt == 0 else "Fail"])
-            r.append(["SSL / HTTPS", "Enabled" if url.startswith("https") else "Not found", "Pass" if url.startswith("https") else "Fail"])
-
-            # Build smart recap
-            issues = []
-            if not title: issues.append("missing title tag")
-            if not desc: issues.append("no meta description")
-            if len(h1) != 1: issues.append("H1 hierarchy problem")
-            if images_no_alt > 0: issues.append(f"{images_no_alt} images missing alt text")
-            if word_count < 300: issues.append("thin content (under 300 words)")
-
-            if issues:
-                results["data"]["full_report"]["recap"] = (
-                    f"Audit of {url} flagged the following structural issues: {', '.join(issues)}. "
-                    f"The on-page score is {results['data']['score']}/100. "
-                    f"Addressing these items in priority order will have the highest impact on indexability and keyword rankings."
-                )
-                for i in issues[:3]:
-                    results["data"]["improvements"].append(f"Fix: {i.capitalize()}")
+    except Exception as e:
+        print(f"[!] Lighthouse error (using sensible fallback): {e}")
+        data["page_speed"] = {
+            "score": 0,
+            "metrics": {"LCP": "N/A", "TTFB": "N/A", "CLS": "N/A", "FID": "N/A", "note": "Speed data unavailable"}
+        }
 
-        except Exception as e:
-            print(f"[!] On-Page error: {e}")
-            results["data"]["full_report"]["on_page"].append(["Analysis Error", str(e)[:80], "Error"])
 
-    # 2. Page Speed (DataForSEO Lighthouse)
-    if "speed" in modules:
-        print(f"[*] Running Lighthouse speed test for {url}...")
-        try:
-            lh_payload = [{"url": url, "for_mobile": False}]
-            lh_res = client.post("/on_page/lighthouse/live/json", lh_payload)
-            lh_task = lh_res.get("tasks", [{}])[0]
-            lh_result = lh_task.get("result", [{}])[0] if lh_task.get("result") else {}
-            categories = lh_result.get("categories", {})
-            audits = lh_result.get("audits", {})
-
-            perf_score = round((categories.get("performance", {}).get("score", 0) or 0) * 100)
-            seo_score = round((categories.get("seo", {}).get("score", 0) or 0) * 100)
-            a11y_score = round((categories.get("accessibility", {}).get("score", 0) or 0) * 100)
-
-            lcp_val = audits.get("largest-contentful-paint", {}).get("displayValue", "N/A")
-            cls_val = audits.get("cumulative-layout-shift", {}).get("displayValue", "N/A")
-            ttfb_val = audits.get("server-response-time", {}).get("displayValue", "N/A")
-            fid_val = audits.get("max-potential-fid", {}).get("displayValue", "N/A")
-            tbt_val = audits.get("total-blocking-time", {}).get("displayValue", "N/A")
-
-            results["data"]["page_speed"] = {
-                "score": perf_score,
-                "seo_score": seo_score,
-                "accessibility_score": a11y_score,
-                "metrics": {
-                    "LCP": lcp_val,
-                    "TTFB": ttfb_val,
-                    "CLS": cls_val,
-                    "FID": fid_val,
-                    "TBT": tbt_val,
-                    "Performance": f"{perf_score}/100",
-                    "SEO": f"{seo_score}/100",
-                    "Accessibility": f"{a11y_score}/100"
-                }
-            }
-            print(f"[✓] Speed: LCP={lcp_val}, Performance={perf_score}/100")
+async def _audit_backlinks(client: AsyncDataForSEOClient, url: str, data: Dict) -> None:
+    print(f"[*] Fetching backlink summary...")
+    try:
+        bl_payload = [{"target": url.replace("https://", "").replace("http://", "").rstrip("/")}]
+        bl_res = await client.post("/backlinks/summary/live", bl_payload)
+        bl_items = bl_res.get("tasks", [{}])[0].get("result", [{}])[0].get("items", [{}])
+        bl_item = bl_items[0] if bl_items else {}
+        data["backlinks"] = {
+            "total": bl_item.get("backlinks", 0),
+            "referring_domains": bl_item.get("referring_domains", 0),
+            "rank": bl_item.get("rank", 0),
+            "broken_backlinks": bl_item.get("broken_backlinks", 0),
+            "referring_ips": bl_item.get("referring_ips", 0)
+        }
+        print(f"[✓] Backlinks: {data['backlinks']['total']} total from {data['backlinks']['referring_domains']} domains")
+    except Exception as e:
+        print(f"[!] Backlinks error: {e}")
+        data["backlinks"] = {"total": 0, "referring_domains": 0, "rank": 0, "error": str(e)}
 
-        except Exception as e:
-            print(f"[!] Lighthouse error (using sensible fallback): {e}")
-            results["data"]["page_speed"] = {
-                "score": 0,
-                "metrics": {"LCP": "N/A", "TTFB": "N/A", "CLS": "N/A", "FID": "N/A", "note": "Speed data unavailable"}
-            }
 
-    # 3. Backlinks Summary
-    if "backlinks" in modules:
-        print(f"[*] Fetching backlink summary...")
+async def _audit_keywords(client: AsyncDataForSEOClient, url: str, data: Dict, keywords: List[str]) -> None:
+    if keywords:
+        print(f"[*] Checking keyword difficulty for {len(keywords)} keywords...")
         try:
-            bl_payload = [{"target": url.replace("https://", "").replace("http://", "").rstrip("/")}]
-            bl_res = client.post("/backlinks/summary/live", bl_payload)
-            bl_items = bl_res.get("tasks", [{}])[0].get("result", [{}])[0].get("items", [{}])
-            bl_item = bl_items[0] if bl_items else {}
-            results["data"]["backlinks"] = {
-                "total": bl_item.get("backlinks", 0),
-                "referring_domains": bl_item.get("referring_domains", 0),
-                "rank": bl_item.get("rank", 0),
-                "broken_backlinks": bl_item.get("broken_backlinks", 0),
-                "referring_ips": bl_item.get("referring_ips", 0)
-            }
-            print(f"[✓] Backlinks: {results['data']['backlinks']['total']} total from {results['data']['backlinks']['referring_domains']} domains")
+            kd_payload = [{"keywords": keywords[:10], "language_code": "en", "location_name": "United States"}]
+            kd_res = await client.post("/dataforseo_labs/google/bulk_keyword_difficulty/live", kd_payload)
+            kd_items = kd_res.get("tasks", [{}])[0].get("result", [{}])[0].get("items", [])
+
+            kw_results = []
+            for item in kd_items:
+                kw_results.append({
+                    "keyword": item.get("keyword", ""),
+                    "volume": f"{item.get('keyword_info', {}).get('search_volume', 0):,}",
+                    "difficulty": item.get("keyword_difficulty", 0),
+                    "rank": "#N/A"  # Would need a rank tracker for live positions
+                })
+            data["keywords"] = kw_results
+            print(f"[✓] Keywords: {len(kw_results)} analyzed")
         except Exception as e:
-            print(f"[!] Backlinks error: {e}")
-            results["data"]["backlinks"] = {"total": 0, "referring_domains": 0, "rank": 0, "error": str(e)}
-
-    # 4. Keyword Difficulty + SERP
-    if "keywords" in modules or "serp" in modules:
-        if keywords:
-            print(f"[*] Checking keyword difficulty for {len(keywords)} keywords...")
-            try:
-                kd_payload = [{"keywords": keywords[:10], "language_code": "en", "location_name": "United States"}]
-                kd_res = client.post("/dataforseo_labs/google/bulk_keyword_difficulty/live", kd_payload)
-                kd_items = kd_res.get("tasks", [{}])[0].get("result", [{}])[0].get("items", [])
-
-                kw_results = []
-                for item in kd_items:
-                    kw_results.append({
-                        "keyword": item.get("keyword", ""),
-                        "volume": f"{item.get('keyword_info', {}).get('search_volume', 0):,}",
-                        "difficulty": item.get("keyword_difficulty", 0),
-                        "rank": "#N/A"  # Would need a rank tracker for live positions
-                    })
-                results["data"]["keywords"] = kw_results
-                print(f"[✓] Keywords: {len(kw_results)} analyzed")
-            except Exception as e:
-                print(f"[!] Keyword error: {e}")
-                results["data"]["full_report"]["technical"].append(["Keyword Error", str(e)[:80], "Warning"])
-        else:
-            results["data"]["full_report"]["technical"].append(["Keywords", "No target keywords provided", "Info"])
+            print(f"[!] Keyword error: {e}")
+            data["full_report"]["technical"].append(["Keyword Error", str(e)[:80], "Warning"])
+    else:
+        data["full_report"]["technical"].append(["Keywords", "No target keywords provided", "Info"])
 
-    # 5. AI Enrichment (parallel)
+
+def _enrich_insights(results: Dict, modules: List[str]) -> None:
+    """Add per-module OpenAI insights to results["data"]["ai_insights"]."""
     print(f"[*] Enriching insights with AI...")
     if HAS_OPENAI and os.environ.get("OPENAI_API_KEY"):
         ai_insights = {}
@@ -317,6 +386,70 @@ def run_audit(url: str, keywords: List[str] = None, modules: List[str] = None, c
 
         results["data"]["ai_insights"] = ai_insights
 
+
+async def run_audit_async(url: str, keywords: List[str] = None, modules: List[str] = None,
+                          competitors: List[str] = None,
+                          client: Optional[AsyncDataForSEOClient] = None,
+                          use_cache: bool = True, refresh: bool = False) -> Dict:
+    """
+    Run the requested audit modules concurrently over one pooled connection,
+    so latency is bounded by the slowest module. Pass `client` to share a
+    connection pool across several audits. Backlink, keyword-difficulty and
+    Lighthouse responses are served from the local API cache while fresh;
+    `refresh` re-fetches them and `use_cache=False` bypasses the cache.
+    """
+    modules = modules or ["on_page"]
+
+    # Normalize URL
+    if not url.startswith("http"):
+        url = "https://" + url
+
+    results = {
+        "status": "success",
+        "data": {
+            "score": 72,
+            "domain": url,
+            "page_speed": {"score": 0, "metrics": {}},
+            "keyword_analysis": {"primary_keywords": {}, "missing_keywords": []},
+            "technical_health": {"ssl_secure": True, "mobile_friendly": True, "broken_links": []},
+            "improvements": [],
+            "backlinks": {},
+            "keywords": [],
+            "full_report": {
+                "on_page": [],
+                "technical": [],
+                "recap": f"Structural analysis of {url} is complete. Review the tab findings below for prioritized recommendations."
+            }
+        }
+    }
+    data = results["data"]
+
+    owns_client = client is None
+    client = client or AsyncDataForSEOClient(cache=open_cache(refresh, use_cache))
+    try:
+        # 1-4. DataForSEO modules are independent: run them side by side
+        jobs = []
+        if "on_page" in modules:
+            jobs.append(_audit_on_page(client, url, data))
+        if "speed" in modules:
+            jobs.append(_audit_speed(client, url, data))
+        if "backlinks" in modules:
+            jobs.append(_audit_backlinks(client, url, data))
+        if "keywords" in modules or "serp" in modules:
+            jobs.append(_audit_keywords(client, url, data, keywords))
+        await asyncio.gather(*jobs)
+    finally:
+        if owns_client:
+            await client.aclose()
+            if client.cache:
+                client.cache.close()  # open_cache() connection opened for this audit
+
+    if client.cache and client.cache.enabled:
+        print(f"[✓] DataForSEO cache: {client.cache.summary()}")
+
+    # 5. AI Enrichment (parallel, off the event loop)
+    await asyncio.to_thread(_enrich_insights, results, modules)
+
     # 6. Final Score Weighting
     if results["data"]["score"] == 0:
         results["data"]["score"] = 65
@@ -325,6 +458,21 @@ def run_audit(url: str, keywords: List[str] = None, modules: List[str] = None, c
     return results
 
 
+def run_audit(url: str, keywords: List[str] = None, modules: List[str] = None, competitors: List[str] = None,
+              use_cache: bool = True, refresh: bool = False) -> Dict:
+    """
+    Synchronous entry point for run_audit_async(). It starts its own event
+    loop, so it cannot be called from a coroutine or a running loop (e.g. a
+    notebook): await run_audit_async() there instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run_audit_async(url, keywords, modules, competitors,
+                                           use_cache=use_cache, refresh=refresh))
+    raise RuntimeError("run_audit() called from a running event loop; await run_audit_async() instead")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="5 Cypress SEO Audit Runner — Powered by DataForSEO")
     parser.add_argument("--website-url", required=True, help="URL to analyze")
@@ -332,6 +480,8 @@ if __name__ == "__main__":
     parser.add_argument("--modules", help="Comma-separated modules: on_page,speed,keywords,backlinks,serp,competitor")
     parser.add_argument("--competitors", help="Comma-separated competitor URLs")
     parser.add_argument("--output", help="Path to save JSON output")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached API responses and re-fetch (still updates the cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the API response cache entirely")
 
     args = parser.parse_args()
 
@@ -340,7 +490,8 @@ if __name__ == "__main__":
     comps = [c.strip() for c in args.competitors.split(",")] if args.competitors else []
 
     try:
-        report = run_audit(args.website_url, kws, mods, comps)
+        report = run_audit(args.website_url, kws, mods, comps,
+                           use_cache=not args.no_cache, refresh=args.refresh)
 
         if args.output:
             import pathlib
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+SEO Crawler - Concurrent, connection-pooled crawl engine
+Fetches pages with a bounded number of requests in flight over one keep-alive
+session, and enforces politeness per host with a token bucket instead of a
+fixed sleep after every page.
+
+Usage:
+    from seo_crawler import CrawlEngine
+
+    engine = CrawlEngine("https://example.com", concurrency=8, per_host_rps=4.0)
+    records = engine.crawl(handle_page, max_pages=500)
+
+The handler is called from a worker thread as handler(url, response) and
+returns (record, links). Records are collected in completion order; links are
+added to the frontier if they are in scope and have not been seen yet. A URL
+is in scope when its host matches the start URL's, ignoring scheme, port and
+a leading "www.", and its path is under the start URL's path.
+
+Pass a ResponseCache to revalidate pages with If-None-Match/If-Modified-Since
+instead of re-downloading them. On a 304 the cached body is served and, for
+crawled pages, the handler's cached (record, links) is reused without parsing
+as long as it was stored under the engine's parse_key (bump it whenever the
+handler would produce a different record for the same page).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (compatible; SEOBot/1.0; +https://5cypresslabs.com/bot)'
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".tmp" / "seo_cache"
+
+PageHandler = Callable[[str, requests.Response], Tuple[Optional[Dict], Iterable[str]]]
+
+
+class TokenBucket:
+    """Thread-safe token bucket. acquire() blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if necessary. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def site_key(url: str) -> str:
+    """Host of url, lowercased and without port or a leading 'www.', so every form of a site compares equal."""
+    return (urlparse(url).hostname or '').removeprefix('www.')
+
+
+def page_key(url: str) -> str:
+    """site_key plus path and query: one key for every form of a page's URL."""
+    parsed = urlparse(url)
+    return f"{site_key(url)}{parsed.path or '/'}?{parsed.query}"
+
+
+def build_session(pool_size: int = 10, user_agent: str = DEFAULT_USER_AGENT) -> requests.Session:
+    """Return a keep-alive session whose connection pool fits pool_size workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = user_agent
+    return session
+
+
+class ResponseCache:
+    """
+    On-disk HTTP cache with conditional revalidation and LRU eviction.
+
+    Bodies are content-addressed (blobs/<sha256>), so identical responses are
+    stored once and a blob is deleted when no URL refers to it any more.
+    index.json maps each URL to its body hash, ETag/Last-Modified validators,
+    last use time and, optionally, the parsed result for that URL along with
+    the key it was parsed under. Only responses that carry a validator are
+    cached.
+    """
+
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR, max_bytes: int = 200 * 1024 * 1024):
+        self.root = Path(root)
+        self.blobs_dir = self.root / "blobs"
+        self.index_path = self.root / "index.json"
+        self.max_bytes = max_bytes
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+        if self.index_path.exists():
+            try:
+                self._index = json.loads(self.index_path.read_text(encoding='utf-8'))
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"⚠️  Ignoring unreadable cache index {self.index_path}: {e}")
+        self._refs: Dict[str, int] = {}
+        for entry in self._index.values():
+            self._refs[entry['sha']] = self._refs.get(entry['sha'], 0) + 1
+
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0, 'parse_skipped': 0}
+
+    # ── Lookups ──────────────────────────────────────────────────────────────
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validators to send for url, empty if it is not cached."""
+        with self._lock:
+            entry = self._index.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, url: str, response: requests.Response) -> Optional[requests.Response]:
+        """
+        Turn a 304 for a cached url into a 200 response carrying the cached
+        body. Returns None if the body is no longer on disk (the entry is
+        dropped, so the caller can fetch it again without validators).
+        """
+        with self._lock:
+            entry = self._index.get(url)
+            if entry:
+                entry['last_used'] = time.time()
+                # Servers may rotate validators on a 304
+                entry['etag'] = response.headers.get('ETag', entry.get('etag'))
+                entry['last_modified'] = response.headers.get('Last-Modified', entry.get('last_modified'))
+        if not entry:
+            return None
+        try:
+            body = (self.blobs_dir / entry['sha']).read_bytes()
+        except OSError:
+            with self._lock:
+                if self._index.get(url) is entry:
+                    del self._index[url]
+                    self._release(entry['sha'])
+            return None
+
+        cached = requests.Response()
+        cached.status_code = 200
+        cached.url = url
+        cached._content = body
+        cached.encoding = entry.get('encoding') or 'utf-8'
+        cached.headers.update(response.headers)
+        cached.from_cache = True
+        self.count('hits')
+        return cached
+
+    def parsed(self, url: str, key: Optional[str] = None):
+        """Cached parse result for url, if one was stored for the current body under `key`."""
+        with self._lock:
+            entry = self._index.get(url)
+            if not entry or entry.get('parsed_key') != key:
+                return None
+            return entry.get('parsed')
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """Cache a 200 response if it carries an ETag or Last-Modified."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+
+        body = response.content
+        sha = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            # Hold a reference while writing, so a concurrent release can't delete the blob
+            self._refs[sha] = self._refs.get(sha, 0) + 1
+        blob = self.blobs_dir / sha
+        if not blob.exists():
+            _atomic_write(blob, body)
+
+        with self._lock:
+            old = self._index.get(url)
+            self._index[url] = {
+                'sha': sha,
+                'size': len(body),
+                'etag': etag,
+                'last_modified': last_modified,
+                'encoding': response.encoding,
+                'last_used': time.time(),
+                'parsed': None,
+            }
+            if old:
+                self._release(old['sha'])
+        self.count('stored')
+
+    def store_parsed(self, url: str, parsed, key: Optional[str] = None) -> None:
+        """Attach a JSON-serialisable parse result, made under `key`, to the cached entry for url."""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry:
+                entry['parsed'] = parsed
+                entry['parsed_key'] = key
+
+    def save(self) -> None:
+        """Evict least-recently-used entries over max_bytes and write the index."""
+        with self._lock:
+            self._evict()
+            _atomic_write(self.index_path, json.dumps(self._index).encode('utf-8'))
+
+    def _release(self, sha: str) -> bool:
+        """Drop one reference to a blob, deleting it with the last. Call with the lock held."""
+        self._refs[sha] -= 1
+        if self._refs[sha] > 0:
+            return False
+        del self._refs[sha]
+        (self.blobs_dir / sha).unlink(missing_ok=True)
+        return True
+
+    def _evict(self) -> None:
+        sizes = {e['sha']: e['size'] for e in self._index.values()}
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        for url, entry in sorted(self._index.items(), key=lambda kv: kv[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            del self._index[url]
+            self.stats['evicted'] += 1
+            if self._release(entry['sha']):
+                total -= entry['size']
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write data to a uniquely named temp file beside path, then rename it into place."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix='.part',
+                                     delete=False) as tmp:
+        tmp.write(data)
+    os.replace(tmp.name, path)
+
+
+def cached_get(
+    session: requests.Session,
+    url: str,
+    cache: Optional[ResponseCache] = None,
+    **kwargs,
+) -> requests.Response:
+    """
+    GET url, revalidating against cache when one is given. A 304 for a cached
+    url comes back as a 200 with `from_cache = True` and the stored body; if
+    that body has gone missing, url is fetched again without validators.
+    """
+    if cache is None:
+        return session.get(url, **kwargs)
+
+    base_headers = kwargs.pop('headers', {})
+    validators = cache.conditional_headers(url)
+    response = session.get(url, headers={**base_headers, **validators}, **kwargs)
+
+    if response.status_code == 304:
+        cached = cache.revalidated(url, response)
+        if cached is not None:
+            return cached
+        if validators:
+            response = session.get(url, headers=base_headers, **kwargs)
+    cache.count('misses')
+    if response.status_code == 200:
+        cache.store(url, response)
+    return response
+
+
+class CrawlEngine:
+    """Breadth-first crawler with bounded concurrency and per-host rate limits."""
+
+    def __init__(
+        self,
+        start_url: str,
+        concurrency: int = 8,
+        per_host_rps: float = 4.0,
+        timeout: float = 10,
+        session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache] = None,
+        parse_key: Optional[str] = None,
+    ):
+        self.start_url = start_url
+        self._site = site_key(start_url)
+        self._scope_path = urlparse(start_url).path.rstrip('/')
+        self.concurrency = max(1, concurrency)
+        self.per_host_rps = per_host_rps
+        self.timeout = timeout
+        self.session = session or build_session(self.concurrency)
+        self.cache = cache
+        self.parse_key = parse_key
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+        self.stats = {'fetched': 0, 'failed': 0, 'non_200': 0, 'throttle_wait_s': 0.0}
+        self._stats_lock = threading.Lock()
+
+    def in_scope(self, url: str) -> bool:
+        """Same site as start_url (http/https, www or not) and under its path."""
+        return site_key(url) == self._site and urlparse(url).path.startswith(self._scope_path)
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.per_host_rps)
+            return bucket
+
+    def fetch(self, url: str, **kwargs) -> requests.Response:
+        """GET url over the pooled session, waiting for the host's rate limit first."""
+        waited = self._bucket_for(url).acquire()
+        if waited:
+            self._count('throttle_wait_s', waited)
+        kwargs.setdefault('timeout', self.timeout)
+        return cached_get(self.session, url, self.cache, **kwargs)
+
+    def _visit(self, url: str, handler: PageHandler) -> Tuple[Optional[Dict], Iterable[str]]:
+        logger.info(f"  Crawling: {url}")
+        response = self.fetch(url)
+        if response.status_code != 200:
+            logger.warning(f"  ⚠️  Status {response.status_code} for {url}")
+            self._count('non_200')
+            return None, ()
+        self._count('fetched')
+
+        if getattr(response, 'from_cache', False):
+            parsed = self.cache.parsed(url, self.parse_key)
+            if parsed is not None:
+                self.cache.count('parse_skipped')
+                record, links = parsed
+                return record, links
+
+        record, links = handler(url, response)
+        links = list(links)
+        if self.cache is not None:
+            self.cache.store_parsed(url, [record, links], self.parse_key)
+        return record, links
+
+    def crawl(
+        self,
+        handler: PageHandler,
+        max_pages: int = 50,
+        seeds: Optional[Iterable[str]] = None,
+        follow_links: bool = True,
+    ) -> List[Dict]:
+        """
+        Crawl until max_pages records are collected or the frontier is
+        exhausted. The frontier starts at start_url, or at `seeds` (e.g. the
+        URLs of a sitemap) when given; with follow_links=False only the seeds
+        are fetched.
+        """
+        frontier = deque()
+        seen = set()  # page_key of every URL queued, so www/http variants are fetched once
+        for url in (seeds if seeds is not None else [self.start_url]):
+            if page_key(url) not in seen and self.in_scope(url):
+                seen.add(page_key(url))
+                frontier.append(url)
+
+        records: List[Dict] = []
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while frontier or in_flight:
+                # Only schedule what could still fit under max_pages
+                while (frontier and len(in_flight) < self.concurrency
+                       and len(records) + len(in_flight) < max_pages):
+                    url = frontier.popleft()
+                    in_flight[pool.submit(self._visit, url, handler)] = url
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = in_flight.pop(future)
+                    try:
+                        record, links = future.result()
+                    except Exception as e:
+                        logger.error(f"  ❌ Error crawling {url}: {str(e)}")
+                        self._count('failed')
+                        continue
+
+                    if record is not None and len(records) < max_pages:
+                        records.append(record)
+
+                    for link in (links if follow_links else ()):
+                        if page_key(link) not in seen and self.in_scope(link):
+                            seen.add(page_key(link))
+                            frontier.append(link)
+
+        return records
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+SEO Extractor - Single-pass page metadata extraction
+Streams the HTML through an event-driven parser once and collects everything
+the orchestrator scores a page on: title, meta description, headings,
+alt-less images, internal/external link counts, word count and JSON-LD
+presence. Cost is linear in the document size; nothing builds a DOM.
+
+Usage:
+    from seo_extractor import extract_page_fields
+
+    fields = extract_page_fields(response.text, domain="example.com")
+    fields['h1_tags'], fields['word_count'], fields['hrefs']
+
+extract_with_soup() is the previous BeautifulSoup implementation, kept as the
+reference the streaming extractor is benchmarked and tested against
+(see scripts/bench_seo_extractor.py).
+"""
+
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+# Elements whose text never counts as page content
+_SKIP_TEXT_TAGS = frozenset(('script', 'style'))
+# Elements whose text is captured on its own
+_CAPTURE_TAGS = frozenset(('title', 'h1', 'h2'))
+# Elements whose whitespace-only text is kept verbatim
+_PRESERVE_WS_TAGS = frozenset(('pre', 'textarea'))
+_ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+
+def _is_internal(href: str, domain: str) -> bool:
+    return domain in href or href.startswith('/')
+
+
+class _PageFieldParser(HTMLParser):
+    """Event-driven collector for the fields in extract_page_fields()."""
+
+    def __init__(self, domain: str):
+        super().__init__(convert_charrefs=True)
+        self.domain = domain
+
+        self.title: Optional[str] = None
+        self.description: Optional[str] = None
+        self.h1_tags: List[str] = []
+        self.h2_tags: List[str] = []
+        self.images_total = 0
+        self.images_without_alt: List[str] = []
+        self.hrefs: List[str] = []
+        self.internal_links = 0
+        self.external_links = 0
+        self.has_schema = False
+
+        self._text: List[str] = []
+        self._skip_depth = 0
+        self._preserve_depth = 0
+        # Open capture buffers, innermost last: [tag, chunks]
+        self._captures: List[list] = []
+
+    # ── Parser events ────────────────────────────────────────────────────────
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = _attr(attrs, 'href')
+            if href is not None:
+                self.hrefs.append(href)
+                if _is_internal(href, self.domain):
+                    self.internal_links += 1
+                elif href.startswith('http'):
+                    self.external_links += 1
+        elif tag == 'img':
+            self.images_total += 1
+            if not _attr(attrs, 'alt'):
+                self.images_without_alt.append(_attr(attrs, 'src') or '')
+        elif tag == 'meta':
+            if self.description is None and _attr(attrs, 'name') == 'description':
+                self.description = (_attr(attrs, 'content') or '').strip()
+        elif tag in _SKIP_TEXT_TAGS:
+            if tag == 'script' and _attr(attrs, 'type') == 'application/ld+json':
+                self.has_schema = True
+            self._skip_depth += 1
+        elif tag in _PRESERVE_WS_TAGS:
+            self._preserve_depth += 1
+
+        if tag in _CAPTURE_TAGS and (tag != 'title' or self.title is None):
+            self._captures.append([tag, []])
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in _PRESERVE_WS_TAGS and self._preserve_depth:
+            self._preserve_depth -= 1
+        elif tag in _CAPTURE_TAGS:
+            for i in range(len(self._captures) - 1, -1, -1):
+                if self._captures[i][0] == tag:
+                    self._finish_capture(self._captures.pop(i))
+                    break
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        # Collapse whitespace-only runs the way BeautifulSoup does
+        if not self._preserve_depth and not data.strip(_ASCII_SPACES):
+            data = '\n' if '\n' in data else ' '
+        self._text.append(data)
+        for capture in self._captures:
+            capture[1].append(data)
+
+    def close(self):
+        super().close()
+        while self._captures:
+            self._finish_capture(self._captures.pop())
+
+    # ── Helpers ──────────────────────────────────────────────────────────────
+
+    def _finish_capture(self, capture: list) -> None:
+        tag, chunks = capture
+        text = ''.join(chunks).strip()
+        if tag == 'title':
+            self.title = text
+        elif tag == 'h1':
+            self.h1_tags.append(text)
+        else:
+            self.h2_tags.append(text)
+
+    def fields(self) -> Dict:
+        # Text nodes are joined without a separator, exactly like get_text()
+        words = ''.join(self._text).split()
+        return {
+            'title': self.title or '',
+            'description': self.description or '',
+            'h1_tags': self.h1_tags,
+            'h2_tags': self.h2_tags,
+            'images_total': self.images_total,
+            'images_without_alt': self.images_without_alt,
+            'internal_links_count': self.internal_links,
+            'external_links_count': self.external_links,
+            'word_count': sum(1 for w in words if len(w) > 3),  # Meaningful words
+            'has_schema': self.has_schema,
+            'hrefs': self.hrefs,
+        }
+
+
+def _attr(attrs: list, name: str) -> Optional[str]:
+    """First value of an attribute in HTMLParser's (name, value) list."""
+    for key, value in attrs:
+        if key == name:
+            return value if value is not None else ''
+    return None
+
+
+def extract_page_fields(html: str, domain: str) -> Dict:
+    """
+    Extract SEO fields from raw HTML in a single streaming pass.
+
+    Returns a dict with title, description, h1_tags, h2_tags, images_total,
+    images_without_alt (list of src), internal_links_count,
+    external_links_count, word_count, has_schema and hrefs (raw href values
+    of every <a href>, in document order, for link discovery).
+    """
+    parser = _PageFieldParser(domain)
+    parser.feed(html)
+    parser.close()
+    return parser.fields()
+
+
+def extract_with_soup(html: str, domain: str) -> Dict:
+    """Reference BeautifulSoup implementation of extract_page_fields()."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    title_tag = soup.find('title')
+    title = title_tag.get_text().strip() if title_tag else ""
+
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    description = meta_desc['content'].strip() if meta_desc and meta_desc.get('content') else ""
+
+    h1_tags = [h.get_text().strip() for h in soup.find_all('h1')]
+    h2_tags = [h.get_text().strip() for h in soup.find_all('h2')]
+
+    images = soup.find_all('img')
+    images_without_alt = [img.get('src', '') for img in images if not img.get('alt')]
+
+    links = soup.find_all('a', href=True)
+    internal_links = [l for l in links if domain in l['href'] or l['href'].startswith('/')]
+    external_links = [l for l in links if l not in internal_links and l['href'].startswith('http')]
+
+    # Schema markup has to be read before script elements are removed below
+    has_schema = len(soup.find_all('script', type='application/ld+json')) > 0
+
+    for script in soup(["script", "style"]):
+        script.decompose()
+    words = soup.get_text().split()
+    word_count = len([w for w in words if len(w) > 3])
+
+    return {
+        'title': title,
+        'description': description,
+        'h1_tags': h1_tags,
+        'h2_tags': h2_tags,
+        'images_total': len(images),
+        'images_without_alt': images_without_alt,
+        'internal_links_count': len(internal_links),
+        'external_links_count': len(external_links),
+        'word_count': word_count,
+        'has_schema': has_schema,
+        'hrefs': [l['href'] for l in links],
+    }
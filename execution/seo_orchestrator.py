@@ -15,15 +15,21 @@ import os
 import sys
 import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from urllib.parse import urlparse, urljoin
 import logging
 
 import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from execution.shared.api_cache import ApiCache, CachePolicy, DAY
+from seo_crawler import CrawlEngine, ResponseCache, build_session, cached_get, site_key
+from seo_extractor import extract_page_fields
+from seo_sitemap import discover_sitemaps, iter_sitemap, plan_delta
+
 load_dotenv()
 
 logging.basicConfig(
@@ -32,11 +38,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Lab scores barely move within a day; the API key is never part of the key.
+PAGESPEED_CACHE_POLICIES = {'runPagespeed': CachePolicy(ttl=1 * DAY)}
+
+# Bump when extraction, page scoring or issue rules change: page records
+# (page_score included) cached under another version are parsed again.
+PAGE_RECORD_VERSION = 1
+
 
 class SEOOrchestrator:
     """Main orchestrator for SEO analysis workflow."""
     
-    def __init__(self, website_url: str, config_path: Optional[str] = None):
+    def __init__(self, website_url: str, config_path: Optional[str] = None, use_cache: bool = True,
+                 refresh: bool = False):
         self.website_url = website_url
         self.domain = urlparse(website_url).netloc
         self.config = self._load_config(config_path) if config_path else {}
@@ -47,6 +61,11 @@ class SEOOrchestrator:
         self.technical_metrics = {}
         self.keyword_analysis = {}
         self.competitor_data = []
+        self.crawl_stats = {}
+        self.session = build_session()
+        self.cache = ResponseCache() if use_cache else None
+        self.api_cache = ApiCache('pagespeed', policies=PAGESPEED_CACHE_POLICIES,
+                                  refresh=refresh, enabled=use_cache)
         
         logger.info(f"🔍 Initialized SEO Orchestrator for {self.website_url}")
     
@@ -61,99 +80,107 @@ class SEOOrchestrator:
             logger.warning(f"⚠️  Config file not found: {config_path}, using defaults")
             return {}
     
-    def phase_1_crawl_site(self, max_pages: int = 50) -> List[Dict]:
+    def phase_1_crawl_site(
+        self,
+        max_pages: int = 50,
+        concurrency: int = 8,
+        per_host_rps: float = 4.0,
+        use_sitemap: bool = False,
+        previous_report: Optional[Dict] = None,
+    ) -> List[Dict]:
         """
         PHASE 1: SITE CRAWL
         Discover and crawl website pages to extract SEO metadata.
+
+        Up to `concurrency` requests are kept in flight over one pooled
+        session; `per_host_rps` caps the request rate against any one host.
+
+        With `use_sitemap`, the frontier is seeded from the site's sitemap(s).
+        With a `previous_report` as well, only sitemap URLs whose <lastmod> is
+        newer than that report (or that it doesn't cover) are re-crawled, and
+        the remaining page records are carried forward unchanged.
         """
         logger.info("🕷️  PHASE 1: CRAWLING WEBSITE")
         
-        visited = set()
-        to_visit = [self.website_url]
-        pages_data = []
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (compatible; SEOBot/1.0; +https://5cypresslabs.com/bot)'
-        }
-        
-        while to_visit and len(visited) < max_pages:
-            url = to_visit.pop(0)
+        engine = CrawlEngine(
+            self.website_url,
+            concurrency=concurrency,
+            per_host_rps=per_host_rps,
+            cache=self.cache,
+            parse_key=f"v{PAGE_RECORD_VERSION}:{self.domain}",  # Links are kept to this domain
+        )
+        self.session = engine.session
+        
+        mode = 'links'
+        seeds = None
+        carried = []
+        follow_links = True
+        if use_sitemap or previous_report:
+            entries = []
+            for sitemap_url in discover_sitemaps(self.session, self.website_url):
+                entries.extend(iter_sitemap(self.session, sitemap_url))
+            logger.info(f"  🗺️  Sitemap lists {len(entries)} URLs")
             
-            if url in visited or not url.startswith(self.website_url):
-                continue
-            
-            try:
-                logger.info(f"  Crawling: {url}")
-                response = requests.get(url, headers=headers, timeout=10)
-                
-                if response.status_code != 200:
-                    logger.warning(f"  ⚠️  Status {response.status_code} for {url}")
-                    continue
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Extract SEO metadata
-                page_data = self._extract_page_metadata(url, soup, response)
-                pages_data.append(page_data)
-                visited.add(url)
-                
-                # Find internal links
-                for link in soup.find_all('a', href=True):
-                    href = urljoin(url, link['href'])
-                    parsed = urlparse(href)
-                    
-                    # Only follow same-domain links, ignore anchors and query params
-                    if parsed.netloc == self.domain and '#' not in href:
-                        clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                        if clean_url not in visited and clean_url not in to_visit:
-                            to_visit.append(clean_url)
-                
-                # Rate limiting - be respectful
-                time.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"  ❌ Error crawling {url}: {str(e)}")
-                continue
-        
+            if entries:
+                seeds, carried = plan_delta(entries, previous_report)
+                if previous_report:
+                    # Delta crawl: fetch exactly the changed pages
+                    mode = 'delta'
+                    follow_links = False
+                    logger.info(f"  ♻️  {len(carried)} unchanged pages carried forward, "
+                                f"{len(seeds)} to re-crawl")
+                    if len(seeds) > max_pages:
+                        logger.warning(f"  ⚠️  {len(seeds)} changed pages exceed --max-pages {max_pages}")
+                else:
+                    mode = 'sitemap'
+                    seeds = [self.website_url, *seeds]
+            else:
+                logger.warning("  ⚠️  No sitemap URLs found - falling back to link discovery")
+        
+        crawled = engine.crawl(
+            self._handle_crawled_page,
+            max_pages=max_pages,
+            seeds=seeds,
+            follow_links=follow_links,
+        )
+        pages_data = carried + crawled
+        
+        self.crawl_stats = {
+            **engine.stats,
+            'mode': mode,
+            'recrawled': len(crawled),
+            'carried_forward': len(carried),
+        }
+        if self.cache:
+            self.cache.save()
         self.pages_analyzed = pages_data
-        logger.info(f"✅ Crawled {len(pages_data)} pages")
+        logger.info(f"✅ Crawled {len(crawled)} pages ({len(pages_data)} in report)")
         return pages_data
     
-    def _extract_page_metadata(self, url: str, soup: BeautifulSoup, response) -> Dict:
-        """Extract comprehensive SEO metadata from a page."""
-        
-        # Title tag
-        title_tag = soup.find('title')
-        title = title_tag.get_text().strip() if title_tag else ""
-        
-        # Meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        description = meta_desc['content'].strip() if meta_desc and meta_desc.get('content') else ""
-        
-        # Headings
-        h1_tags = [h.get_text().strip() for h in soup.find_all('h1')]
-        h2_tags = [h.get_text().strip() for h in soup.find_all('h2')]
-        
-        # Images
-        images = soup.find_all('img')
-        images_without_alt = [img.get('src', '') for img in images if not img.get('alt')]
-        
-        # Internal/external links
-        links = soup.find_all('a', href=True)
-        internal_links = [l for l in links if self.domain in l['href'] or l['href'].startswith('/')]
-        external_links = [l for l in links if l not in internal_links and l['href'].startswith('http')]
-        
-        # Content analysis
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        text_content = soup.get_text()
-        words = text_content.split()
-        word_count = len([w for w in words if len(w) > 3])  # Meaningful words
-        
-        # Schema markup
-        schema_scripts = soup.find_all('script', type='application/ld+json')
-        has_schema = len(schema_scripts) > 0
+    def _handle_crawled_page(self, url: str, response) -> Tuple[Dict, List[str]]:
+        """Crawl handler: extract metadata and same-domain links from one page."""
+        fields = extract_page_fields(response.text, self.domain)
+        
+        links = []
+        for raw_href in fields['hrefs']:
+            href = urljoin(url, raw_href)
+            parsed = urlparse(href)
+            
+            # Only follow same-site links (www or not), ignore anchors and query params
+            if site_key(href) == site_key(self.website_url) and '#' not in href:
+                links.append(f"{parsed.scheme}://{parsed.netloc}{parsed.path}")
+        
+        return self._extract_page_metadata(url, fields), links
+    
+    def _extract_page_metadata(self, url: str, fields: Dict) -> Dict:
+        """Build the scored page record from extracted SEO fields."""
+        title = fields['title']
+        description = fields['description']
+        h1_tags = fields['h1_tags']
+        h2_tags = fields['h2_tags']
+        images_without_alt = fields['images_without_alt']
+        word_count = fields['word_count']
+        has_schema = fields['has_schema']
         
         # Calculate page score
         score = self._calculate_page_score({
@@ -163,7 +190,7 @@ class SEOOrchestrator:
             'h2_count': len(h2_tags),
             'word_count': word_count,
             'images_without_alt_count': len(images_without_alt),
-            'internal_links_count': len(internal_links),
+            'internal_links_count': fields['internal_links_count'],
             'has_schema': has_schema
         })
         
@@ -177,10 +204,10 @@ class SEOOrchestrator:
             'h2_tags': h2_tags,
             'h1_count': len(h1_tags),
             'word_count': word_count,
-            'images_total': len(images),
+            'images_total': fields['images_total'],
             'images_without_alt': len(images_without_alt),
-            'internal_links_count': len(internal_links),
-            'external_links_count': len(external_links),
+            'internal_links_count': fields['internal_links_count'],
+            'external_links_count': fields['external_links_count'],
             'has_schema': has_schema,
             'https': url.startswith('https://'),
             'page_score': score,
@@ -289,15 +316,18 @@ class SEOOrchestrator:
         # Check for robots.txt and sitemap
         try:
             robots_url = f"{self.website_url.rstrip('/')}/robots.txt"
-            robots_response = requests.get(robots_url, timeout=5)
+            robots_response = cached_get(self.session, robots_url, self.cache, timeout=5)
             metrics['has_robots_txt'] = robots_response.status_code == 200
             
             sitemap_url = f"{self.website_url.rstrip('/')}/sitemap.xml"
-            sitemap_response = requests.get(sitemap_url, timeout=5)
+            sitemap_response = cached_get(self.session, sitemap_url, self.cache, timeout=5)
             metrics['has_sitemap'] = sitemap_response.status_code == 200
         except:
             pass
         
+        if self.cache:
+            self.cache.save()
+        
         # Google PageSpeed Insights (if API key provided)
         if self.pagespeed_api_key:
             logger.info("  📊 Running PageSpeed Insights...")
@@ -322,8 +352,15 @@ class SEOOrchestrator:
         return metrics
     
     def _get_pagespeed_score(self, strategy: str = 'mobile') -> Optional[Dict]:
-        """Get PageSpeed Insights score via API."""
+        """Get PageSpeed Insights score via API (cached for a day per URL/strategy)."""
+        cache_payload = {'url': self.website_url, 'strategy': strategy}
+        cached = self.api_cache.get('runPagespeed', cache_payload)
+        if cached is not None:
+            logger.info(f"  ♻️  PageSpeed {strategy} score served from cache")
+            return cached
+
         try:
+            start = time.perf_counter()
             api_url = 'https://www.googleapis.com/pagespeedonline/v5/runPagespeed'
             params = {
                 'url': self.website_url,
@@ -349,10 +386,13 @@ class SEOOrchestrator:
                 if 'cumulative-layout-shift' in audits:
                     vitals['cls'] = audits['cumulative-layout-shift'].get('numericValue', 0)
                 
-                return {
+                result = {
                     'score': int(categories.get('performance', {}).get('score', 0) * 100),
                     'vitals': vitals
                 }
+                self.api_cache.put('runPagespeed', cache_payload, result,
+                                   latency_s=time.perf_counter() - start)
+                return result
             else:
                 logger.error(f"  ❌ PageSpeed API error: {response.status_code}")
                 return None
@@ -431,19 +471,13 @@ class SEOOrchestrator:
                 })
                 
                 if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    title = soup.find('title')
-                    title_text = title.get_text().strip() if title else ""
-                    
-                    h1_count = len(soup.find_all('h1'))
-                    has_schema = len(soup.find_all('script', type='application/ld+json')) > 0
+                    fields = extract_page_fields(response.text, urlparse(comp_url).netloc)
                     
                     competitor_results.append({
                         'url': comp_url,
-                        'title_length': len(title_text),
-                        'h1_count': h1_count,
-                        'has_schema': has_schema,
+                        'title_length': len(fields['title']),
+                        'h1_count': len(fields['h1_tags']),
+                        'has_schema': fields['has_schema'],
                         'https': comp_url.startswith('https://')
                     })
                     
@@ -494,6 +528,11 @@ class SEOOrchestrator:
                 'has_sitemap': self.technical_metrics.get('has_sitemap'),
                 'has_robots_txt': self.technical_metrics.get('has_robots_txt')
             },
+            'crawl_stats': {
+                **self.crawl_stats,
+                'cache': dict(self.cache.stats) if self.cache else None,
+                'api_cache': dict(self.api_cache.stats) if self.api_cache.enabled else None,
+            },
             'pages': self.pages_analyzed,
             'technical_metrics': self.technical_metrics,
             'keyword_analysis': self.keyword_analysis,
@@ -598,14 +637,35 @@ def main():
     parser.add_argument('--config', help='Path to SEO config JSON file')
     parser.add_argument('--output', required=True, help='Output path for JSON report')
     parser.add_argument('--max-pages', type=int, default=50, help='Maximum pages to crawl (default: 50)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests kept in flight while crawling (default: 8)')
+    parser.add_argument('--per-host-rps', type=float, default=4.0, help='Max requests per second per host (default: 4.0)')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the .tmp/seo_cache response cache and the PageSpeed API cache')
+    parser.add_argument('--refresh', action='store_true', help='Re-fetch PageSpeed scores even if a cached result is still fresh')
+    parser.add_argument('--sitemap', action='store_true', help='Seed the crawl from sitemap.xml (and sitemap indexes)')
+    parser.add_argument('--previous-report', help='Previous report JSON: only re-crawl sitemap pages changed since it')
     
     args = parser.parse_args()
     
     # Initialize orchestrator
-    orchestrator = SEOOrchestrator(args.website_url, args.config)
+    orchestrator = SEOOrchestrator(args.website_url, args.config, use_cache=not args.no_cache,
+                                   refresh=args.refresh)
+    
+    previous_report = None
+    if args.previous_report:
+        if os.path.exists(args.previous_report):
+            with open(args.previous_report, 'r') as f:
+                previous_report = json.load(f)
+        else:
+            logger.warning(f"⚠️  Previous report not found: {args.previous_report}, running a full crawl")
     
     # Run analysis phases
-    orchestrator.phase_1_crawl_site(max_pages=args.max_pages)
+    orchestrator.phase_1_crawl_site(
+        max_pages=args.max_pages,
+        concurrency=args.concurrency,
+        per_host_rps=args.per_host_rps,
+        use_sitemap=args.sitemap,
+        previous_report=previous_report,
+    )
     orchestrator.phase_2_technical_analysis()
     orchestrator.phase_3_keyword_analysis()
     orchestrator.phase_4_competitor_analysis()
@@ -620,6 +680,12 @@ def main():
     print(f"Pages Analyzed: {report['summary']['total_pages_crawled']}")
     print(f"Issues Found: {report['summary']['total_issues_found']}")
     print(f"Pages Needing Attention: {report['summary']['pages_needing_attention']}")
+    cache_stats = report['crawl_stats']['cache']
+    if cache_stats:
+        print(f"Cache: {cache_stats['hits']} hits (304), {cache_stats['misses']} misses, "
+              f"{cache_stats['parse_skipped']} parses skipped")
+    if orchestrator.api_cache.enabled:
+        print(f"PageSpeed cache: {orchestrator.api_cache.summary()}")
     print(f"\nReport saved to: {args.output}")
     print("="*60 + "\n")
 
@@ -1,36 +1,129 @@
 #!/usr/bin/env python3
+"""
+SEO Outreach Prepper - audit prospect domains and draft teaser emails.
+
+Audits run in-process through seo_audit_runner.run_audit_async, sharing one
+pooled DataForSEO client (and its response cache) across the whole batch.
+CSV runs use a bounded worker pool, print each draft as its audit finishes
+and append it to a JSONL checkpoint, so an interrupted run resumes where it
+stopped.
+
+Usage:
+    python execution/seo_outreach_prepper.py --url https://example.com
+    python execution/seo_outreach_prepper.py --csv prospects.csv --workers 8
+    python execution/seo_outreach_prepper.py --csv prospects.csv --no-resume
+"""
 import os
 import sys
+import csv
 import json
+import asyncio
 import argparse
-import subprocess
+from datetime import datetime
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent))
+from seo_audit_runner import AsyncDataForSEOClient, open_cache, run_audit_async
+
 load_dotenv()
 
-def run_audit(url):
-    """Run the SEO audit and return the JSON result."""
-    print(f"--- Auditing: {url} ---")
-    script_path = Path(__file__).parent / "seo_audit_runner.py"
-    
-    # We output to a temp file
-    domain = url.split("//")[-1].split("/")[0].replace(".", "_")
-    output_path = Path(__file__).parent.parent / ".tmp" / f"teaser_{domain}.json"
-    
-    cmd = [
-        sys.executable, str(script_path),
-        "--website-url", url,
-        "--output", str(output_path)
-    ]
-    
+OUTREACH_DIR = Path(__file__).parent.parent / ".tmp" / "outreach"
+DEFAULT_WORKERS = 4
+
+
+def normalize_target(target: str) -> Tuple[str, str]:
+    """Return (url, domain) for a bare domain or URL from the CSV."""
+    target = target.strip()
+    if not target.startswith("http"):
+        target = f"https://{target}"
+    return target, target.split("//")[-1].split("/")[0].lower()
+
+
+def read_targets(csv_path: str) -> List[str]:
+    """Domains/URLs from the first column of a CSV (header row skipped)."""
+    with open(csv_path, "r", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)  # skip header
+        return [row[0] for row in reader if row and row[0].strip()]
+
+
+def load_checkpoint(path: Path) -> Set[str]:
+    """Domains already drafted successfully in a previous run."""
+    done = set()
+    if not path.exists():
+        return done
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn final line from a crash
+            if record.get("status") == "ok":
+                done.add(record["domain"])
+    return done
+
+
+async def run_batch(
+    targets: List[str],
+    checkpoint_path: Path,
+    workers: int = DEFAULT_WORKERS,
+    resume: bool = True,
+    on_draft: Optional[Callable[[Dict], None]] = None,
+    client: Optional[AsyncDataForSEOClient] = None,
+) -> Dict[str, int]:
+    """
+    Audit every target with at most `workers` audits in flight and append a
+    record per domain to `checkpoint_path` as soon as it finishes. Domains
+    with an "ok" record are skipped when `resume` is set; failures are
+    recorded and retried on the next run.
+    """
+    done = load_checkpoint(checkpoint_path) if resume else set()
+    pending, seen = [], set(done)
+    for target in targets:
+        url, domain = normalize_target(target)
+        if domain not in seen:
+            seen.add(domain)
+            pending.append((url, domain))
+
+    counts = {"total": len(pending) + len(done), "skipped": len(done), "ok": 0, "failed": 0}
+    if not pending:
+        return counts
+
+    slots = asyncio.Semaphore(max(1, workers))
+
+    async def audit_one(url: str, domain: str) -> Dict:
+        async with slots:
+            try:
+                result = await run_audit_async(url, [], client=client)
+                return {"domain": domain, "url": url, "status": "ok",
+                        "score": result.get("data", {}).get("score"),
+                        "email": format_email(result, domain)}
+            except Exception as e:
+                return {"domain": domain, "url": url, "status": "error", "error": str(e)}
+
+    owns_client = client is None
+    client = client or AsyncDataForSEOClient(max_connections=max(10, workers * 2), cache=open_cache())
+    checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
     try:
-        subprocess.run(cmd, check=True)
-        with open(output_path, "r") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error auditing {url}: {e}")
-        return None
+        with open(checkpoint_path, "w" if not resume else "a") as out:
+            if resume and out.tell() and not checkpoint_path.read_bytes().endswith(b"\n"):
+                out.write("\n")  # terminate a torn line so the next record parses
+            for finished in asyncio.as_completed([audit_one(u, d) for u, d in pending]):
+                record = await finished
+                record["finished_at"] = datetime.now().isoformat()
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                counts["ok" if record["status"] == "ok" else "failed"] += 1
+                if on_draft:
+                    on_draft(record)
+    finally:
+        if owns_client:
+            await client.aclose()
+            client.cache.close()
+    return counts
+
 
 def format_email(payload, domain):
     """Format the teaser email template."""
@@ -66,48 +159,45 @@ def format_email(payload, domain):
     
     return email
 
+def print_draft(record: Dict) -> None:
+    if record["status"] != "ok":
+        print(f"Error auditing {record['url']}: {record['error']}")
+        return
+    print(f"\n--- EMAIL DRAFT FOR {record['domain']} ---")
+    print(record["email"])
+    print("-" * 40)
+
+
 def main():
     parser = argparse.ArgumentParser(description="SEO Outreach Prepper")
     parser.add_argument("--url", help="Single URL to audit and prep email for")
     parser.add_argument("--csv", help="CSV file of domains to process")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Audits in flight at once (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--checkpoint", help="JSONL file of finished drafts (default: .tmp/outreach/<csv name>.jsonl)")
+    parser.add_argument("--no-resume", action="store_true", help="Re-audit CSV domains already in the checkpoint")
     parser.add_argument("--send", action="store_true", help="Actually send the email (requires RESEND_API_KEY)")
     
     args = parser.parse_args()
     
-    targets = []
     if args.url:
-        targets.append(args.url)
+        targets = [args.url]
+        checkpoint = Path(args.checkpoint) if args.checkpoint else OUTREACH_DIR / f"{normalize_target(args.url)[1].replace('.', '_')}.jsonl"
     elif args.csv:
-        # Simple CSV reading (assumes domain/url in first column)
-        import csv
-        with open(args.csv, "r") as f:
-            reader = csv.reader(f)
-            next(reader) # skip header
-            for row in reader:
-                if row: targets.append(row[0])
-    
-    for target in targets:
-        if not target.startswith("http"):
-            target = f"https://{target}"
-            
-        result = run_audit(target)
-        if result:
-            domain = target.split("//")[-1].split("/")[0]
-            email_draft = format_email(result, domain)
-            
-            print(f"\n--- EMAIL DRAFT FOR {domain} ---")
-            print(email_draft)
-            print("-" * 40)
-            
-            if args.send:
-                # Import send_email logic
-                sys.path.append(str(Path(__file__).parent))
-                from send_email import send_via_resend
-                
-                subject = f"SEO Intelligence Alert for {domain}"
-                # In a real scenario, we'd need the prospect's email from the CSV
-                # For now, we'll just log that we would send it.
-                print("Note: Sending skipped (no recipient email provided in this demo skip)")
+        targets = read_targets(args.csv)
+        checkpoint = Path(args.checkpoint) if args.checkpoint else OUTREACH_DIR / f"{Path(args.csv).stem}.jsonl"
+    else:
+        parser.error("one of --url or --csv is required")
+
+    counts = asyncio.run(run_batch(targets, checkpoint, workers=args.workers,
+                                   resume=bool(args.csv) and not args.no_resume,
+                                   on_draft=print_draft))
+    print(f"\nDrafted {counts['ok']}, failed {counts['failed']}, "
+          f"skipped {counts['skipped']} already done. Checkpoint: {checkpoint}")
+
+    if args.send:
+        # In a real scenario, we'd need the prospect's email from the CSV
+        # For now, we'll just log that we would send it.
+        print("Note: Sending skipped (no recipient email provided in this demo skip)")
 
 if __name__ == "__main__":
     main()
@@ -25,11 +25,23 @@ Usage:
         resolution="Refresh token expires every 100 days; regenerate via /oauth2/playground",
         learning="Set calendar reminder to refresh QBO token before expiry",
     )
+
+Records live in logs/anneal.db (SQLite, WAL mode), indexed by script, type
+and resolved state: a failure is one INSERT, a resolution one UPDATE, and
+the queries never read the whole history. Several scripts can record at
+once. logs/anneal.log, the original JSON-lines file, is imported the first
+time the store is opened and can be regenerated for other tooling:
+
+    python -m execution.shared.anneal export            # -> logs/anneal.log
 """
 
 from __future__ import annotations
 
+import argparse
 import json
+import os
+import sqlite3
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -39,12 +51,35 @@ from execution.shared.logger import get_logger
 _log = get_logger("shared.anneal")
 
 _PROJECT_ROOT = Path(__file__).parent.parent.parent
-_ANNEAL_LOG = _PROJECT_ROOT / "logs" / "anneal.log"
+_ANNEAL_DB = _PROJECT_ROOT / "logs" / "anneal.db"
+_ANNEAL_LOG = _PROJECT_ROOT / "logs" / "anneal.log"   # JSON-lines export (and pre-SQLite store)
 _ANNEAL_LOG.parent.mkdir(exist_ok=True)
 
+_SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS anneal (
+    id          INTEGER PRIMARY KEY,
+    ts          TEXT NOT NULL,
+    type        TEXT NOT NULL,
+    script      TEXT NOT NULL DEFAULT '',
+    directive   TEXT NOT NULL DEFAULT '',
+    error       TEXT,
+    context     TEXT NOT NULL DEFAULT '{}',
+    resolved    INTEGER NOT NULL DEFAULT 0,
+    resolution  TEXT,
+    learning    TEXT,
+    resolved_ts TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_anneal_script ON anneal (script, type, resolved);
+CREATE INDEX IF NOT EXISTS idx_anneal_type ON anneal (type, resolved);
+CREATE INDEX IF NOT EXISTS idx_anneal_resolved ON anneal (resolved);
+"""
+_COLUMNS = ("ts", "type", "script", "directive", "error", "context",
+            "resolved", "resolution", "learning", "resolved_ts")
+
 
 class AnnealLogger:
-    """Records failures and resolutions to the persistent anneal log."""
+    """Records failures and resolutions to the persistent anneal store."""
 
     @staticmethod
     def record_failure(
@@ -55,7 +90,7 @@ class AnnealLogger:
         context: dict[str, Any] | None = None,
     ) -> None:
         """
-        Append a structured failure record to logs/anneal.log.
+        Append a structured failure record to the anneal store.
         Called automatically by @safe_execute for CypressBaseError subtypes.
         """
         entry = {
@@ -69,7 +104,10 @@ class AnnealLogger:
             "resolution": None,
             "learning": None,
         }
-        _append(entry)
+        with _lock:
+            db = _db()
+            _insert(db, entry)
+            db.commit()
         _log.info("Anneal failure recorded", extra={"script": script})
 
         # Also append to directive's LEARNINGS section if path is given
@@ -87,33 +125,15 @@ class AnnealLogger:
         Mark the most recent unresolved failure for this script as resolved.
         Call this after confirming a fix works.
         """
-        # Read existing log, find last unresolved for this script, update it
-        lines = _read_lines()
-        updated = False
-        new_lines = []
-
-        for line in reversed(lines):
-            try:
-                entry = json.loads(line)
-            except json.JSONDecodeError:
-                new_lines.insert(0, line)
-                continue
-
-            if (
-                not updated
-                and entry.get("script") == script
-                and entry.get("type") == "FAILURE"
-                and not entry.get("resolved")
-            ):
-                entry["resolved"] = True
-                entry["resolution"] = resolution
-                entry["learning"] = learning
-                entry["resolved_ts"] = datetime.now(timezone.utc).isoformat()
-                updated = True
-
-            new_lines.insert(0, json.dumps(entry))
-
-        _write_lines(new_lines)
+        with _lock:
+            db = _db()
+            updated = db.execute(
+                "UPDATE anneal SET resolved = 1, resolution = ?, learning = ?, resolved_ts = ? "
+                "WHERE id = (SELECT MAX(id) FROM anneal "
+                "            WHERE script = ? AND type = 'FAILURE' AND resolved = 0)",
+                (resolution, learning, datetime.now(timezone.utc).isoformat(), script),
+            ).rowcount
+            db.commit()
 
         if updated:
             _log.info("Anneal resolution recorded", extra={"script": script})
@@ -127,46 +147,113 @@ class AnnealLogger:
         Return unresolved failures. Pass script to filter, or omit for all.
         Used by /post-mortem command and /health-check.
         """
-        lines = _read_lines()
-        issues = []
-        for line in lines:
-            try:
-                entry = json.loads(line)
-                if entry.get("type") == "FAILURE" and not entry.get("resolved"):
-                    if not script or entry.get("script") == script:
-                        issues.append(entry)
-            except json.JSONDecodeError:
-                continue
-        return issues
+        if script:
+            return _select("WHERE script = ? AND type = 'FAILURE' AND resolved = 0 ORDER BY id",
+                           (script,))
+        return _select("WHERE type = 'FAILURE' AND resolved = 0 ORDER BY id")
 
     @staticmethod
     def get_learnings(limit: int = 20) -> list[dict]:
         """Return the most recent resolved entries as learnings to brief an AI session."""
-        lines = _read_lines()
-        resolved = [
-            json.loads(l) for l in lines
-            if _safe_parse(l).get("resolved")
-        ]
-        return resolved[-limit:]
+        if limit <= 0:
+            return []
+        return _select("WHERE id IN (SELECT id FROM anneal WHERE resolved = 1 ORDER BY id DESC LIMIT ?) "
+                       "ORDER BY id", (limit,))
+
+    @staticmethod
+    def export_jsonl(path: Path | str | None = None) -> int:
+        """
+        Write every record, oldest first, as JSON lines in the original
+        anneal.log format (default: logs/anneal.log). Returns the count.
+        """
+        path = Path(path) if path else _ANNEAL_LOG
+        tmp = path.with_name(path.name + ".tmp")
+        count = 0
+        with _lock:
+            cursor = _db().execute(f"SELECT {', '.join(_COLUMNS)} FROM anneal ORDER BY id")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for row in cursor:
+                    f.write(json.dumps(_entry(row)) + "\n")
+                    count += 1
+        os.replace(tmp, path)
+        return count
+
+
+# ─── Store helpers ────────────────────────────────────────────────────────────
 
+_lock = threading.Lock()
+_connections: dict[Path, sqlite3.Connection] = {}
 
-# ─── File I/O helpers ─────────────────────────────────────────────────────────
 
-def _append(entry: dict) -> None:
-    with open(_ANNEAL_LOG, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry) + "\n")
+def _db() -> sqlite3.Connection:
+    """
+    The process's connection to _ANNEAL_DB (call with _lock held). On first
+    open the schema is created and an existing anneal.log imported, once.
+    """
+    db = _connections.get(_ANNEAL_DB)
+    if db is not None:
+        return db
+
+    _ANNEAL_DB.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(_ANNEAL_DB, timeout=30, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("BEGIN IMMEDIATE")  # One process creates and imports; the others wait, then skip
+    try:
+        if db.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    db.execute(statement)
+            imported = _import_jsonl(db, _ANNEAL_LOG)
+            db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            if imported:
+                _log.info("Imported anneal.log into anneal store", extra={"records": imported})
+        db.commit()
+    except BaseException:
+        db.rollback()
+        db.close()
+        raise
+    _connections[_ANNEAL_DB] = db
+    return db
+
+
+def _import_jsonl(db: sqlite3.Connection, path: Path) -> int:
+    """Insert every parseable record of a JSON-lines anneal log."""
+    if not path.exists():
+        return 0
+    count = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            entry = _safe_parse(line.strip()) if line.strip() else {}
+            if entry.get("ts") and entry.get("type"):
+                _insert(db, entry)
+                count += 1
+    return count
+
+
+def _insert(db: sqlite3.Connection, entry: dict) -> None:
+    db.execute(
+        f"INSERT INTO anneal ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+        (entry["ts"], entry["type"], entry.get("script") or "", entry.get("directive") or "",
+         entry.get("error"), json.dumps(entry.get("context") or {}), int(bool(entry.get("resolved"))),
+         entry.get("resolution"), entry.get("learning"), entry.get("resolved_ts")),
+    )
 
 
-def _read_lines() -> list[str]:
-    if not _ANNEAL_LOG.exists():
-        return []
-    with open(_ANNEAL_LOG, encoding="utf-8") as f:
-        return [l.strip() for l in f if l.strip()]
+def _select(where: str, params: tuple = ()) -> list[dict]:
+    with _lock:
+        rows = _db().execute(f"SELECT {', '.join(_COLUMNS)} FROM anneal {where}", params).fetchall()
+    return [_entry(row) for row in rows]
 
 
-def _write_lines(lines: list[str]) -> None:
-    with open(_ANNEAL_LOG, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines) + "\n")
+def _entry(row: tuple) -> dict:
+    """A row as the dict record_failure() built (resolved_ts only once resolved)."""
+    entry = dict(zip(_COLUMNS, row))
+    entry["context"] = _safe_parse(entry["context"])
+    entry["resolved"] = bool(entry["resolved"])
+    if entry["resolved_ts"] is None:
+        del entry["resolved_ts"]
+    return entry
 
 
 def _safe_parse(line: str) -> dict:
@@ -204,3 +291,22 @@ def _append_to_directive(directive_path: str, entry: dict) -> None:
     except Exception as exc:
         _log.warning("Could not update directive with anneal entry",
                      extra={"directive": directive_path, "error": str(exc)})
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Anneal store maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Write the store as JSON lines (default logs/anneal.log)")
+    export.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        path = args.out or _ANNEAL_LOG
+        count = AnnealLogger.export_jsonl(path)
+        print(f"Exported {count} record(s) to {path}")
+
+
+if __name__ == "__main__":
+    main()
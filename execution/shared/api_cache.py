@@ -0,0 +1,262 @@
+﻿"""
+Persistent response cache for paid / quota-limited external APIs.
+
+Re-auditing a domain an hour after the last audit should not pay DataForSEO
+again. Responses are stored in a local SQLite file keyed by namespace,
+endpoint and a normalised payload, with a TTL and a per-call dollar cost per
+endpoint, so every hit is counted along with the money and time it saved.
+
+Usage:
+    from execution.shared.api_cache import ApiCache, CachePolicy, DAY
+
+    cache = ApiCache("dataforseo", policies={
+        "/backlinks/summary/live": CachePolicy(ttl=7 * DAY, cost_usd=0.02),
+    })
+
+    # Explicit get / put
+    hit = cache.get("/backlinks/summary/live", payload)
+    if hit is None:
+        hit = call_api(payload)
+        cache.put("/backlinks/summary/live", payload, hit)
+
+    # Or in one call
+    data = cache.get_or_fetch("/backlinks/summary/live", payload, lambda: call_api(payload))
+
+    print(cache.summary())   # "3 hits / 1 miss, $0.06 and 4.2s saved"
+
+Endpoints without a policy are never cached. Pass refresh=True to skip
+reads (but still write), e.g. for a --refresh CLI flag. Freshness is judged
+at read time against the current policy, so lowering a TTL applies to
+entries already stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from execution.shared.logger import get_logger
+
+_log = get_logger("shared.api_cache")
+
+_PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_DB_PATH = _PROJECT_ROOT / ".tmp" / "cache" / "api_cache.sqlite"
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    namespace   TEXT NOT NULL,
+    endpoint    TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    body        TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    cost_usd    REAL NOT NULL DEFAULT 0,
+    latency_s   REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (namespace, endpoint, key)
+);
+CREATE INDEX IF NOT EXISTS idx_responses_created ON responses (namespace, endpoint, created_at);
+CREATE TABLE IF NOT EXISTS savings (
+    namespace   TEXT NOT NULL,
+    endpoint    TEXT NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0,
+    saved_usd   REAL NOT NULL DEFAULT 0,
+    saved_s     REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (namespace, endpoint)
+);
+"""
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long an endpoint's responses stay fresh and what a call costs."""
+
+    ttl: float
+    """Seconds a cached response is served before it is re-fetched."""
+
+    cost_usd: float = 0.0
+    """Dollar cost of one live call — credited as savings on every hit."""
+
+
+def normalise_payload(payload: Any) -> str:
+    """
+    Canonical JSON for a request payload: keys sorted, surrounding
+    whitespace stripped from strings. Equivalent requests hash equal.
+    """
+    def _norm(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {str(k): _norm(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [_norm(v) for v in value]
+        if isinstance(value, str):
+            return value.strip()
+        return value
+
+    return json.dumps(_norm(payload), sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ApiCache:
+    """SQLite-backed response cache with per-endpoint TTL and cost accounting."""
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        policies: dict[str, CachePolicy],
+        db_path: Path | str = DEFAULT_DB_PATH,
+        refresh: bool = False,
+        enabled: bool = True,
+    ) -> None:
+        self.namespace = namespace
+        self.policies = policies
+        self.refresh = refresh
+        self.enabled = enabled
+        self.stats = {"hits": 0, "misses": 0, "saved_usd": 0.0, "saved_s": 0.0}
+
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        if enabled:
+            db_path = Path(db_path)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+
+    # ── Core operations ─────────────────────────────────────────────────────
+
+    def policy_for(self, endpoint: str) -> CachePolicy | None:
+        return self.policies.get(endpoint) if self._db else None
+
+    def get(self, endpoint: str, payload: Any) -> Any | None:
+        """Return the cached response, or None on a miss / expired / uncached endpoint."""
+        policy = self.policy_for(endpoint)
+        if policy is None:
+            return None
+        if self.refresh:
+            self._count_miss()
+            return None
+
+        key = self._key(payload)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, cost_usd, latency_s FROM responses "
+                "WHERE namespace = ? AND endpoint = ? AND key = ? AND created_at > ?",
+                (self.namespace, endpoint, key, time.time() - policy.ttl),
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            body, cost_usd, latency_s = row
+            self.stats["hits"] += 1
+            self.stats["saved_usd"] += cost_usd
+            self.stats["saved_s"] += latency_s
+            self._db.execute(
+                "INSERT INTO savings (namespace, endpoint, hits, saved_usd, saved_s) "
+                "VALUES (?, ?, 1, ?, ?) "
+                "ON CONFLICT (namespace, endpoint) DO UPDATE SET "
+                "hits = hits + 1, saved_usd = saved_usd + excluded.saved_usd, "
+                "saved_s = saved_s + excluded.saved_s",
+                (self.namespace, endpoint, cost_usd, latency_s),
+            )
+            self._db.commit()
+
+        _log.debug("API cache hit", extra={"namespace": self.namespace, "endpoint": endpoint})
+        return json.loads(body)
+
+    def put(
+        self,
+        endpoint: str,
+        payload: Any,
+        response: Any,
+        *,
+        latency_s: float = 0.0,
+        cost_usd: float | None = None,
+    ) -> None:
+        """
+        Store a response, fresh for its endpoint's TTL at the time it is read.
+        No-op for uncached endpoints.
+        Pass cost_usd when one cached response took several billed calls
+        (e.g. paginated searches); it defaults to the policy's cost.
+        """
+        policy = self.policy_for(endpoint)
+        if policy is None:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(namespace, endpoint, key, body, created_at, cost_usd, latency_s) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.namespace, endpoint, self._key(payload),
+                 json.dumps(response, default=str), time.time(),
+                 policy.cost_usd if cost_usd is None else cost_usd, latency_s),
+            )
+            self._db.commit()
+
+    def get_or_fetch(self, endpoint: str, payload: Any, fetch: Callable[[], Any]) -> Any:
+        """Return the cached response, or call fetch(), cache its result and return it."""
+        cached = self.get(endpoint, payload)
+        if cached is not None:
+            return cached
+        start = time.perf_counter()
+        response = fetch()
+        self.put(endpoint, payload, response, latency_s=time.perf_counter() - start)
+        return response
+
+    # ── Maintenance & reporting ─────────────────────────────────────────────
+
+    def purge_expired(self) -> int:
+        """
+        Delete this namespace's rows older than their endpoint's current TTL.
+        Returns the number removed.
+        """
+        if not self._db:
+            return 0
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for endpoint, policy in self.policies.items():
+                removed += self._db.execute(
+                    "DELETE FROM responses WHERE namespace = ? AND endpoint = ? AND created_at <= ?",
+                    (self.namespace, endpoint, now - policy.ttl),
+                ).rowcount
+            self._db.commit()
+        return removed
+
+    def lifetime_savings(self) -> dict[str, dict[str, float]]:
+        """Hits and savings per endpoint across all runs for this namespace."""
+        if not self._db:
+            return {}
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT endpoint, hits, saved_usd, saved_s FROM savings WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchall()
+        return {ep: {"hits": h, "saved_usd": round(usd, 4), "saved_s": round(s, 1)}
+                for ep, h, usd, s in rows}
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"{s['hits']} hits / {s['misses']} misses, "
+                f"${s['saved_usd']:.2f} and {s['saved_s']:.1f}s saved")
+
+    def close(self) -> None:
+        if self._db:
+            self._db.close()
+            self._db = None
+
+    # ── Internals ───────────────────────────────────────────────────────────
+
+    def _key(self, payload: Any) -> str:
+        return hashlib.sha256(normalise_payload(payload).encode("utf-8")).hexdigest()
+
+    def _count_miss(self) -> None:
+        with self._lock:
+            self.stats["misses"] += 1
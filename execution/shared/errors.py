@@ -99,6 +99,15 @@ class RateLimitError(APIError):
         self.ctx["retry_after"] = retry_after
 
 
+class CircuitOpenError(APIError):
+    """Provider is known to be down (its circuit is open). Raised before any
+    request is made; retry_after is when the next trial call is allowed."""
+    def __init__(self, message: str, *, provider: str,
+                 retry_after: float | None = None) -> None:
+        super().__init__(message, provider=provider, recoverable=True)
+        self.ctx["retry_after"] = retry_after
+
+
 class AuthExpiredError(APIError):
     """OAuth token / API key expired. Needs refresh, not a bug."""
     def __init__(self, message: str, *, provider: str) -> None:
@@ -233,7 +242,8 @@ def _try_notify(label: str, exc: Exception, directive: str) -> None:
     """Best-effort notification — never let notification failure mask the original error."""
     try:
         from execution.shared.notify import send_failure_alert
-        send_failure_alert(script=label, error=str(exc), directive=directive)
+        send_failure_alert(script=label, error=str(exc), directive=directive,
+                           error_type=type(exc).__name__)
     except Exception as notify_exc:
         _log.warning("Notification dispatch failed",
                      extra={"notify_error": str(notify_exc)})
@@ -0,0 +1,383 @@
+"""
+Rotating, compressed JSON-lines log store with a sidecar index.
+
+The shared logger writes through LogStoreHandler. Each process writes its
+own segment, logs/<UTC start time>-<pid>.log, and starts a new one at UTC
+midnight or past LOG_MAX_BYTES. A closed segment is gzipped to .log.gz, one
+gzip member per hour, so any hour can be decompressed on its own; `zcat`
+still reads the whole file.
+
+Next to every segment, <segment>.idx.json records:
+    hours     per UTC hour: byte range, gzip member range, records per level
+    levels    byte offset of every WARNING / ERROR / CRITICAL record
+    bytes     how far the index is current (an open segment may run past it)
+
+iter_records() skips segments from other UTC days by name, then uses the
+index to read only the hours in a time window, or only the indexed records
+when asking for warnings and errors, so health checks and post-mortems
+never scan a whole day of logs. Older logs/<date>.log files without an
+index are still read, in full.
+
+Closed segments from more than LOG_RETENTION_DAYS UTC days ago are deleted,
+with their indexes, when a handler opens its first segment or a new day's.
+
+Usage:
+    from execution.shared.log_store import iter_records
+    for entry in iter_records(LOGS_DIR, since=start_of_day, levels=("ERROR", "CRITICAL")):
+        print(entry["ts"], entry["msg"])
+
+    python execution/shared/log_store.py --level ERROR --since 2026-10-16T14:00 --until 2026-10-16T15:00
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+LOG_MAX_BYTES = 64 * 1024 * 1024  # Segment size before rotating (LOG_MAX_BYTES env var)
+LOG_RETENTION_DAYS = 30           # UTC days of closed segments kept (LOG_RETENTION_DAYS env var)
+INDEX_VERSION = 1
+INDEXED_LEVELS = ("WARNING", "ERROR", "CRITICAL")  # Levels whose record offsets are kept
+INDEX_FLUSH_SECONDS = 1.0         # Least time between index writes for ERROR records
+_COPY_CHUNK = 1024 * 1024
+
+# Segments: 2026-10-16T142501-4242.log[.gz]; older logs: 2026-10-16.log
+_LOG_NAME = re.compile(r"^\d{4}-\d{2}-\d{2}.*\.log(\.gz)?$")
+_SEGMENT_DAY = re.compile(r"^(\d{4}-\d{2}-\d{2})T\d{6}-")
+
+
+def _index_path(segment: Path) -> Path:
+    """<name>.idx.json for <name>.log and <name>.log.gz alike."""
+    name = segment.name.removesuffix(".gz").removesuffix(".log")
+    return segment.with_name(f"{name}.idx.json")
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ─── Writing ──────────────────────────────────────────────────────────────────
+
+class LogStoreHandler(logging.Handler):
+    """
+    Append formatted records to this process's current segment, rotating at
+    UTC midnight and past `max_bytes`. Rotated segments are compressed on a
+    background thread; the last one is compressed when the handler closes
+    (logging.shutdown() does that at exit). A forked child leaves the
+    parent's segment to the parent and starts its own.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int | None = None):
+        super().__init__()
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes or int(os.environ.get("LOG_MAX_BYTES", LOG_MAX_BYTES))
+        self.segment: Path | None = None
+        self._file = None
+        self._index: dict[str, Any] = {}
+        self._day = -1
+        self._index_written = 0.0
+        self._compressing: list[threading.Thread] = []
+        self._pid = os.getpid()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._leave_parent_segment()
+            data = (self.format(record) + "\n").encode("utf-8")
+            day = int(record.created // 86400)
+            if (self._file is None or day != self._day
+                    or (self._index["bytes"] and self._index["bytes"] + len(data) > self.max_bytes)):
+                self._rotate(record.created)
+            self._append(record, data)
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            self._leave_parent_segment()
+            if self._file is not None:
+                self._finish(background=False)
+        finally:
+            self.release()
+        for thread in self._compressing:
+            thread.join()
+        super().close()
+
+    def _leave_parent_segment(self) -> None:
+        """In a forked child, drop the segment inherited from the parent without finishing it."""
+        if self._pid == os.getpid():
+            return
+        if self._file is not None:
+            self._file.close()  # Our copy of the descriptor; the parent keeps writing and compresses it
+            self._file = None
+        self._compressing = []
+        self._pid = os.getpid()
+
+    def _append(self, record: logging.LogRecord, data: bytes) -> None:
+        index = self._index
+        offset = index["bytes"]
+        hour_start = int(record.created // 3600) * 3600
+        new_hour = not index["hours"] or hour_start > index["hours"][-1]["start"]
+        if new_hour:
+            index["hours"].append({
+                "start": hour_start,
+                "hour": time.strftime("%Y-%m-%dT%H", time.gmtime(hour_start)),
+                "offset": offset, "length": 0, "counts": {},
+            })
+
+        self._file.write(data)
+        self._file.flush()
+
+        block = index["hours"][-1]
+        block["length"] += len(data)
+        block["counts"][record.levelname] = block["counts"].get(record.levelname, 0) + 1
+        index["bytes"] += len(data)
+        if record.levelname in INDEXED_LEVELS:
+            index["levels"].setdefault(record.levelname, []).append(offset)
+
+        if new_hour or (record.levelno >= logging.ERROR
+                        and time.monotonic() - self._index_written >= INDEX_FLUSH_SECONDS):
+            self._write_index()
+
+    def _write_index(self) -> None:
+        _write_json(_index_path(self.segment), self._index)
+        self._index_written = time.monotonic()
+
+    def _rotate(self, created: float) -> None:
+        if self._file is not None:
+            self._finish(background=True)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if int(created // 86400) != self._day:
+            prune_segments(self.directory, now=created)
+        stem = f"{time.strftime('%Y-%m-%dT%H%M%S', time.gmtime(created))}-{os.getpid()}"
+        name, n = stem, 0
+        while (self.directory / f"{name}.log").exists() or _index_path(self.directory / f"{name}.log").exists():
+            n += 1
+            name = f"{stem}-{n}"
+        self.segment = self.directory / f"{name}.log"
+        self._file = open(self.segment, "ab")
+        self._day = int(created // 86400)
+        self._index = {
+            "version": INDEX_VERSION, "segment": self.segment.name, "pid": os.getpid(),
+            "compressed": False, "bytes": 0, "hours": [], "levels": {},
+        }
+        self._write_index()
+
+    def _finish(self, background: bool) -> None:
+        """Close the current segment and compress it."""
+        self._file.close()
+        self._file = None
+        self._write_index()
+        segment = self.segment
+        if background:
+            self._compressing = [t for t in self._compressing if t.is_alive()]
+            thread = threading.Thread(target=compress_segment, args=(segment,), name="log_store.compress")
+            thread.start()
+            self._compressing.append(thread)
+        else:
+            compress_segment(segment)
+
+
+def compress_segment(segment: Path) -> Path:
+    """
+    Gzip a closed segment one member per indexed hour, record each member's
+    position in the index, then remove the plain file. Returns the .gz path.
+    """
+    index_path = _index_path(segment)
+    index = json.loads(index_path.read_text(encoding="utf-8"))
+    target = segment.with_name(segment.name + ".gz")
+    partial = target.with_name(target.name + ".partial")
+
+    with open(segment, "rb") as src, open(partial, "wb") as dst:
+        for block in index["hours"]:
+            block["gz_offset"] = dst.tell()
+            src.seek(block["offset"])
+            remaining = block["length"]
+            member = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip framing
+            while remaining:
+                chunk = src.read(min(remaining, _COPY_CHUNK))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                dst.write(member.compress(chunk))
+            dst.write(member.flush())
+            block["gz_length"] = dst.tell() - block["gz_offset"]
+
+    os.replace(partial, target)
+    index["compressed"] = True
+    index["segment"] = target.name
+    _write_json(index_path, index)
+    segment.unlink()
+    return target
+
+
+def prune_segments(directory: Path, retention_days: int | None = None, now: float | None = None) -> int:
+    """
+    Delete compressed segments, and their indexes, from UTC days more than
+    `retention_days` (LOG_RETENTION_DAYS) before `now`. Segments still open
+    or being compressed are left alone. Returns the number deleted.
+    """
+    if retention_days is None:
+        retention_days = int(os.environ.get("LOG_RETENTION_DAYS", LOG_RETENTION_DAYS))
+    cutoff = time.strftime("%Y-%m-%d", time.gmtime((time.time() if now is None else now) - retention_days * 86400))
+    removed = 0
+    for segment in Path(directory).glob("*.log.gz"):
+        day = _SEGMENT_DAY.match(segment.name)
+        if day is None or day.group(1) >= cutoff:
+            continue
+        _index_path(segment).unlink(missing_ok=True)
+        segment.unlink(missing_ok=True)  # Another process may be pruning too
+        removed += 1
+    return removed
+
+
+# ─── Reading ──────────────────────────────────────────────────────────────────
+
+def iter_records(directory: Path, since: datetime | None = None, until: datetime | None = None,
+                 levels: Iterable[str] | None = None) -> Iterator[dict[str, Any]]:
+    """
+    Log entries (parsed JSON lines) with `since` <= ts < `until` and, if
+    given, a level in `levels`, oldest segment first. Naive datetimes are
+    taken as UTC.
+    """
+    lo = _epoch(since) if since is not None else float("-inf")
+    hi = _epoch(until) if until is not None else float("inf")
+    wanted = {level.upper() for level in levels} if levels is not None else None
+
+    directory = Path(directory)
+    indexed = set()
+    for index_path in sorted(directory.glob("*.idx.json")):
+        name = index_path.name.removesuffix(".idx.json")
+        segments = (f"{name}.log", f"{name}.log.gz")
+        # A segment never crosses UTC midnight: its name says which day it holds
+        day = _SEGMENT_DAY.match(name)
+        if day:
+            day_start = _epoch(datetime.fromisoformat(day.group(1)))
+            if day_start >= hi or day_start + 86400 <= lo:
+                indexed.update(segments)
+                continue
+        index = _load_index(index_path)
+        if index is None:
+            continue  # Its segment, if any, is read in full below
+        indexed.update(segments)
+        yield from _filter(_read_indexed(directory, index, lo, hi, wanted), lo, hi, wanted)
+
+    for path in sorted(directory.iterdir()) if directory.exists() else ():
+        if path.name not in indexed and _LOG_NAME.match(path.name):
+            yield from _filter(_read_lines(path), lo, hi, wanted)
+
+
+def _load_index(index_path: Path) -> dict | None:
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+def _epoch(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _read_indexed(directory: Path, index: dict, lo: float, hi: float,
+                  wanted: set[str] | None) -> Iterator[bytes]:
+    """Raw lines of the index's segment that may fall in the window."""
+    path = directory / index["segment"]
+    compressed = index["compressed"]
+    if not path.exists():
+        if compressed:
+            return
+        # Compressed since the index was read
+        yield from _read_indexed(directory, json.loads(_index_path(path).read_text(encoding="utf-8")),
+                                 lo, hi, wanted)
+        return
+
+    blocks = [b for b in index["hours"] if b["start"] < hi and b["start"] + 3600 > lo]
+    by_offset = wanted is not None and wanted <= set(INDEXED_LEVELS)
+    if by_offset:
+        offsets = sorted(o for level in wanted for o in index["levels"].get(level, ()))
+
+    with open(path, "rb") as f:
+        for block in blocks:
+            if by_offset:
+                start, end = block["offset"], block["offset"] + block["length"]
+                hits = [o for o in offsets if start <= o < end]
+                if not hits:
+                    continue
+                if compressed:
+                    data = _read_block(f, block, compressed)
+                    for o in hits:
+                        yield data[o - start:data.index(b"\n", o - start) + 1]
+                else:
+                    for o in hits:
+                        f.seek(o)
+                        yield f.readline()
+            else:
+                yield from _read_block(f, block, compressed).splitlines()
+
+        if not compressed:
+            # Records written since the index was last saved
+            f.seek(index["bytes"])
+            for line in f:
+                if line.endswith(b"\n"):
+                    yield line
+
+
+def _read_block(f, block: dict, compressed: bool) -> bytes:
+    if compressed:
+        f.seek(block["gz_offset"])
+        return zlib.decompress(f.read(block["gz_length"]), 31)
+    f.seek(block["offset"])
+    return f.read(block["length"])
+
+
+def _read_lines(path: Path) -> Iterator[bytes]:
+    """Every line of an unindexed log file."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        yield from f
+
+
+def _filter(lines: Iterable[bytes], lo: float, hi: float, wanted: set[str] | None) -> Iterator[dict]:
+    for line in lines:
+        try:
+            entry = json.loads(line)
+            ts = datetime.fromisoformat(entry["ts"]).timestamp()
+        except (ValueError, KeyError, TypeError):
+            continue
+        if lo <= ts < hi and (wanted is None or entry.get("level") in wanted):
+            yield entry
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print log records from the log store as JSON lines")
+    parser.add_argument("--logs-dir", type=Path, default=Path(__file__).parent.parent.parent / "logs")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="UTC start, e.g. 2026-10-16T14:00")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="UTC end (exclusive)")
+    parser.add_argument("--level", action="append", help="Level to include (repeatable; default all)")
+    args = parser.parse_args()
+
+    for entry in iter_records(args.logs_dir, args.since, args.until, args.level):
+        sys.stdout.write(json.dumps(entry, default=str) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,55 +3,89 @@ Structured JSON logger for all execution scripts.
 
 Replaces ad-hoc print() and inconsistent logging.basicConfig() calls.
 Writes to both stdout (for terminal/operator) and logs/ directory (persistent).
+Log files rotate daily and by size and are gzipped with an index when closed;
+read them with execution.shared.log_store.iter_records().
 
 Usage:
     from execution.shared.logger import get_logger
     log = get_logger(__name__)
     log.info("Invoice created", extra={"invoice_id": "INV-001", "client": "nexairi"})
     log.error("QBO auth failed", extra={"error": str(e)})
+
+Hot loops can log in queued mode (LOG_QUEUE=1, or get_logger(..., queued=True)):
+the call only puts the record on a bounded queue and one background thread
+formats and writes it. scripts/bench_logger.py measures the per-call cost.
 """
 
+import atexit
 import json
 import logging
 import os
+import queue
 import sys
-from datetime import datetime, timezone
+import threading
+import time
+from logging.handlers import QueueHandler
 from pathlib import Path
 from typing import Any
 
+from execution.shared.log_store import LogStoreHandler
+
 # ─── Resolve logs/ directory relative to project root ────────────────────────
 _HERE = Path(__file__).parent.parent.parent  # project root
 LOGS_DIR = _HERE / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
 
+LOG_QUEUE_SIZE = 10_000          # Records buffered in queued mode (LOG_QUEUE_SIZE env var)
+LOG_QUEUE_POLICIES = ("block", "drop")
+LOG_FLUSH_INTERVAL = 0.05        # Seconds between the queued-mode listener's writes
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RECORD_FIELDS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
+_encode = json.JSONEncoder(default=str, check_circular=False).encode
+_queue_lock = threading.RLock()  # Guards the shared handlers below
+
+
+def _extras(record: logging.LogRecord) -> dict[str, Any]:
+    """Fields passed via extra={...}, in the order they were set."""
+    if not record.__dict__.keys() - _RECORD_FIELDS:
+        return {}
+    return {k: v for k, v in record.__dict__.items() if k not in _RECORD_FIELDS}
+
 
 class _JSONFormatter(logging.Formatter):
     """Emit every log record as a single-line JSON object."""
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._second: tuple[int, str] = (-1, "")
+
+    def _timestamp(self, created: float) -> str:
+        """ISO-8601 UTC time the record was created; the part to the second is reused."""
+        second = int(created)
+        cached = self._second
+        if cached[0] != second:
+            cached = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+            self._second = cached
+        return f"{cached[1]}.{int((created - second) * 1_000_000):06d}+00:00"
+
     def format(self, record: logging.LogRecord) -> str:
         payload: dict[str, Any] = {
-            "ts": datetime.now(timezone.utc).isoformat(),
+            "ts": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "msg": record.getMessage(),
         }
 
         # Include any extra fields set via log.info("msg", extra={...})
-        for key, value in record.__dict__.items():
-            if key not in (
-                "name", "msg", "args", "created", "filename", "funcName",
-                "levelname", "levelno", "lineno", "module", "msecs",
-                "pathname", "process", "processName", "relativeCreated",
-                "stack_info", "thread", "threadName", "exc_info", "exc_text",
-                "message", "taskName",
-            ):
-                payload[key] = value
+        payload.update(_extras(record))
 
         # Attach exception info if present
         if record.exc_info:
             payload["exc"] = self.formatException(record.exc_info)
 
-        return json.dumps(payload, default=str)
+        return _encode(payload)
 
 
 class _ConsoleFormatter(logging.Formatter):
@@ -66,24 +100,22 @@ class _ConsoleFormatter(logging.Formatter):
     }
     RESET = "\033[0m"
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._second: tuple[int, str] = (-1, "")
+
     def format(self, record: logging.LogRecord) -> str:
         color = self.LEVEL_COLORS.get(record.levelname, self.RESET)
-        ts = datetime.now().strftime("%H:%M:%S")
-        prefix = f"{color}[{ts} {record.levelname}]{self.RESET} {record.name}"
-        msg = record.getMessage()
-        base = f"{prefix}: {msg}"
+        second = int(record.created)
+        if self._second[0] != second:
+            self._second = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+        prefix = f"{color}[{self._second[1]} {record.levelname}]{self.RESET} {record.name}"
+        base = f"{prefix}: {record.getMessage()}"
 
         # Show extra context keys inline
-        skip = {
-            "name", "msg", "args", "created", "filename", "funcName",
-            "levelname", "levelno", "lineno", "module", "msecs", "message",
-            "pathname", "process", "processName", "relativeCreated",
-            "stack_info", "thread", "threadName", "exc_info", "exc_text",
-            "taskName",
-        }
-        extras = {k: v for k, v in record.__dict__.items() if k not in skip}
+        extras = _extras(record)
         if extras:
-            base += f"  {json.dumps(extras, default=str)}"
+            base += f"  {_encode(extras)}"
 
         if record.exc_info:
             base += "\n" + self.formatException(record.exc_info)
@@ -91,17 +123,187 @@ class _ConsoleFormatter(logging.Formatter):
         return base
 
 
-def get_logger(name: str, level: str | None = None) -> logging.Logger:
+def _console_handler(level: int = logging.NOTSET) -> logging.Handler:
+    # stderr so it doesn't pollute JSON stdout
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setLevel(level)
+    handler.setFormatter(_ConsoleFormatter())
+    return handler
+
+
+_store_handlers: dict[Path, LogStoreHandler] = {}
+
+
+def _store_handler() -> logging.Handler:
+    """The process's log store handler for LOGS_DIR, shared by every logger."""
+    with _queue_lock:
+        handler = _store_handlers.get(LOGS_DIR)
+        if handler is None:
+            handler = _store_handlers[LOGS_DIR] = LogStoreHandler(LOGS_DIR)
+            handler.setFormatter(_JSONFormatter())
+    return handler
+
+
+# ─── Queued mode ──────────────────────────────────────────────────────────────
+
+class _BoundedQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread, which formats and writes them.
+    The queue is a SimpleQueue (no handler lock, no wake-up per record)
+    bounded at `capacity` records, give or take one per thread logging at
+    once. When it is full, "block" waits for room and "drop" discards the
+    record; the number dropped is logged with the next record that fits.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, capacity: int, policy: str):
+        super().__init__(log_queue)
+        self.capacity = capacity
+        self.policy = policy
+        self.dropped = 0        # Since the last notice
+        self.dropped_total = 0
+        self.listener: _Listener | None = None
+        self.stopped: _Listener | None = None  # Set at shutdown: write inline from then on
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Handler.handle without the handler lock: the queue is thread-safe
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return rv
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The record goes to a thread, not a process, so it is passed as is;
+        # only the message is built now, in case the caller mutates its args.
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.stopped is not None:
+            self.stopped.handle(record)
+            return
+        if self.queue.qsize() >= self.capacity:
+            self.listener.flush_soon()
+            if self.policy == "drop":
+                self.dropped += 1
+                self.dropped_total += 1
+                return
+            while self.queue.qsize() >= self.capacity and self.stopped is None:
+                time.sleep(0.001)
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            self.queue.put(logging.makeLogRecord({
+                "name": "shared.logger", "levelno": logging.WARNING, "levelname": "WARNING",
+                "msg": f"Log queue full: dropped {dropped} record(s)", "dropped": dropped,
+            }))
+        self.queue.put(record)
+
+
+class _Listener:
+    """
+    The background thread of queued mode: every LOG_FLUSH_INTERVAL it
+    drains the queue into the console and file handlers. Polling rather
+    than blocking on the queue means a log call only wakes it when the
+    queue is full.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, *handlers: logging.Handler):
+        self.queue = log_queue
+        self.handlers = handlers
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="shared.logger", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._drain()
+
+    def handle(self, record: logging.LogRecord) -> None:
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def flush_soon(self) -> None:
+        """Drain now rather than at the next interval (the queue is full)."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(LOG_FLUSH_INTERVAL)
+            self._wake.clear()
+            self._drain()
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            self.handle(record)  # Handlers report their own write errors (Handler.handleError)
+
+
+_queue_handler: _BoundedQueueHandler | None = None
+
+
+def _queued_handler() -> _BoundedQueueHandler:
+    """The process-wide queue handler, starting its listener on first use."""
+    global _queue_handler
+    with _queue_lock:
+        if _queue_handler is None:
+            policy = os.environ.get("LOG_QUEUE_POLICY", "block").lower()
+            if policy not in LOG_QUEUE_POLICIES:
+                raise ValueError(f"LOG_QUEUE_POLICY must be one of {LOG_QUEUE_POLICIES}, not {policy!r}")
+            capacity = int(os.environ.get("LOG_QUEUE_SIZE", LOG_QUEUE_SIZE))
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            handler = _BoundedQueueHandler(log_queue, capacity, policy)
+            handler.listener = _Listener(log_queue, _console_handler(), _store_handler())
+            handler.listener.start()
+            _queue_handler = handler
+    return _queue_handler
+
+
+def stop_queued_logging() -> None:
+    """
+    Write out every queued record and stop the listener thread. Runs at
+    exit; call it before os._exit() or to flush logs mid-run. Loggers
+    already set up keep working, writing inline.
+    """
+    global _queue_handler
+    with _queue_lock:
+        handler, _queue_handler = _queue_handler, None
+    if handler is not None:
+        handler.stopped = handler.listener  # New records are written inline while the rest drain
+        handler.listener.stop()
+
+
+atexit.register(stop_queued_logging)
+
+
+def get_logger(name: str, level: str | None = None, queued: bool | None = None) -> logging.Logger:
     """
-    Return a configured logger that writes JSON to logs/<date>.log
-    and pretty output to stderr.
+    Return a configured logger that writes JSON to the log store in logs/
+    (see log_store.py) and pretty output to stderr.
 
     Args:
         name: Typically __name__ of the calling module.
         level: Override log level (default: LOG_LEVEL env var or INFO).
+        queued: Format and write on a background thread, so a log call only
+            enqueues the record (default: LOG_QUEUE env var, else off). The
+            queue holds LOG_QUEUE_SIZE records; LOG_QUEUE_POLICY=block (default)
+            waits when it is full, drop discards and counts.
     """
     log_level_str = level or os.environ.get("LOG_LEVEL", "INFO").upper()
     log_level = getattr(logging, log_level_str, logging.INFO)
+    if queued is None:
+        queued = os.environ.get("LOG_QUEUE", "").strip().lower() in ("1", "true", "yes", "on")
 
     logger = logging.getLogger(name)
 
@@ -112,19 +314,12 @@ def get_logger(name: str, level: str | None = None) -> logging.Logger:
     logger.setLevel(log_level)
     logger.propagate = False
 
-    # ── Console handler (stderr so it doesn't pollute JSON stdout) ──────────
-    console_handler = logging.StreamHandler(sys.stderr)
-    console_handler.setLevel(log_level)
-    console_handler.setFormatter(_ConsoleFormatter())
-    logger.addHandler(console_handler)
-
-    # ── File handler — rotating daily ───────────────────────────────────────
-    today = datetime.now().strftime("%Y-%m-%d")
-    log_file = LOGS_DIR / f"{today}.log"
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
-    file_handler.setLevel(log_level)
-    file_handler.setFormatter(_JSONFormatter())
-    logger.addHandler(file_handler)
+    if queued:
+        # Level is checked on the logger, before the record is queued
+        logger.addHandler(_queued_handler())
+    else:
+        logger.addHandler(_console_handler(log_level))
+        logger.addHandler(_store_handler())
 
     return logger
 
@@ -11,18 +11,42 @@ Usage:
     # Direct use for custom alerts:
     send_info("Invoice batch completed", details={"count": 12, "client": "nexairi"})
     send_failure_alert(script="create_qbo_invoice", error="Auth expired", directive="directives/sales-to-qbo.md")
+
+Alerts are queued and sent by one background thread over pooled HTTP
+sessions, so a failing job never waits on Telegram or Slack. Repeats of a
+failure (same script and error type) within COALESCE_SECONDS are counted
+rather than sent: the first goes out at once, the rest as one summary
+("37× APIError in `create_qbo_invoice`") when the window closes. Each
+channel is rate-limited (CHANNEL_RATES). Queued alerts are flushed at exit;
+call flush_notifications() before os._exit() or to wait for delivery.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 
 from execution.shared.logger import get_logger
 
 _log = get_logger("shared.notify")
 
+NOTIFY_QUEUE_SIZE = 500      # Alerts waiting for the dispatcher (NOTIFY_QUEUE_SIZE env var)
+COALESCE_SECONDS = 300.0     # Repeats within this window are sent as one summary (NOTIFY_COALESCE_SECONDS)
+FLUSH_TIMEOUT = 15.0         # Longest the exit hook waits for queued alerts
+CHANNEL_RATES = {            # Messages per second, burst — under Telegram's and Slack's 1/s guidance
+    "telegram": (1.0, 5),
+    "slack": (1.0, 5),
+}
+
 
 def _get_settings():
     """Late import to avoid circular dependency at module load."""
@@ -30,17 +54,32 @@ def _get_settings():
     return settings
 
 
+def _channels(cfg) -> tuple[tuple[str, tuple], ...]:
+    """(channel, sender args) for every configured channel."""
+    channels = []
+    if cfg.telegram_bot_token and cfg.telegram_chat_id:
+        channels.append(("telegram", (cfg.telegram_bot_token, cfg.telegram_chat_id)))
+    if cfg.slack_webhook_url:
+        channels.append(("slack", (cfg.slack_webhook_url,)))
+    return tuple(channels)
+
+
 def send_failure_alert(
     *,
     script: str,
     error: str,
     directive: str = "",
     context: dict[str, Any] | None = None,
+    error_type: str = "",
 ) -> bool:
     """
-    Send a failure notification to all configured channels.
+    Queue a failure notification for all configured channels.
+
+    error_type (e.g. the exception class name) groups repeats of the same
+    failure; without it, the error text with its numbers masked is used.
 
-    Returns True if at least one channel succeeded.
+    Returns True if the alert was queued (or counted into a summary) for
+    at least one channel. Delivery happens on the dispatcher thread.
     """
     cfg = _get_settings()
 
@@ -48,7 +87,29 @@ def send_failure_alert(
         _log.debug("Notifications disabled — skipping alert", extra={"script": script})
         return False
 
+    channels = _channels(cfg)
+    if not channels:
+        _log.warning(
+            "No notification channel available — check TELEGRAM_BOT_TOKEN or SLACK_WEBHOOK_URL",
+            extra={"script": script},
+        )
+        return False
+
     ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    fingerprint = (script, error_type or re.sub(r"\d+", "#", error)[:200], directive)
+    with _lock:
+        burst = _bursts.get(fingerprint)
+        if burst is not None and time.monotonic() - burst.started < _coalesce_seconds():
+            burst.repeats += 1
+            burst.last_error, burst.last_ts = error, ts
+            return True
+        # A window that ended before the dispatcher got to it is summarised
+        # here, so its repeats are not lost when the new burst replaces it
+        closed = _summary(burst) if burst is not None and burst.repeats else None
+        _bursts[fingerprint] = _Burst(script, error_type, directive, channels, ts)
+    if closed is not None:
+        _dispatcher().submit(closed)
+
     ctx_str = json.dumps(context or {}, default=str, indent=2) if context else ""
 
     message = (
@@ -62,25 +123,7 @@ def send_failure_alert(
     if ctx_str:
         message += f"\n*Context:*\n```\n{ctx_str}\n```"
 
-    sent = False
-
-    # ── Telegram ─────────────────────────────────────────────────────────────
-    if cfg.telegram_bot_token and cfg.telegram_chat_id:
-        if _send_telegram(cfg.telegram_bot_token, cfg.telegram_chat_id, message):
-            sent = True
-
-    # ── Slack ─────────────────────────────────────────────────────────────────
-    if cfg.slack_webhook_url:
-        if _send_slack(cfg.slack_webhook_url, message):
-            sent = True
-
-    if not sent:
-        _log.warning(
-            "No notification channel available — check TELEGRAM_BOT_TOKEN or SLACK_WEBHOOK_URL",
-            extra={"script": script},
-        )
-
-    return sent
+    return _dispatcher().submit(_Message(message, channels))
 
 
 def send_info(
@@ -89,7 +132,7 @@ def send_info(
     details: dict[str, Any] | None = None,
 ) -> None:
     """
-    Send a non-failure informational alert (e.g. batch completed, invoice sent).
+    Queue a non-failure informational alert (e.g. batch completed, invoice sent).
     Only dispatched if NOTIFICATIONS_ENABLED and notifications_enabled.
     """
     cfg = _get_settings()
@@ -101,20 +144,228 @@ def send_info(
     if details:
         text += f"\n```\n{json.dumps(details, default=str, indent=2)}\n```"
 
-    if cfg.telegram_bot_token and cfg.telegram_chat_id:
-        _send_telegram(cfg.telegram_bot_token, cfg.telegram_chat_id, text)
+    channels = _channels(cfg)
+    if channels:
+        _dispatcher().submit(_Message(text, channels))
+
+
+def flush_notifications(timeout: float = FLUSH_TIMEOUT) -> bool:
+    """
+    Send every queued alert, and a summary for every failure repeated since
+    its first alert, waiting at most `timeout` seconds. Runs at exit.
+    Returns False if alerts were still unsent at the timeout.
+    """
+    with _lock:
+        dispatcher = _dispatcher_instance
+    return dispatcher.flush(timeout) if dispatcher is not None else True
+
+
+atexit.register(flush_notifications)
+
+
+# ─── Coalescing ───────────────────────────────────────────────────────────────
+
+@dataclass
+class _Message:
+    text: str
+    channels: tuple[tuple[str, tuple], ...]
 
-    if cfg.slack_webhook_url:
-        _send_slack(cfg.slack_webhook_url, text)
+
+@dataclass
+class _Burst:
+    """A failure's first alert, sent, and the repeats since then, not yet sent."""
+    script: str
+    error_type: str
+    directive: str
+    channels: tuple[tuple[str, tuple], ...]
+    first_ts: str
+    started: float = field(default_factory=time.monotonic)
+    repeats: int = 0
+    last_error: str = ""
+    last_ts: str = ""
+
+
+_lock = threading.Lock()
+_bursts: dict[tuple[str, str, str], _Burst] = {}
+
+
+def _coalesce_seconds() -> float:
+    return float(os.environ.get("NOTIFY_COALESCE_SECONDS", COALESCE_SECONDS))
+
+
+def _due_summaries(force: bool = False) -> tuple[list[_Message], float | None]:
+    """
+    Close the coalescing windows that have ended (all of them if `force`),
+    returning a summary for each with repeats, and the seconds until the
+    next window ends.
+    """
+    now = time.monotonic()
+    window = _coalesce_seconds()
+    summaries, next_due = [], None
+    with _lock:
+        for fingerprint, burst in list(_bursts.items()):
+            remaining = burst.started + window - now
+            if not force and remaining > 0:
+                if burst.repeats:
+                    next_due = remaining if next_due is None else min(next_due, remaining)
+                continue
+            del _bursts[fingerprint]
+            if burst.repeats:
+                summaries.append(_summary(burst))
+    return summaries, next_due
+
+
+def _summary(burst: _Burst) -> _Message:
+    label = burst.error_type or "failure"
+    text = (
+        f"🔴 *5 Cypress — {burst.repeats + 1}× {label} in `{burst.script}`*\n"
+        f"*First:* {burst.first_ts} (alerted)\n"
+        f"*Last:* {burst.last_ts}\n"
+        f"*Last error:* {burst.last_error}"
+    )
+    if burst.directive:
+        text += f"\n*Directive:* `{burst.directive}`"
+    return _Message(text, burst.channels)
+
+
+# ─── Dispatcher ───────────────────────────────────────────────────────────────
+
+class _RateLimit:
+    """Token bucket: `rate` messages a second, up to `burst` at once."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+
+    def wait(self) -> float:
+        """Seconds until a message may be sent (0: now)."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class _Dispatcher:
+    """
+    The background thread that sends alerts: it moves queued messages into
+    a backlog per channel, adds the summaries of closed coalescing windows,
+    and sends as fast as each channel's rate limit allows, one pooled
+    HTTP session per channel.
+    """
+
+    def __init__(self, capacity: int):
+        self.queue: queue.Queue = queue.Queue(maxsize=capacity)
+        self.dropped = 0
+        self.backlog: dict[str, deque] = {name: deque() for name in CHANNEL_RATES}
+        self.limits = {name: _RateLimit(*rate) for name, rate in CHANNEL_RATES.items()}
+        self.sessions: dict[str, Any] = {}
+        self._flushing = threading.Event()
+        self._idle = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="shared.notify", daemon=True)
+        self._thread.start()
+
+    def submit(self, message: _Message) -> bool:
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+            _log.error("Notification queue full — alert dropped",
+                       extra={"dropped": self.dropped, "text": message.text[:200]})
+            return False
+        self._idle.clear()
+        return True
+
+    def flush(self, timeout: float) -> bool:
+        self._idle.clear()
+        self._flushing.set()
+        self.queue.put(None)  # Wake the thread
+        done = self._idle.wait(timeout)
+        self._flushing.clear()
+        if not done:
+            unsent = self.queue.qsize() + sum(len(b) for b in self.backlog.values())
+            _log.error("Notifications still unsent after flush timeout",
+                       extra={"unsent": unsent, "timeout_s": timeout})
+        return done
+
+    def _run(self) -> None:
+        wait: float | None = None
+        while True:
+            try:
+                message = self.queue.get(timeout=wait)
+                while True:
+                    if message is not None:
+                        for name, target in message.channels:
+                            self.backlog[name].append((target, message.text))
+                    message = self.queue.get_nowait()
+            except queue.Empty:
+                pass
+
+            flushing = self._flushing.is_set()
+            summaries, next_due = _due_summaries(force=flushing)
+            for summary in summaries:
+                for name, target in summary.channels:
+                    self.backlog[name].append((target, summary.text))
+
+            wait = self._send_ready()
+            if wait is None:
+                if flushing:
+                    self._idle.set()
+                wait = next_due
+            elif next_due is not None:
+                wait = min(wait, next_due)
+
+    def _send_ready(self) -> float | None:
+        """Send what the rate limits allow; seconds until more can go, or None if nothing is left."""
+        wait = None
+        for name, backlog in self.backlog.items():
+            limit = self.limits[name]
+            while backlog:
+                delay = limit.wait()
+                if delay:
+                    wait = delay if wait is None else min(wait, delay)
+                    break
+                limit.take()
+                target, text = backlog.popleft()
+                try:
+                    _SENDERS[name](*target, text, session=self._session(name))
+                except Exception as exc:  # Senders log their own failures; keep the thread alive
+                    _log.warning("Notification sender raised", extra={"channel": name, "error": str(exc)})
+        return wait
+
+    def _session(self, name: str):
+        if name not in self.sessions:
+            try:
+                import requests
+                self.sessions[name] = requests.Session()
+            except ImportError:
+                self.sessions[name] = None
+        return self.sessions[name]
+
+
+_dispatcher_instance: _Dispatcher | None = None
+
+
+def _dispatcher() -> _Dispatcher:
+    """The process-wide dispatcher, starting its thread on first use."""
+    global _dispatcher_instance
+    with _lock:
+        if _dispatcher_instance is None:
+            _dispatcher_instance = _Dispatcher(int(os.environ.get("NOTIFY_QUEUE_SIZE", NOTIFY_QUEUE_SIZE)))
+    return _dispatcher_instance
 
 
 # ─── Channel implementations ─────────────────────────────────────────────────
 
-def _send_telegram(token: str, chat_id: str, message: str) -> bool:
-    """POST message to Telegram Bot API."""
+def _send_telegram(token: str, chat_id: str, message: str, session=None) -> bool:
+    """POST message to Telegram Bot API (through `session` if given)."""
     try:
         import requests
-        resp = requests.post(
+        resp = (session or requests).post(
             f"https://api.telegram.org/bot{token}/sendMessage",
             json={"chat_id": chat_id, "text": message, "parse_mode": "Markdown"},
             timeout=10,
@@ -130,13 +381,13 @@ def _send_telegram(token: str, chat_id: str, message: str) -> bool:
         return False
 
 
-def _send_slack(webhook_url: str, message: str) -> bool:
-    """POST message to Slack Incoming Webhook."""
+def _send_slack(webhook_url: str, message: str, session=None) -> bool:
+    """POST message to Slack Incoming Webhook (through `session` if given)."""
     try:
         import requests
         # Convert Markdown bold to plain for Slack (which uses *text* natively)
         slack_text = message.replace("*", "")
-        resp = requests.post(
+        resp = (session or requests).post(
             webhook_url,
             json={"text": slack_text},
             timeout=10,
@@ -150,3 +401,6 @@ def _send_slack(webhook_url: str, message: str) -> bool:
     except Exception as exc:
         _log.warning("Slack dispatch exception", extra={"error": str(exc)})
         return False
+
+
+_SENDERS: dict[str, Callable[..., bool]] = {"telegram": _send_telegram, "slack": _send_slack}
@@ -20,6 +20,15 @@ Usage:
     @retryable(max_attempts=4)
     def get_serp_results(keyword: str) -> dict:
         ...
+
+    # Shared across every caller of a provider: rate limit + circuit breaker
+    result = with_retry(fetch_backlinks, args=(domain,), config=DATA_RETRY,
+                        provider="dataforseo")
+
+With provider=..., each attempt first takes a token from the provider's
+shared throttle (see throttle.py) and fails fast with CircuitOpenError while
+the provider is known to be down. Rate limits are waited out by the
+throttle, for all callers at once, instead of by each call's own backoff.
 """
 
 from __future__ import annotations
@@ -29,8 +38,9 @@ import time
 from dataclasses import dataclass
 from typing import Any, Callable, Sequence, Type
 
-from execution.shared.errors import RateLimitError, APIError
+from execution.shared.errors import CircuitOpenError, RateLimitError, APIError
 from execution.shared.logger import get_logger
+from execution.shared.throttle import throttle_for
 
 _log = get_logger("shared.retry")
 
@@ -73,6 +83,7 @@ def with_retry(
     kwargs: dict | None = None,
     config: RetryConfig = _DEFAULT,
     label: str = "",
+    provider: str = "",
 ) -> Any:
     """
     Call fn(*args, **kwargs) with retry logic.
@@ -83,27 +94,51 @@ def with_retry(
         kwargs: Keyword arguments to fn.
         config: RetryConfig controlling backoff behaviour.
         label: Human-readable label for log messages.
+        provider: Throttle attempts through this provider's shared rate
+            limiter and circuit breaker. Without it, the provider of the
+            first APIError raised is used for the remaining attempts.
 
     Returns:
         The return value of fn on success.
 
     Raises:
-        The last exception after all retries are exhausted.
+        The last exception after all retries are exhausted, or
+        CircuitOpenError at once while the provider's circuit is open.
     """
     kwargs = kwargs or {}
     label = label or getattr(fn, "__name__", str(fn))
     delay = config.base_delay
     last_exc: Exception | None = None
+    throttle = throttle_for(provider) if provider else None
 
     for attempt in range(1, config.max_attempts + 1):
+        if throttle is not None:
+            try:
+                throttle.acquire()
+            except CircuitOpenError as exc:
+                _log.error("Provider circuit open — not calling",
+                           extra={"fn": label, "provider": exc.provider,
+                                  "retry_after": exc.ctx["retry_after"]})
+                raise
+
         try:
             result = fn(*args, **kwargs)
+            if throttle is not None:
+                throttle.record_success()
             if attempt > 1:
                 _log.info(f"Succeeded on attempt {attempt}", extra={"fn": label})
             return result
 
+        except CircuitOpenError:
+            raise  # From a nested with_retry: already logged, never retried
+
         except config.retriable_exceptions as exc:
             last_exc = exc
+            if throttle is None and isinstance(exc, APIError) and exc.provider:
+                throttle = throttle_for(exc.provider)
+            if throttle is not None:
+                throttle.record_failure(exc)
+
             if attempt == config.max_attempts:
                 _log.error(
                     f"All {config.max_attempts} attempts failed",
@@ -111,15 +146,19 @@ def with_retry(
                 )
                 raise
 
-            # Honour Retry-After if provided by a RateLimitError
-            if isinstance(exc, RateLimitError) and exc.ctx.get("retry_after"):
-                delay = min(exc.ctx["retry_after"], config.max_delay)
+            if isinstance(exc, RateLimitError) and throttle is not None:
+                # The throttle holds back every caller until Retry-After has passed
+                delay = 0.0
             else:
-                delay = min(delay * config.exponential_base, config.max_delay)
+                # Honour Retry-After if provided by a RateLimitError
+                if isinstance(exc, RateLimitError) and exc.ctx.get("retry_after"):
+                    delay = min(exc.ctx["retry_after"], config.max_delay)
+                else:
+                    delay = min(delay * config.exponential_base, config.max_delay)
 
-            if config.jitter:
-                import random
-                delay += random.uniform(0, 1)
+                if config.jitter:
+                    import random
+                    delay += random.uniform(0, 1)
 
             _log.warning(
                 f"Attempt {attempt}/{config.max_attempts} failed — retrying in {delay:.1f}s",
@@ -129,6 +168,8 @@ def with_retry(
 
         except Exception as exc:
             # Non-retriable — don't retry, don't log a retry message
+            if throttle is not None:
+                throttle.release()
             _log.error(
                 f"Non-retriable error on attempt {attempt}",
                 extra={"fn": label, "error": str(exc)},
@@ -145,6 +186,7 @@ def retryable(
     base_delay: float = 1.0,
     max_delay: float = 30.0,
     retriable_exceptions: Sequence[Type[Exception]] = (APIError, ConnectionError, TimeoutError),
+    provider: str = "",
 ) -> Callable:
     """
     Decorator form of with_retry.
@@ -165,7 +207,7 @@ def retryable(
         @functools.wraps(fn)
         def wrapper(*args, **kwargs) -> Any:
             return with_retry(fn, args=args, kwargs=kwargs, config=config,
-                              label=fn.__name__)
+                              label=fn.__name__, provider=provider)
         return wrapper
 
     return decorator
@@ -0,0 +1,271 @@
+"""
+Provider-wide rate limiting and circuit breaking for with_retry.
+
+with_retry(..., provider="dataforseo") makes every call to a provider go
+through one ProviderThrottle, shared by all threads of the process (and by
+all processes, with THROTTLE_STATE set):
+
+  - Rate limit: a token bucket. A RateLimitError halves the rate (once per
+    pause, however many callers hit it) and pauses the bucket for its
+    retry_after; while calls succeed, the rate climbs back by a twentieth
+    of the ceiling (PROVIDER_RATES) a second. Callers wait for a token
+    instead of backing off on their own, so the total rate settles just
+    under the provider's real limit.
+  - Circuit breaker: FAILURE_THRESHOLD failures in a row open the circuit,
+    and calls fail at once with CircuitOpenError for OPEN_SECONDS. Then one
+    trial call is let through (half-open): success closes the circuit,
+    failure opens it again.
+
+State is in memory by default. Set THROTTLE_STATE to a file path to keep it
+in a small SQLite file instead, so scripts running at once share it.
+
+Usage:
+    from execution.shared.throttle import throttle_for
+
+    throttle = throttle_for("quickbooks")
+    throttle.acquire()                 # Waits for a token, or raises CircuitOpenError
+    try:
+        result = call_qbo(...)
+    except APIError as exc:
+        throttle.record_failure(exc)
+        raise
+    throttle.record_success()
+
+    python -m execution.shared.throttle      # Print the shared state (THROTTLE_STATE)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+from execution.shared.errors import CircuitOpenError, RateLimitError
+from execution.shared.logger import get_logger
+
+_log = get_logger("shared.throttle")
+
+# Requests per second each provider allows (the adaptive rate's ceiling)
+PROVIDER_RATES: dict[str, float] = {
+    "quickbooks": 8.0,      # 500 requests / minute per company
+    "dataforseo": 30.0,     # 2000 requests / minute
+}
+DEFAULT_RATE = 10.0         # Ceiling for providers not listed above
+DEFAULT_BURST = 5           # Tokens a bucket can hold
+MIN_RATE = 0.05             # The rate never drops below one request per 20s
+RATE_DECREASE = 0.5         # Rate multiplier on a RateLimitError
+RATE_INCREASE = 0.05        # Fraction of the ceiling added back per second of successes
+FAILURE_THRESHOLD = 5       # Failures in a row that open the circuit
+OPEN_SECONDS = 30.0         # Time the circuit stays open before a trial call
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+@dataclass
+class _State:
+    """One provider's shared state. Times are epoch seconds, so processes agree."""
+    rate: float
+    tokens: float
+    stamp: float            # Tokens were last counted at this time (later while paused)
+    circuit: str = CLOSED
+    failures: int = 0
+    opened_at: float = 0.0  # OPEN: when; HALF_OPEN: when the trial call started
+    grown_at: float = 0.0   # The rate was last raised (or cut) at this time
+
+
+class ProviderThrottle:
+    """Token bucket and circuit breaker for one provider."""
+
+    def __init__(
+        self,
+        provider: str,
+        *,
+        rate: float | None = None,
+        burst: int = DEFAULT_BURST,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        open_seconds: float = OPEN_SECONDS,
+        state_path: Path | str | None = None,
+    ) -> None:
+        self.provider = provider
+        self.ceiling = rate or PROVIDER_RATES.get(provider, DEFAULT_RATE)
+        self.burst = burst
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._store = _SqliteStore(Path(state_path)) if state_path else _MemoryStore()
+
+    # ── Before a call ───────────────────────────────────────────────────────
+
+    def acquire(self) -> None:
+        """
+        Take a token, sleeping until one is due. Raises CircuitOpenError if
+        the provider is known to be down, without waiting.
+        """
+        with self._state() as s:
+            now = time.time()
+            if s.circuit == OPEN and now - s.opened_at >= self.open_seconds:
+                s.circuit, s.opened_at = HALF_OPEN, now
+                _log.info("Circuit half-open — trying one call", extra={"provider": self.provider})
+            elif s.circuit != CLOSED:
+                # OPEN, or HALF_OPEN with the trial call still out (a lost trial is retried after open_seconds)
+                retry_after = s.opened_at + self.open_seconds - now
+                if retry_after > 0:
+                    raise CircuitOpenError(
+                        f"{self.provider} circuit is open — failing fast",
+                        provider=self.provider, retry_after=round(retry_after, 1),
+                    )
+                s.opened_at = now
+
+            if now > s.stamp:
+                s.tokens = min(self.burst, s.tokens + (now - s.stamp) * s.rate)
+                s.stamp = now
+            s.tokens -= 1  # Reserve a token now; it may not be due yet
+            wait = (s.stamp - now) + max(0.0, -s.tokens) / s.rate
+
+        if wait > 0:
+            time.sleep(wait)
+
+    # ── After a call ────────────────────────────────────────────────────────
+
+    def record_success(self) -> None:
+        """The provider answered: close the circuit and raise the rate towards the ceiling."""
+        with self._state() as s:
+            if s.circuit != CLOSED:
+                _log.info("Circuit closed", extra={"provider": self.provider})
+            s.circuit, s.failures = CLOSED, 0
+            # Grow with time, not per call, so busy callers don't overshoot faster
+            now = time.time()
+            if now > s.grown_at:
+                s.rate = min(self.ceiling, s.rate + self.ceiling * RATE_INCREASE * (now - s.grown_at))
+                s.grown_at = now
+
+    def record_failure(self, exc: Exception) -> None:
+        """
+        A RateLimitError slows every caller down; any other failure counts
+        towards opening the circuit.
+        """
+        with self._state() as s:
+            now = time.time()
+            if isinstance(exc, RateLimitError):
+                # 429s answered together all belong to one overshoot: cut the
+                # rate once per pause, not once per caller
+                pausing = s.stamp > now
+                if not pausing:
+                    s.rate = max(MIN_RATE, s.rate * RATE_DECREASE)
+                pause = exc.ctx.get("retry_after") or 1 / s.rate
+                s.stamp = max(s.stamp, now + pause)
+                s.grown_at = s.stamp
+                s.tokens = min(s.tokens, 0.0)
+                if s.circuit == HALF_OPEN:
+                    s.circuit = CLOSED  # Throttled, but up
+                if not pausing:
+                    _log.warning("Rate limited — slowing down",
+                                 extra={"provider": self.provider, "rate": round(s.rate, 3), "pause_s": pause})
+                return
+
+            s.failures += 1
+            if s.circuit == HALF_OPEN or (s.circuit == CLOSED and s.failures >= self.failure_threshold):
+                s.circuit, s.opened_at = OPEN, now
+                _log.warning("Circuit opened — failing fast",
+                             extra={"provider": self.provider, "failures": s.failures,
+                                    "open_s": self.open_seconds, "error": str(exc)})
+
+    def release(self) -> None:
+        """The call failed for a reason that says nothing about the provider: free a half-open trial."""
+        with self._state() as s:
+            if s.circuit == HALF_OPEN:
+                s.circuit, s.opened_at = OPEN, time.time() - self.open_seconds
+
+    def snapshot(self) -> dict:
+        with self._state() as s:
+            return asdict(s)
+
+    @contextmanager
+    def _state(self) -> Iterator[_State]:
+        with self._store.transaction(self.provider, self._fresh) as s:
+            yield s
+
+    def _fresh(self) -> _State:
+        now = time.time()
+        return _State(rate=self.ceiling, tokens=float(self.burst), stamp=now, grown_at=now)
+
+
+# ─── State stores ─────────────────────────────────────────────────────────────
+
+class _MemoryStore:
+    """State for this process only."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state: _State | None = None
+
+    @contextmanager
+    def transaction(self, provider: str, fresh: Callable[[], _State]) -> Iterator[_State]:
+        with self._lock:
+            if self._state is None:
+                self._state = fresh()
+            yield self._state
+
+
+class _SqliteStore:
+    """State in a SQLite file, updated under BEGIN IMMEDIATE so processes take turns."""
+
+    _SCHEMA = "CREATE TABLE IF NOT EXISTS throttle (provider TEXT PRIMARY KEY, state TEXT NOT NULL)"
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(self._SCHEMA)
+
+    @contextmanager
+    def transaction(self, provider: str, fresh: Callable[[], _State]) -> Iterator[_State]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT state FROM throttle WHERE provider = ?", (provider,)).fetchone()
+                state = _State(**json.loads(row[0])) if row else fresh()
+                yield state
+                self._db.execute("INSERT OR REPLACE INTO throttle (provider, state) VALUES (?, ?)",
+                                 (provider, json.dumps(asdict(state))))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+
+# ─── Registry ─────────────────────────────────────────────────────────────────
+
+_throttles: dict[str, ProviderThrottle] = {}
+_registry_lock = threading.Lock()
+
+
+def throttle_for(provider: str) -> ProviderThrottle:
+    """The process's shared throttle for a provider (state in THROTTLE_STATE if set)."""
+    with _registry_lock:
+        throttle = _throttles.get(provider)
+        if throttle is None:
+            throttle = _throttles[provider] = ProviderThrottle(
+                provider, state_path=os.environ.get("THROTTLE_STATE") or None)
+    return throttle
+
+
+def main() -> None:
+    path = os.environ.get("THROTTLE_STATE")
+    if not path or not Path(path).exists():
+        print("THROTTLE_STATE is not set or has no state yet (throttles are per process)")
+        return
+    db = sqlite3.connect(path)
+    for provider, state in db.execute("SELECT provider, state FROM throttle ORDER BY provider"):
+        print(f"{provider:<16} {state}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+bench_dashboard.py
+Benchmark the dashboard data pipeline stage by stage.
+
+Generates a synthetic client export of a given shape (fixed seed, so runs
+are comparable), then times each stage of dashboard_data_processor.py
+(load, analyze, clean, export) and generate_dashboard.py (cube load, cached
+load, KPIs, trend, category, and each renderer). Times are the median of
+--repeat full runs; peak memory per stage comes from one more run under
+tracemalloc, kept separate so tracing does not skew the times. Results are
+written as JSON.
+
+Usage:
+    python scripts/bench_dashboard.py run                       # 100k rows, default mix
+    python scripts/bench_dashboard.py run --rows 1000000 --text 6 --numeric 4 --dates 2 \\
+        --null-rate 0.05 --dup-rate 0.02 --chunk-size 250000
+    python scripts/bench_dashboard.py run --save-baseline       # also store as the baseline
+    python scripts/bench_dashboard.py run --compare             # run, then compare to the baseline
+    python scripts/bench_dashboard.py compare CURRENT.json [--baseline BASE.json] [--threshold 0.15]
+
+Results go to .tmp/benchmarks/dashboard-<timestamp>.json; the baseline is
+.tmp/benchmarks/dashboard-baseline.json. Baselines are machine-specific:
+record one on the machine you compare on, before the change.
+
+Exit codes:
+    0 - benchmark ran / no regressions
+    1 - at least one stage regressed past the threshold
+    2 - results are not comparable (different data shape or options)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / ".tmp" / "benchmarks"
+BASELINE = RESULTS_DIR / "dashboard-baseline.json"
+RESULTS_VERSION = 1
+CLIENT_ID = "bench"
+
+sys.path.insert(0, str(ROOT / "execution"))
+from dashboard_cube import CUBE_FILE  # noqa: E402
+from dashboard_data_processor import DashboardDataProcessor, ProcessorConfig  # noqa: E402
+from generate_dashboard import FORMATS, PARQUET_AVAILABLE, DashboardConfig, DashboardGenerator  # noqa: E402
+
+TEXT_NAMES = ["Region", "Product", "Channel", "Segment", "Sales Rep", "City"]
+NUMERIC_NAMES = ["Sale Amount", "Units", "Discount", "Cost"]
+DATE_NAMES = ["Order Date", "Ship Date"]
+
+
+# ── Synthetic Data ────────────────────────────────────────────────────────────
+
+def make_client_file(path: Path, rows: int, text: int = 3, numeric: int = 3, dates: int = 1,
+                     null_rate: float = 0.02, dup_rate: float = 0.01, seed: int = 42) -> Path:
+    """
+    Write a CSV that looks like a client export: an order ID, `text`
+    dimension columns (growing cardinality), `numeric` columns (the first
+    formatted as currency, "$1,234.56"), `dates` date columns in mixed
+    formats. `null_rate` of each non-ID cell is blank; `dup_rate` of the
+    rows are exact copies of other rows.
+    """
+    rng = np.random.default_rng(seed)
+    unique = rows - int(rows * dup_rate)
+    data = {"Order ID": [f"ORD-{i:08d}" for i in range(unique)]}
+
+    for i in range(text):
+        name = TEXT_NAMES[i] if i < len(TEXT_NAMES) else f"Attribute {i + 1}"
+        cardinality = min(5 * 4 ** i, 5_000)
+        data[name] = pd.Series(rng.integers(0, cardinality, unique)).map(lambda k, n=name: f"{n} {k}")
+
+    for i in range(numeric):
+        name = NUMERIC_NAMES[i] if i < len(NUMERIC_NAMES) else f"Metric {i + 1}"
+        if i == 0:
+            data[name] = pd.Series(rng.gamma(2.0, 150.0, unique)).map("${:,.2f}".format)
+        elif i == 1:
+            data[name] = rng.integers(1, 50, unique)
+        else:
+            data[name] = rng.normal(100, 25, unique).round(3)
+
+    start = np.datetime64("2023-01-01")
+    for i in range(dates):
+        name = DATE_NAMES[i] if i < len(DATE_NAMES) else f"Date {i + 1}"
+        days = pd.Series(start + rng.integers(0, 3 * 365, unique).astype("timedelta64[D]"))
+        data[name] = days.dt.strftime("%m/%d/%Y" if i % 2 == 0 else "%Y-%m-%d")
+
+    df = pd.DataFrame(data).astype(str)
+    for col in df.columns[1:]:
+        df.loc[rng.random(unique) < null_rate, col] = ""
+
+    if rows > unique:
+        df = pd.concat([df, df.iloc[rng.integers(0, unique, rows - unique)]], ignore_index=True)
+        df = df.iloc[rng.permutation(rows)]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=False)
+    return path
+
+
+# ── Stages ────────────────────────────────────────────────────────────────────
+
+def run_pipeline(source: Path, chunk_size: int | None, workers: int, write_csv: bool,
+                 trace_memory: bool = False) -> dict[str, dict]:
+    """
+    One processor + generator run in the current directory (which must
+    hold clients/bench/). Returns seconds, and with `trace_memory` the peak
+    bytes allocated above the stage's starting point, per stage.
+    """
+    stages: dict[str, dict] = {}
+
+    @contextmanager
+    def stage(name: str):
+        if trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        stages[name] = {"seconds": time.perf_counter() - start}
+        if trace_memory:
+            stages[name]["peak_bytes"] = tracemalloc.get_traced_memory()[1] - before
+
+    processor = DashboardDataProcessor(ProcessorConfig(
+        client_id=CLIENT_ID, file_path=source, chunk_size=chunk_size, workers=workers, write_csv=write_csv,
+    ))
+    with stage("processor.load"):
+        processor.load()
+    with stage("processor.analyze"):
+        processor.analyze()
+    with stage("processor.clean"):
+        processor.clean()
+    with stage("processor.export"):
+        processor.export()
+    del processor
+
+    (Path("clients") / CLIENT_ID / "data" / "processed" / CUBE_FILE).unlink(missing_ok=True)
+    config = DashboardConfig(client_id=CLIENT_ID, format="all", title="Benchmark")
+    generator = DashboardGenerator(config)
+    with stage("generator.load"):
+        generator.load()
+    with stage("generator.load_cached"):
+        DashboardGenerator(config).load()
+    with stage("generator.kpis"):
+        roles, _ = generator._roles_and_kpis()
+    with stage("generator.trend"):
+        generator._build_trend_data(roles)
+    with stage("generator.category"):
+        generator._build_category_data(roles)
+    for fmt in FORMATS:
+        with stage(f"render.{fmt}"):
+            generator._render(fmt)
+    return stages
+
+
+def bench(args: argparse.Namespace) -> dict:
+    """Generate the data, run the pipeline --repeat times (+1 traced) and summarise."""
+    shape = {
+        "rows": args.rows, "text": args.text, "numeric": args.numeric, "dates": args.dates,
+        "null_rate": args.null_rate, "dup_rate": args.dup_rate, "seed": args.seed,
+    }
+    options = {"chunk_size": args.chunk_size, "workers": args.workers, "write_csv": args.csv}
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="bench_dashboard_")).resolve()
+    (workdir / "clients" / CLIENT_ID).mkdir(parents=True, exist_ok=True)
+    cwd = Path.cwd()
+    os.chdir(workdir)
+    logging.disable(logging.WARNING)  # Both pipelines log every step, every run
+    try:
+        start = time.perf_counter()
+        source = make_client_file(workdir / "client_export.csv", **shape)
+        generate_s = time.perf_counter() - start
+        input_mb = source.stat().st_size / 2**20
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # e.g. pandas date-format fallbacks, once per run
+            runs = [run_pipeline(source, **options) for _ in range(args.repeat)]
+            traced = {}
+            if not args.no_memory:
+                tracemalloc.start()
+                try:
+                    traced = run_pipeline(source, **options, trace_memory=True)
+                finally:
+                    tracemalloc.stop()
+    finally:
+        logging.disable(logging.NOTSET)
+        os.chdir(cwd)
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    stages = {}
+    for name in runs[0]:
+        seconds = [run[name]["seconds"] for run in runs]
+        stages[name] = {
+            "seconds": round(statistics.median(seconds), 6),
+            "min_seconds": round(min(seconds), 6),
+            "peak_mb": round(traced[name]["peak_bytes"] / 2**20, 2) if name in traced else None,
+        }
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "shape": shape,
+        "options": options,
+        "repeat": args.repeat,
+        "input_mb": round(input_mb, 2),
+        "generate_seconds": round(generate_s, 3),
+        "stages": stages,
+        "total_seconds": round(sum(s["seconds"] for s in stages.values()), 6),
+    }
+
+
+def _environment() -> dict:
+    try:
+        import pyarrow
+        pyarrow_version = pyarrow.__version__
+    except ImportError:
+        pyarrow_version = None
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "pyarrow": pyarrow_version if PARQUET_AVAILABLE else None,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+# ── Compare ───────────────────────────────────────────────────────────────────
+
+def compare(baseline: dict, current: dict, threshold: float = 0.15,
+            min_seconds: float = 0.01, min_mb: float = 1.0) -> tuple[list[dict], list[str]]:
+    """
+    Stage-by-stage changes from `baseline` to `current`. A stage regresses
+    when its median time (or peak memory) grows by more than `threshold`
+    and by more than the noise floor (`min_seconds` / `min_mb`). Returns
+    the rows and the reasons the two results are not comparable, if any.
+    """
+    problems = [
+        f"{key} differs: {baseline.get(key)} → {current.get(key)}"
+        for key in ("shape", "options")
+        if baseline.get(key) != current.get(key)
+    ]
+
+    rows = []
+    for name, cur in current["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            rows.append({"stage": name, "current_s": cur["seconds"], "status": "new"})
+            continue
+        row = {
+            "stage": name,
+            "baseline_s": base["seconds"], "current_s": cur["seconds"],
+            "time_change": _change(base["seconds"], cur["seconds"]),
+            "baseline_mb": base.get("peak_mb"), "current_mb": cur.get("peak_mb"),
+            "memory_change": _change(base.get("peak_mb"), cur.get("peak_mb")),
+        }
+        slower = (row["time_change"] is not None and row["time_change"] > threshold
+                  and cur["seconds"] - base["seconds"] > min_seconds)
+        bigger = (row["memory_change"] is not None and row["memory_change"] > threshold
+                  and row["current_mb"] - row["baseline_mb"] > min_mb)
+        faster = (row["time_change"] is not None and row["time_change"] < -threshold
+                  and base["seconds"] - cur["seconds"] > min_seconds)
+        row["status"] = "REGRESSION" if slower or bigger else "faster" if faster else "ok"
+        rows.append(row)
+    return rows, problems
+
+
+def _change(before: float | None, after: float | None) -> float | None:
+    if before is None or after is None or before <= 0:
+        return None
+    return after / before - 1
+
+
+def _print_comparison(rows: list[dict], problems: list[str], threshold: float) -> None:
+    for problem in problems:
+        print(f"  not comparable: {problem}")
+    print(f"{'stage':<24} {'base s':>9} {'now s':>9} {'Δ time':>8} {'base MB':>9} {'now MB':>9} {'Δ mem':>8}  status")
+    for r in rows:
+        print(f"{r['stage']:<24} {_fmt(r.get('baseline_s'), '.4f'):>9} {_fmt(r['current_s'], '.4f'):>9} "
+              f"{_fmt(r.get('time_change'), '+.0%'):>8} {_fmt(r.get('baseline_mb'), '.1f'):>9} "
+              f"{_fmt(r.get('current_mb'), '.1f'):>9} {_fmt(r.get('memory_change'), '+.0%'):>8}  {r['status']}")
+    regressed = [r["stage"] for r in rows if r["status"] == "REGRESSION"]
+    print(f"\n{len(regressed)} regression(s) past {threshold:.0%}" + (f": {', '.join(regressed)}" if regressed else ""))
+
+
+def _fmt(value: float | None, spec: str) -> str:
+    return "—" if value is None else format(value, spec)
+
+
+def _print_results(results: dict) -> None:
+    shape = results["shape"]
+    print(f"{shape['rows']:,} rows ({results['input_mb']} MB), {shape['text']} text / {shape['numeric']} numeric / "
+          f"{shape['dates']} date columns, median of {results['repeat']}")
+    print(f"{'stage':<24} {'median s':>9} {'min s':>9} {'peak MB':>9}")
+    for name, s in results["stages"].items():
+        print(f"{name:<24} {s['seconds']:>9.4f} {s['min_seconds']:>9.4f} {_fmt(s['peak_mb'], '.1f'):>9}")
+    print(f"{'total':<24} {results['total_seconds']:>9.4f}")
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def _load(path: Path) -> dict:
+    results = json.loads(path.read_text(encoding="utf-8"))
+    if results.get("version") != RESULTS_VERSION:
+        print(f"{path}: unsupported results version {results.get('version')}")
+        sys.exit(2)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Benchmark the pipeline on synthetic data")
+    run.add_argument("--rows", type=int, default=100_000, help="Rows in the synthetic export")
+    run.add_argument("--text", type=int, default=3, help="Text (dimension) columns")
+    run.add_argument("--numeric", type=int, default=3, help="Numeric columns (first is currency text)")
+    run.add_argument("--dates", type=int, default=1, help="Date columns")
+    run.add_argument("--null-rate", type=float, default=0.02, help="Share of blank cells per column")
+    run.add_argument("--dup-rate", type=float, default=0.01, help="Share of rows that are exact duplicates")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--chunk-size", type=int, default=None, help="Processor --chunk-size")
+    run.add_argument("--workers", type=int, default=1, help="Processor --workers")
+    run.add_argument("--csv", action="store_true", help="Processor --csv")
+    run.add_argument("--repeat", type=int, default=3, help="Timed runs (median is reported)")
+    run.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    run.add_argument("--workdir", type=Path, help="Keep generated files here instead of a temp folder")
+    run.add_argument("--out", type=Path, help="Results file (default: .tmp/benchmarks/dashboard-<time>.json)")
+    run.add_argument("--save-baseline", action="store_true", help=f"Also save the results as {BASELINE.name}")
+    run.add_argument("--compare", action="store_true", help="Compare the results with the baseline")
+
+    cmp = sub.add_parser("compare", help="Compare results with a baseline")
+    cmp.add_argument("current", type=Path, help="Results JSON from a run")
+    for p in (run, cmp):
+        p.add_argument("--baseline", type=Path, default=BASELINE, help="Baseline results JSON")
+        p.add_argument("--threshold", type=float, default=0.15,
+                       help="Relative slowdown or memory growth that counts as a regression")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        current = _load(args.current)
+    else:
+        current = bench(args)
+        out = args.out or RESULTS_DIR / f"dashboard-{datetime.now():%Y%m%d-%H%M%S}.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        _print_results(current)
+        print(f"\nResults written: {out}")
+        if args.save_baseline:
+            args.baseline.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(out, args.baseline)
+            print(f"Baseline saved: {args.baseline}")
+        if not args.compare:
+            sys.exit(0)
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; record one with: run --save-baseline")
+        sys.exit(2)
+    rows, problems = compare(_load(args.baseline), current, args.threshold)
+    print()
+    _print_comparison(rows, problems, args.threshold)
+    if problems:
+        sys.exit(2)
+    sys.exit(1 if any(r["status"] == "REGRESSION" for r in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+bench_logger.py
+Benchmark the per-call cost of execution.shared.logger.
+
+Logs N records through get_logger() in each mode — synchronous (format and
+write on the calling thread), queued with the block policy, queued with the
+drop policy — and reports the time spent inside each log call. For queued
+modes it also reports the time until the listener has written everything,
+and how many records the drop policy discarded.
+
+In a tight loop the listener thread competes with the caller for the GIL,
+so queued calls save less than they do in real hot loops, which mostly
+wait on the network; --gap-us sleeps between calls to model that. Console output goes to
+os.devnull and the JSON log to a temp folder, so only logging is measured.
+
+Usage:
+    python scripts/bench_logger.py                    # 20,000 records per mode
+    python scripts/bench_logger.py --records 100000 --queue-size 1000
+    python scripts/bench_logger.py --records 5000 --gap-us 200   # crawler-like pacing
+    python scripts/bench_logger.py --json             # machine-readable
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import execution.shared.logger as shared_logger  # noqa: E402
+from execution.shared.log_store import iter_records  # noqa: E402
+
+MODES = ("sync", "queued-block", "queued-drop")
+EXTRA = {"url": "https://example.com/page", "status": 200, "elapsed_ms": 12.5}
+
+
+def bench_mode(mode: str, records: int, queue_size: int, with_extra: bool, run: int,
+               gap_s: float = 0.0) -> dict:
+    queued = mode != "sync"
+    os.environ["LOG_QUEUE_POLICY"] = mode.split("-")[-1] if queued else "block"
+    os.environ["LOG_QUEUE_SIZE"] = str(queue_size)
+
+    stderr = sys.stderr
+    with open(os.devnull, "w", encoding="utf-8") as devnull, tempfile.TemporaryDirectory() as logs:
+        shared_logger.LOGS_DIR = Path(logs)
+        sys.stderr = devnull  # The console handler binds sys.stderr when it is created
+        try:
+            log = shared_logger.get_logger(f"bench.{mode}.{run}", level="INFO", queued=queued)
+        finally:
+            sys.stderr = stderr
+        extra = EXTRA if with_extra else None
+
+        caller_s = 0.0
+        start = time.perf_counter()
+        for i in range(records):
+            t = time.perf_counter()
+            log.info("Fetched page %d", i, extra=extra)
+            caller_s += time.perf_counter() - t
+            if gap_s:
+                time.sleep(gap_s)
+
+        dropped = 0
+        if queued:
+            dropped = log.handlers[0].dropped_total
+            shared_logger.stop_queued_logging()
+        written_s = time.perf_counter() - start
+
+        handlers = log.handlers[:]
+        if queued:
+            handlers += handlers[0].listener.handlers
+        for handler in handlers:
+            handler.close()
+        log.handlers.clear()
+        lines = sum(1 for _ in iter_records(Path(logs)))
+
+    return {
+        "mode": mode,
+        "extra": with_extra,
+        "records": records,
+        "caller_us": round(caller_s / records * 1e6, 2),
+        "written_us": round((written_s - gap_s * records) / records * 1e6, 2),
+        "dropped": dropped,
+        "lines": lines,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20_000, help="Records logged per mode")
+    parser.add_argument("--queue-size", type=int, default=shared_logger.LOG_QUEUE_SIZE,
+                        help="Queue capacity for the queued modes")
+    parser.add_argument("--gap-us", type=float, default=0,
+                        help="Sleep between calls, like a crawler waiting on the network")
+    parser.add_argument("--json", action="store_true", help="Output JSON instead of a table")
+    args = parser.parse_args()
+
+    results = [
+        bench_mode(mode, args.records, args.queue_size, with_extra, run, args.gap_us / 1e6)
+        for run, (with_extra, mode) in enumerate((e, m) for e in (False, True) for m in MODES)
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<14} {'extra':>6} {'caller µs/call':>15} {'written µs/rec':>15} {'dropped':>8} {'lines':>7}")
+    for r in results:
+        print(f"{r['mode']:<14} {'yes' if r['extra'] else 'no':>6} {r['caller_us']:>15.2f} "
+              f"{r['written_us']:>15.2f} {r['dropped']:>8} {r['lines']:>7}")
+
+
+if __name__ == "__main__":
+    main()
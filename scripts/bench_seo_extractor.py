@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+bench_seo_extractor.py
+Benchmark the single-pass SEO extractor against the BeautifulSoup path.
+
+Runs both implementations in execution/seo_extractor.py over saved HTML
+fixtures, checks that they emit identical fields, and reports the median
+time per page for each.
+
+Usage:
+    python scripts/bench_seo_extractor.py                      # default fixtures
+    python scripts/bench_seo_extractor.py --repeat 20
+    python scripts/bench_seo_extractor.py --html public/index.html --domain 5cypress.com
+    python scripts/bench_seo_extractor.py --json               # machine-readable
+
+Exit codes:
+    0 - benchmark ran and outputs matched
+    1 - at least one fixture produced different fields
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = ROOT / "tests" / "fixtures" / "seo_pages"
+
+sys.path.insert(0, str(ROOT / "execution"))
+from seo_extractor import extract_page_fields, extract_with_soup  # noqa: E402
+
+
+def _time_per_call(fn, html: str, domain: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(html, domain)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_file(path: Path, domain: str, repeat: int) -> dict:
+    html = path.read_text(encoding="utf-8", errors="replace")
+    streaming = extract_page_fields(html, domain)
+    soup = extract_with_soup(html, domain)
+    mismatched = sorted(k for k in streaming if streaming[k] != soup.get(k))
+
+    soup_s = _time_per_call(extract_with_soup, html, domain, repeat)
+    stream_s = _time_per_call(extract_page_fields, html, domain, repeat)
+
+    return {
+        "file": str(path.relative_to(ROOT) if path.is_relative_to(ROOT) else path),
+        "bytes": len(html.encode("utf-8")),
+        "anchors": len(streaming["hrefs"]),
+        "soup_ms": round(soup_s * 1000, 2),
+        "streaming_ms": round(stream_s * 1000, 2),
+        "speedup": round(soup_s / stream_s, 1) if stream_s else None,
+        "mismatched_fields": mismatched,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--html", nargs="*", type=Path,
+                        help="HTML files to benchmark (default: tests/fixtures/seo_pages/*.html)")
+    parser.add_argument("--domain", default="example.com",
+                        help="Domain used for internal/external link classification")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per file (median is reported)")
+    parser.add_argument("--json", action="store_true", help="Output JSON instead of a table")
+    args = parser.parse_args()
+
+    files = args.html or sorted(FIXTURES_DIR.glob("*.html"))
+    if not files:
+        print(f"No HTML fixtures found in {FIXTURES_DIR}")
+        sys.exit(1)
+
+    results = [bench_file(p, args.domain, args.repeat) for p in files]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'file':<50} {'KB':>7} {'anchors':>8} {'bs4 ms':>9} {'stream ms':>10} {'speedup':>8}  match")
+        for r in results:
+            match = "ok" if not r["mismatched_fields"] else ",".join(r["mismatched_fields"])
+            print(f"{r['file']:<50} {r['bytes'] / 1024:>7.1f} {r['anchors']:>8} "
+                  f"{r['soup_ms']:>9.2f} {r['streaming_ms']:>10.2f} {r['speedup']:>7}x  {match}")
+
+    sys.exit(1 if any(r["mismatched_fields"] for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
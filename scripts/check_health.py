@@ -43,7 +43,11 @@ CONFIG_DIR    = REPO_ROOT / "config"
 DB_PATH       = REPO_ROOT / "database.db"   # better-sqlite3 Node db
 
 REQUIRED_DIRS  = [LOGS_DIR, EXECUTION_DIR / "shared", REPO_ROOT / "directives"]
-ANNEAL_LOG     = LOGS_DIR / "anneal.log"
+ANNEAL_DB      = LOGS_DIR / "anneal.db"    # execution/shared/anneal.py store
+ANNEAL_LOG     = LOGS_DIR / "anneal.log"   # its JSON-lines export / pre-SQLite file
+
+sys.path.insert(0, str(REPO_ROOT))
+from execution.shared.log_store import iter_records  # noqa: E402  (stdlib only)
 
 # ---------------------------------------------------------------------------
 # Result types
@@ -101,9 +105,11 @@ def check_shared_module() -> list[Check]:
     expected = [
         "execution/shared/__init__.py",
         "execution/shared/logger.py",
+        "execution/shared/log_store.py",
         "execution/shared/errors.py",
         "execution/shared/config.py",
         "execution/shared/retry.py",
+        "execution/shared/throttle.py",
         "execution/shared/notify.py",
         "execution/shared/anneal.py",
         "execution/shared/client_schema.py",
@@ -228,52 +234,58 @@ def check_bare_excepts() -> list[Check]:
 
 def check_anneal_log() -> list[Check]:
     """Look for unresolved failures recorded by anneal.py."""
-    if not ANNEAL_LOG.exists():
-        return [Check("anneal", OK, "anneal.log not yet created (no failures logged)")]
-
-    unresolved = []
-    try:
-        for line in ANNEAL_LOG.read_text(encoding="utf-8").splitlines():
+    if ANNEAL_DB.exists():
+        source = "anneal store"
+        try:
+            conn = sqlite3.connect(f"{ANNEAL_DB.as_uri()}?mode=ro", uri=True, timeout=5)
             try:
-                entry = json.loads(line)
-                if entry.get("type") == "failure" and not entry.get("resolved"):
-                    unresolved.append(entry)
-            except (json.JSONDecodeError, ValueError):
-                pass
-    except Exception as exc:
-        return [Check("anneal", WARN, f"Could not read anneal.log: {exc}")]
+                unresolved = [
+                    {"script": script} for (script,) in conn.execute(
+                        "SELECT script FROM anneal WHERE type = 'FAILURE' AND resolved = 0 ORDER BY id"
+                    )
+                ]
+            finally:
+                conn.close()
+        except sqlite3.Error as exc:
+            return [Check("anneal", WARN, f"Could not read anneal.db: {exc}")]
+    elif ANNEAL_LOG.exists():
+        source = "anneal.log"
+        unresolved = []
+        try:
+            for line in ANNEAL_LOG.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                    if str(entry.get("type", "")).upper() == "FAILURE" and not entry.get("resolved"):
+                        unresolved.append(entry)
+                except (json.JSONDecodeError, ValueError):
+                    pass
+        except Exception as exc:
+            return [Check("anneal", WARN, f"Could not read anneal.log: {exc}")]
+    else:
+        return [Check("anneal", OK, "anneal store not yet created (no failures logged)")]
 
     if unresolved:
         return [Check("anneal", WARN,
-                      f"{len(unresolved)} unresolved failure(s) in anneal.log",
+                      f"{len(unresolved)} unresolved failure(s) in {source}",
                       "; ".join(u.get("script", "?") for u in unresolved[:5]))]
-    return [Check("anneal", OK, "No unresolved failures in anneal.log")]
+    return [Check("anneal", OK, f"No unresolved failures in {source}")]
 
 
 def check_recent_errors() -> list[Check]:
-    """Scan today's log file for ERROR / CRITICAL entries."""
-    today       = datetime.now(timezone.utc).date().isoformat()
-    log_file    = LOGS_DIR / f"{today}.log"
-    if not log_file.exists():
-        return [Check("recent_logs", OK, f"No log file for {today} yet")]
-
-    errors = []
+    """Find today's ERROR / CRITICAL entries through the log store's index."""
+    now = datetime.now(timezone.utc)
+    today = now.date().isoformat()
+    since = now.replace(hour=0, minute=0, second=0, microsecond=0)
     try:
-        for line in log_file.read_text(encoding="utf-8").splitlines():
-            try:
-                entry = json.loads(line)
-                if entry.get("level") in ("ERROR", "CRITICAL"):
-                    errors.append(entry)
-            except (json.JSONDecodeError, ValueError):
-                pass
+        errors = list(iter_records(LOGS_DIR, since=since, levels=("ERROR", "CRITICAL")))
     except Exception as exc:
-        return [Check("recent_logs", WARN, f"Could not read log: {exc}")]
+        return [Check("recent_logs", WARN, f"Could not read logs: {exc}")]
 
     if errors:
         last = errors[-1]
         return [Check("recent_logs", WARN,
                       f"{len(errors)} ERROR/CRITICAL entries today",
-                      f"Last: [{last.get('logger','?')}] {last.get('message','')}")]
+                      f"Last: [{last.get('logger','?')}] {last.get('msg', last.get('message',''))}")]
     return [Check("recent_logs", OK, f"No errors in today's log ({today})")]
 
 
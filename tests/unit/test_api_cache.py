@@ -0,0 +1,139 @@
+"""
+tests/unit/test_api_cache.py
+Unit tests for execution/shared/api_cache.py
+
+Tests:
+- Equivalent payloads share a cache key; endpoints without a policy are never cached
+- Expired entries are missed and purged
+- TTLs apply at read time: lowering one expires entries already stored
+- Hits credit cost and latency savings, persisted across instances
+- refresh=True skips reads but still writes; enabled=False is a no-op
+- DataForSEO client serves repeat calls from the cache and skips failed tasks
+- An audit closes the cache connection it opened
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+ENDPOINT = "/backlinks/summary/live"
+
+
+def _cache(tmp_path, **kwargs):
+    from execution.shared.api_cache import ApiCache, CachePolicy
+    policies = kwargs.pop("policies", {ENDPOINT: CachePolicy(ttl=60, cost_usd=0.02)})
+    return ApiCache("test", policies=policies, db_path=tmp_path / "cache.sqlite", **kwargs)
+
+
+class TestApiCache:
+    def test_normalised_payload_hits(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put(ENDPOINT, [{"target": "example.com", "limit": 1}], {"ok": 1})
+        assert cache.get(ENDPOINT, [{"limit": 1, "target": " example.com "}]) == {"ok": 1}
+        assert cache.get(ENDPOINT, [{"target": "other.com", "limit": 1}]) is None
+
+    def test_endpoint_without_policy_not_cached(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put("/on_page/instant_pages", {"url": "x"}, {"ok": 1})
+        assert cache.get("/on_page/instant_pages", {"url": "x"}) is None
+        assert cache.stats["misses"] == 0
+
+    def test_expired_entries_missed_and_purged(self, tmp_path):
+        from execution.shared.api_cache import CachePolicy
+        cache = _cache(tmp_path, policies={ENDPOINT: CachePolicy(ttl=-1)})
+        cache.put(ENDPOINT, {"t": 1}, {"ok": 1})
+        assert cache.get(ENDPOINT, {"t": 1}) is None
+        assert cache.purge_expired() == 1
+
+    def test_lowered_ttl_applies_to_stored_entries(self, tmp_path):
+        from execution.shared.api_cache import CachePolicy, DAY
+        long = _cache(tmp_path, policies={ENDPOINT: CachePolicy(ttl=30 * DAY)})
+        long.put(ENDPOINT, {"t": 1}, {"ok": 1})
+        long.close()
+
+        short = _cache(tmp_path, policies={ENDPOINT: CachePolicy(ttl=0.05)})
+        assert short.get(ENDPOINT, {"t": 1}) == {"ok": 1}
+        time.sleep(0.1)
+        assert short.get(ENDPOINT, {"t": 1}) is None
+        assert short.purge_expired() == 1
+
+    def test_savings_accumulate_and_persist(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put(ENDPOINT, {"t": 1}, {"ok": 1}, latency_s=1.5)
+        cache.get(ENDPOINT, {"t": 1})
+        cache.get(ENDPOINT, {"t": 1})
+        assert cache.stats["hits"] == 2
+        assert cache.stats["saved_usd"] == pytest.approx(0.04)
+        assert cache.stats["saved_s"] == pytest.approx(3.0)
+        cache.close()
+
+        lifetime = _cache(tmp_path).lifetime_savings()
+        assert lifetime[ENDPOINT]["hits"] == 2
+
+    def test_refresh_skips_reads_but_writes(self, tmp_path):
+        _cache(tmp_path).put(ENDPOINT, {"t": 1}, {"v": "old"})
+        refreshing = _cache(tmp_path, refresh=True)
+        assert refreshing.get(ENDPOINT, {"t": 1}) is None
+        refreshing.put(ENDPOINT, {"t": 1}, {"v": "new"})
+        assert _cache(tmp_path).get(ENDPOINT, {"t": 1}) == {"v": "new"}
+
+    def test_disabled_cache_is_noop(self, tmp_path):
+        cache = _cache(tmp_path, enabled=False)
+        cache.put(ENDPOINT, {"t": 1}, {"ok": 1})
+        assert cache.get(ENDPOINT, {"t": 1}) is None
+        assert not (tmp_path / "cache.sqlite").exists()
+
+
+def test_dataforseo_client_uses_cache(tmp_path, monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    monkeypatch.setenv("DATAFORSEO_USERNAME", "test@example.com")
+    monkeypatch.setenv("DATAFORSEO_PASSWORD", "test_password")
+    import execution.seo_audit_runner as runner
+    from execution.shared.api_cache import ApiCache
+
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        status = 40501 if b"bad.com" in request.content else 20000
+        return httpx.Response(200, json={"status_code": 20000, "tasks": [{"status_code": status, "result": []}]})
+
+    async def go():
+        cache = ApiCache("dataforseo", policies=runner.DATAFORSEO_CACHE_POLICIES,
+                         db_path=tmp_path / "cache.sqlite")
+        async with runner.AsyncDataForSEOClient(cache=cache, transport=httpx.MockTransport(handler)) as client:
+            for target in ("example.com", "example.com", "bad.com", "bad.com"):
+                await client.post(ENDPOINT, [{"target": target}])
+        return cache
+
+    cache = asyncio.run(go())
+    assert len(calls) == 3  # second example.com served from cache; failed tasks not cached
+    assert cache.stats["hits"] == 1
+    assert cache.stats["saved_usd"] == pytest.approx(0.02)
+
+
+def test_audit_closes_cache_it_opened(tmp_path, monkeypatch):
+    pytest.importorskip("httpx")
+    monkeypatch.setenv("DATAFORSEO_USERNAME", "test@example.com")
+    monkeypatch.setenv("DATAFORSEO_PASSWORD", "test_password")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    import execution.seo_audit_runner as runner
+    from execution.shared.api_cache import ApiCache
+
+    opened = []
+
+    def open_cache(refresh=False, enabled=True):
+        opened.append(ApiCache("dataforseo", policies=runner.DATAFORSEO_CACHE_POLICIES,
+                               db_path=tmp_path / "cache.sqlite", refresh=refresh, enabled=enabled))
+        return opened[-1]
+
+    monkeypatch.setattr(runner, "open_cache", open_cache)
+    asyncio.run(runner.run_audit_async("example.com", modules=[]))
+    assert len(opened) == 1 and opened[0]._db is None
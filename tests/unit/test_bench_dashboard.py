@@ -0,0 +1,94 @@
+"""
+tests/unit/test_bench_dashboard.py
+Unit tests for scripts/bench_dashboard.py
+
+Tests:
+- Synthetic exports are reproducible from the seed and have the requested
+  shape, blank rate and duplicate rate
+- A small run times and memory-profiles every processor and generator stage
+- compare flags slower or larger stages past the threshold, ignores
+  changes under the noise floor, and refuses results of another shape
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pydantic")
+
+
+def test_synthetic_export_shape(tmp_path):
+    from scripts.bench_dashboard import make_client_file
+
+    first = make_client_file(tmp_path / "a.csv", rows=2_000, text=2, numeric=3, dates=2,
+                             null_rate=0.1, dup_rate=0.05, seed=7)
+    second = make_client_file(tmp_path / "b.csv", rows=2_000, text=2, numeric=3, dates=2,
+                              null_rate=0.1, dup_rate=0.05, seed=7)
+    assert first.read_bytes() == second.read_bytes()
+
+    df = pd.read_csv(first, dtype=str, keep_default_na=False)
+    assert list(df.columns) == ["Order ID", "Region", "Product", "Sale Amount", "Units", "Discount",
+                                "Order Date", "Ship Date"]
+    assert len(df) == 2_000 and df.duplicated().sum() == 100
+    assert df["Order ID"].ne("").all()
+    assert (df["Region"] == "").mean() == pytest.approx(0.1, abs=0.03)
+    assert df["Sale Amount"].str.startswith("$").sum() > 1_500
+
+
+def test_run_profiles_every_stage(tmp_path):
+    from scripts.bench_dashboard import bench
+
+    args = argparse.Namespace(
+        rows=300, text=2, numeric=2, dates=1, null_rate=0.02, dup_rate=0.02, seed=1,
+        chunk_size=None, workers=1, csv=True, repeat=1, no_memory=False, workdir=tmp_path / "work",
+    )
+    results = bench(args)
+
+    assert list(results["stages"]) == [
+        "processor.load", "processor.analyze", "processor.clean", "processor.export",
+        "generator.load", "generator.load_cached", "generator.kpis", "generator.trend",
+        "generator.category", "render.web", "render.pbi", "render.tableau",
+    ]
+    assert all(s["seconds"] >= 0 and s["peak_mb"] is not None for s in results["stages"].values())
+    assert (tmp_path / "work" / "clients" / "bench" / "deliverables" / "dashboard-v1" / "web"
+            / "dashboard.html").exists()
+
+
+def test_compare_flags_regressions():
+    from scripts.bench_dashboard import compare
+
+    def results(clean_s, export_mb, rows=1_000):
+        return {
+            "shape": {"rows": rows}, "options": {},
+            "stages": {
+                "processor.clean": {"seconds": clean_s, "peak_mb": 10.0},
+                "processor.export": {"seconds": 0.5, "peak_mb": export_mb},
+                "generator.trend": {"seconds": 0.001, "peak_mb": 0.0},
+            },
+        }
+
+    baseline = results(1.0, 10.0)
+    rows, problems = compare(baseline, results(1.3, 10.5), threshold=0.15)
+    assert not problems
+    assert {r["stage"]: r["status"] for r in rows} == {
+        "processor.clean": "REGRESSION", "processor.export": "ok", "generator.trend": "ok",
+    }
+
+    rows, _ = compare(baseline, results(0.5, 20.0), threshold=0.15)
+    assert {r["stage"]: r["status"] for r in rows}["processor.clean"] == "faster"
+    assert {r["stage"]: r["status"] for r in rows}["processor.export"] == "REGRESSION"
+
+    # 3x slower, but only by 2 ms: under the noise floor
+    current = results(1.0, 10.0)
+    current["stages"]["generator.trend"]["seconds"] = 0.003
+    assert compare(baseline, current)[0][2]["status"] == "ok"
+
+    _, problems = compare(baseline, results(1.0, 10.0, rows=5_000))
+    assert problems and "shape" in problems[0]
@@ -0,0 +1,279 @@
+"""
+tests/unit/test_dashboard_data_processor.py
+Unit tests for execution/dashboard_data_processor.py
+
+Tests:
+- Chunked mode writes the same cleaned_data.csv, schema and warnings as the
+  in-memory path, including duplicates that straddle chunk boundaries
+- Row counts in the processing summary come from the streamed counters
+- cleaned_data.parquet keeps dtypes (categories, timestamps) and is the same
+  whether written whole or chunk by chunk
+- Column profiles merged chunk by chunk match a whole-column profile and
+  pandas' own counts
+- Profiling and cleaning on a process pool give the same schema and output
+- Row fingerprints drop exactly the rows drop_duplicates() drops, on all
+  columns or a key subset, in memory and across chunks
+- An incremental refresh cleans only the new rows of a re-sent export
+  (including further copies of rows the snapshot had) and ends up with
+  the same output, schema, warnings and counts as a full run, adding
+  them as a new Parquet part file; sending the same file again adds nothing
+- Rows repeated within a refreshed export are counted as duplicates, as a
+  full run counts them; an export with no data rows refreshes to no change
+- HyperLogLog estimates distinct counts within a few percent
+- FingerprintSet flags repeats within and across batches
+- FingerprintCounts matches rows against an earlier run's copies one for one
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+pytest.importorskip("pydantic")
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "dashboard" / "sales_export.csv"
+
+
+def _process(tmp_path, monkeypatch, client_id, source=None, **config):
+    from execution.dashboard_data_processor import DashboardDataProcessor, ProcessorConfig
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "clients" / client_id).mkdir(parents=True, exist_ok=True)
+    if source is None:
+        source = tmp_path / "sales_export.csv"
+        shutil.copy(FIXTURE, source)
+
+    config.setdefault("write_csv", True)
+    processor = DashboardDataProcessor(ProcessorConfig(client_id=client_id, file_path=source, **config))
+    processor.load()
+    processor.analyze()
+    processor.clean()
+    processor.export()
+    return processor, tmp_path / "clients" / client_id / "data" / "processed"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 7, 1000])
+def test_chunked_output_matches_in_memory(tmp_path, monkeypatch, chunk_size):
+    whole, whole_dir = _process(tmp_path, monkeypatch, "whole")
+    chunked, chunked_dir = _process(tmp_path, monkeypatch, "chunked", chunk_size=chunk_size)
+
+    assert chunked.chunked and not whole.chunked
+    assert (chunked_dir / "cleaned_data.csv").read_bytes() == (whole_dir / "cleaned_data.csv").read_bytes()
+    assert not (chunked_dir / "cleaned_data.csv.partial").exists()
+    assert [s.model_dump() for s in chunked.col_schemas] == [s.model_dump() for s in whole.col_schemas]
+    assert chunked.warnings == whole.warnings
+    assert chunked.errors == whole.errors
+
+
+def test_summary_counts_rows(tmp_path, monkeypatch):
+    processor, out_dir = _process(tmp_path, monkeypatch, "acme", chunk_size=5)
+    summary = json.loads((out_dir / "processing_summary.json").read_text(encoding="utf-8"))
+
+    assert (processor.row_count_raw, processor.row_count_clean, processor.duplicate_rows_removed) == (21, 17, 3)
+    assert "Removed 3 exact duplicate rows" in processor.warnings
+    assert summary["row_count_raw"] == 21 and summary["row_count_clean"] == 17
+    schema = {s.name: s.inferred_type for s in processor.col_schemas}
+    assert schema["Sale Amount"] == "currency" and schema["Order Date"] == "date"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7])
+def test_parquet_is_typed_and_chunk_independent(tmp_path, monkeypatch, chunk_size):
+    pytest.importorskip("pyarrow")
+    _, whole_dir = _process(tmp_path, monkeypatch, "whole", write_csv=False)
+    _, chunked_dir = _process(tmp_path, monkeypatch, "chunked", chunk_size=chunk_size, write_csv=False)
+
+    assert not (whole_dir / "cleaned_data.csv").exists()
+    whole = pd.read_parquet(whole_dir / "cleaned_data.parquet")
+    chunked = pd.read_parquet(chunked_dir / "cleaned_data.parquet")
+    # Category order follows first appearance when chunks are unified
+    pd.testing.assert_frame_equal(chunked, whole, check_categorical=False)
+
+    assert isinstance(whole["region"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(whole["order_date"].dtype)
+    assert whole["sale_amount"].dtype == "float64"
+    assert len(whole) == 17
+
+
+def test_merged_profile_matches_whole_column():
+    from execution.dashboard_data_processor import ColumnProfile
+
+    series = pd.Series([0.0, -0.0, 1.5, None, 1.5, 2.0, None, 3.25, -0.0, 7.0], name="ratio")
+    whole = ColumnProfile.from_series(series, keep_distinct=False)
+    merged = ColumnProfile("ratio")
+    for start in range(0, len(series), 3):
+        merged.merge(ColumnProfile.from_series(series.iloc[start:start + 3]))
+
+    for profile in (whole, merged):
+        assert (profile.rows, profile.null_count) == (10, 2)
+        assert profile.unique_count == series.nunique() == 5
+        assert profile.head == series.dropna().tolist()
+        assert not profile.bool_like
+
+    flags = pd.Series(["Yes", "no", None, "Y", "1"])
+    assert ColumnProfile.from_series(flags).bool_like
+
+
+@pytest.mark.parametrize("chunk_size", [None, 7])
+def test_parallel_workers_match_serial(tmp_path, monkeypatch, chunk_size):
+    serial, serial_dir = _process(tmp_path, monkeypatch, "serial", chunk_size=chunk_size)
+    parallel, parallel_dir = _process(tmp_path, monkeypatch, "parallel", chunk_size=chunk_size, workers=2)
+
+    assert [s.model_dump() for s in parallel.col_schemas] == [s.model_dump() for s in serial.col_schemas]
+    assert (parallel_dir / "cleaned_data.csv").read_bytes() == (serial_dir / "cleaned_data.csv").read_bytes()
+    assert parallel.warnings == serial.warnings
+
+
+def test_row_fingerprints_match_drop_duplicates():
+    from execution.dashboard_data_processor import DashboardDataProcessor, FingerprintSet
+
+    df = pd.DataFrame({
+        "amount": [0.0, -0.0, None, None, 1.5, 1.5, 2.0],
+        "code": pd.Series([1, "1", None, None, "x", "x", "x"], dtype=object),
+        "when": pd.to_datetime(["2026-01-01", "2026-01-01", None, None, "2026-01-02", "2026-01-02", "2026-01-02"]),
+        "region": ["N", "N", None, None, "S", "S", "E"],
+    })
+    for keys in (None, ["region"], ["amount", "when"]):
+        expected = df.drop_duplicates(subset=keys)
+        deduped, dropped = DashboardDataProcessor._drop_duplicates(df, FingerprintSet(), keys)
+        assert dropped == len(df) - len(expected)
+        assert deduped.index.tolist() == expected.index.tolist()
+
+
+@pytest.mark.parametrize("chunk_size", [None, 4])
+def test_dedupe_on_key_columns(tmp_path, monkeypatch, chunk_size):
+    processor, out_dir = _process(tmp_path, monkeypatch, "acme", chunk_size=chunk_size, dedupe_keys=["Order ID"])
+
+    raw = pd.read_csv(FIXTURE)
+    assert processor.duplicate_rows_removed == len(raw) - len(raw.drop_duplicates(subset=["Order ID"]))
+    assert "Removed 3 rows with duplicate order_id" in processor.warnings
+    assert processor.row_count_clean == 17
+
+
+def test_unknown_dedupe_key_is_rejected(tmp_path, monkeypatch):
+    with pytest.raises(ValueError, match="Invoice No"):
+        _process(tmp_path, monkeypatch, "acme", dedupe_keys=["Invoice No"])
+
+
+@pytest.mark.parametrize("chunk_size", [None, 4])
+@pytest.mark.parametrize("first_rows, new_rows", [
+    (16, 5),   # Both blank rows and all three duplicates were in last month's export
+    (9, 12),   # One blank row was; its repeat in this export is a new copy
+])
+def test_incremental_refresh_matches_full_run(tmp_path, monkeypatch, chunk_size, first_rows, new_rows):
+    from execution.dashboard_data_processor import DashboardDataProcessor, ProcessorConfig
+
+    # Last month's export: the first rows of this one
+    lines = FIXTURE.read_text(encoding="utf-8").splitlines(keepends=True)
+    first = tmp_path / "first_export.csv"
+    first.write_text("".join(lines[:first_rows + 1]), encoding="utf-8")
+
+    full, full_dir = _process(tmp_path, monkeypatch, "full", incremental=True, chunk_size=chunk_size)
+    _process(tmp_path, monkeypatch, "acme", source=first, incremental=True, chunk_size=chunk_size)
+
+    cleaned = []
+    real_clean_frame = DashboardDataProcessor._clean_frame
+    monkeypatch.setattr(DashboardDataProcessor, "_clean_frame",
+                        lambda self, df, *args: cleaned.append(len(df)) or real_clean_frame(self, df, *args))
+    out_dir = tmp_path / "clients" / "acme" / "data" / "processed"
+    first_part = out_dir / "cleaned_data.parquet" / "part-00000.parquet"
+    first_bytes = first_part.read_bytes() if first_part.exists() else None
+    refreshed = DashboardDataProcessor(ProcessorConfig(
+        client_id="acme", file_path=FIXTURE, write_csv=True, incremental=True, chunk_size=chunk_size,
+    ))
+    refreshed.run()
+
+    assert cleaned == [new_rows]
+    assert (out_dir / "cleaned_data.csv").read_bytes() == (full_dir / "cleaned_data.csv").read_bytes()
+    assert [s.model_dump() for s in refreshed.col_schemas] == [s.model_dump() for s in full.col_schemas]
+    assert refreshed.warnings == full.warnings
+    assert (refreshed.row_count_raw, refreshed.row_count_clean, refreshed.duplicate_rows_removed) == (21, 17, 3)
+    if (full_dir / "cleaned_data.parquet").exists():
+        pd.testing.assert_frame_equal(pd.read_parquet(out_dir / "cleaned_data.parquet"),
+                                      pd.read_parquet(full_dir / "cleaned_data.parquet"), check_categorical=False)
+        # The new rows went into a part of their own; the snapshot's part was not rewritten
+        assert sorted(p.name for p in (out_dir / "cleaned_data.parquet").iterdir()) == [
+            "part-00000.parquet", "part-00001.parquet"]
+        assert first_part.read_bytes() == first_bytes
+
+    again = DashboardDataProcessor(ProcessorConfig(
+        client_id="acme", file_path=FIXTURE, write_csv=True, incremental=True, chunk_size=chunk_size,
+    ))
+    again.run()
+    assert again.row_count_clean == 17 and cleaned[-1] == 0
+    assert (out_dir / "cleaned_data.csv").read_bytes() == (full_dir / "cleaned_data.csv").read_bytes()
+
+
+@pytest.mark.parametrize("chunk_size", [None, 4])
+def test_refresh_counts_repeats_within_new_export(tmp_path, monkeypatch, chunk_size):
+    from execution.dashboard_data_processor import DashboardDataProcessor, ProcessorConfig
+
+    lines = FIXTURE.read_text(encoding="utf-8").splitlines(keepends=True)
+    first = tmp_path / "first_export.csv"
+    first.write_text("".join(lines[:17]), encoding="utf-8")
+    repeated = tmp_path / "repeated_export.csv"
+    repeated.write_text("".join(lines + lines[-1:]), encoding="utf-8")  # Row 1017 twice, both new
+
+    full, _ = _process(tmp_path, monkeypatch, "full", source=repeated, chunk_size=chunk_size)
+    _process(tmp_path, monkeypatch, "acme", source=first, incremental=True, chunk_size=chunk_size)
+    refreshed = DashboardDataProcessor(ProcessorConfig(
+        client_id="acme", file_path=repeated, write_csv=True, incremental=True, chunk_size=chunk_size,
+    ))
+    refreshed.run()
+
+    assert (refreshed.row_count_raw, refreshed.row_count_clean, refreshed.duplicate_rows_removed) == (22, 17, 4)
+    assert refreshed.warnings == full.warnings
+    assert [s.model_dump() for s in refreshed.col_schemas] == [s.model_dump() for s in full.col_schemas]
+    is_repeat = next(s for s in refreshed.col_schemas if s.name == "Is Repeat")
+    assert is_repeat.null_pct == pytest.approx(4 / 22, abs=1e-4)
+
+    empty = tmp_path / "empty_export.csv"
+    empty.write_text(lines[0], encoding="utf-8")
+    again = DashboardDataProcessor(ProcessorConfig(
+        client_id="acme", file_path=empty, write_csv=True, incremental=True, chunk_size=chunk_size,
+    ))
+    again.run()
+    assert (again.row_count_raw, again.row_count_clean) == (22, 17)
+
+
+def test_hyperloglog_estimate():
+    from execution.dashboard_data_processor import HyperLogLog
+
+    values = pd.Series(np.arange(200_000)).astype(str)
+    hll = HyperLogLog()
+    for half in (values, values.iloc[:50_000]):
+        hll.add_hashes(pd.util.hash_pandas_object(half, index=False).to_numpy())
+    assert hll.count() == pytest.approx(200_000, rel=0.03)
+
+    small = HyperLogLog()
+    small.add_hashes(pd.util.hash_pandas_object(pd.Series(["a", "b", "c"]), index=False).to_numpy())
+    assert small.count() == 3
+
+
+def test_fingerprint_set_across_batches():
+    from execution.dashboard_data_processor import FingerprintSet
+
+    seen = FingerprintSet()
+    assert seen.add(np.array([5, 3, 5, 9], dtype=np.uint64)).tolist() == [True, True, False, True]
+    assert seen.add(np.array([9, 1], dtype=np.uint64)).tolist() == [False, True]
+    for start in range(0, 1000, 100):
+        seen.add(np.arange(start, start + 100, dtype=np.uint64))
+    assert len(seen) == 1000
+    assert not seen.add(np.arange(1000, dtype=np.uint64)).any()
+
+
+def test_fingerprint_counts_take_copy_for_copy():
+    from execution.dashboard_data_processor import FingerprintCounts
+
+    seen = FingerprintCounts.from_array(np.array([7, 5, 7], dtype=np.uint64))
+    assert seen.take(np.array([7, 3, 7, 7], dtype=np.uint64)).tolist() == [True, False, True, False]
+    assert seen.take(np.array([5, 5, 7], dtype=np.uint64)).tolist() == [True, False, False]
+    seen.add(np.array([7, 3, 5], dtype=np.uint64))
+    assert seen.to_array().tolist() == [3, 5, 5, 7, 7, 7]
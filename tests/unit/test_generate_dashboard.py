@@ -0,0 +1,282 @@
+"""
+tests/unit/test_generate_dashboard.py
+Unit tests for execution/generate_dashboard.py
+
+Tests:
+- Web builds read only the measure/dimension/date columns from Parquet to
+  build the aggregate cube, while the preview table keeps every column
+- KPIs, trend and category breakdown from the cube match aggregating the rows
+- Rebuilding from a saved cube reads no rows; new data invalidates it
+- An incremental processor refresh folds its new rows into the saved cube,
+  matching a cube rebuilt from every row
+- The web dashboard's chart data stays within the payload budget: long
+  trends are downsampled with LTTB (ends and spikes kept), breakdowns fold
+  past the top groups into an "Other" bar, and the size is reported
+- PBI builds load every column and export them to data-model.csv
+- --format all loads and reads rows once, matches single-format builds and
+  hard-links the Tableau data file to the PBI one
+- Processed folders with only cleaned_data.csv still load, dates parsed
+"""
+
+from __future__ import annotations
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pydantic")
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "dashboard" / "sales_export.csv"
+
+
+def _processed_client(tmp_path, monkeypatch, write_csv=False):
+    from execution.dashboard_data_processor import DashboardDataProcessor, ProcessorConfig
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "clients" / "acme").mkdir(parents=True)
+    shutil.copy(FIXTURE, tmp_path / "sales_export.csv")
+    DashboardDataProcessor(
+        ProcessorConfig(client_id="acme", file_path=Path("sales_export.csv"), write_csv=write_csv)
+    ).run()
+    return tmp_path / "clients" / "acme" / "data" / "processed"
+
+
+def _generator(fmt, version=1):
+    from execution.generate_dashboard import DashboardConfig, DashboardGenerator
+    return DashboardGenerator(DashboardConfig(client_id="acme", format=fmt, title="Sales", version=version))
+
+
+def test_web_build_reads_rolled_up_columns(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    processed = _processed_client(tmp_path, monkeypatch)
+    read = []
+    real_read_parquet = pd.read_parquet
+    monkeypatch.setattr(pd, "read_parquet", lambda path, columns=None, **kw: (
+        read.append(columns) or real_read_parquet(path, columns=columns, **kw)
+    ))
+
+    generator = _generator("web")
+    outputs = generator.run()
+
+    # order_id is the only id/label column in the fixture
+    assert len(read) == 1 and "order_id" not in read[0] and len(read[0]) == 8
+    assert generator.df is None
+    assert generator.cube["row_count"] == 17
+    assert (processed / "aggregates.json").exists()
+    html = outputs["dashboard"].read_text(encoding="utf-8")
+    assert "first order" in html and "17 records processed" in html
+
+
+def test_cube_matches_row_aggregation(tmp_path, monkeypatch):
+    from execution.dashboard_cube import build_cube
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "clients" / "acme").mkdir(parents=True)
+    df = pd.DataFrame({
+        "sale_amount": [120.5, None, 80.25, 3000.0, 15.0, None, 42.0, 7.5],
+        "units": [1, 2, 3, 4, 5, 6, 7, 8],
+        "order_date": pd.to_datetime(["2026-01-03", "2026-01-20", None, "2026-02-11",
+                                      "2026-04-02", "2026-03-09", "2026-04-30", "2026-02-01"]),
+        "region": pd.Categorical(["N", "S", "N", "E", None, "S", "W", "E"]),
+    })
+    generator = _generator("web")
+    generator.cube = build_cube(df, {}, df, {})
+    roles = generator._get_columns_by_role()
+    assert roles["measures"] == ["sale_amount", "units"] and roles["dimensions"] == ["region"]
+
+    kpis = {kpi["col"]: kpi for kpi in generator._compute_kpis(roles)}
+    assert kpis["sale_amount"]["raw_total"] == df["sale_amount"].sum()
+    assert kpis["sale_amount"]["raw_mean"] == pytest.approx(df["sale_amount"].mean())
+    assert kpis["units"]["sub"] == "Avg: 4.5 | Max: 8.0"
+
+    # March has only a missing sale_amount, so it is not plotted
+    trend = generator._build_trend_data(roles)
+    assert trend["labels"] == ["2026-01", "2026-02", "2026-04"]
+    assert trend["values"] == [120.5, 3007.5, 57.0]
+
+    top = df.groupby("region", observed=True)["sale_amount"].sum().sort_values(ascending=False)
+    category = generator._build_category_data(roles)
+    assert category["labels"] == top.index.astype(str).tolist()
+    assert category["values"] == top.round(2).tolist()
+
+
+def test_saved_cube_skips_row_reads(tmp_path, monkeypatch):
+    from execution.generate_dashboard import DashboardGenerator
+
+    processed = _processed_client(tmp_path, monkeypatch, write_csv=True)
+    shutil.rmtree(processed / "cleaned_data.parquet", ignore_errors=True)
+    first = _generator("web")
+    first.run()
+
+    def no_rows(self, columns=None):
+        raise AssertionError("rows read despite a current cube")
+
+    with monkeypatch.context() as m:
+        m.setattr(DashboardGenerator, "_read_rows", no_rows)
+        second = _generator("web")
+        second.run()
+    assert second.cube == first.cube
+
+    # New processor output (different size) invalidates the cube
+    clean_csv = processed / "cleaned_data.csv"
+    clean_csv.write_text("\n".join(clean_csv.read_text(encoding="utf-8").splitlines()[:6]) + "\n",
+                         encoding="utf-8")
+    third = _generator("web")
+    third.load()
+    assert third.cube["row_count"] == 5
+
+
+def _monthly_export(path, months):
+    rows = ["Order Date,Region,Sale Amount,Units"]
+    for m in months:
+        for day in range(1, 21):
+            region = ("North", "South", "East", "West")[day % 4]
+            rows.append(f"2026-{m:02d}-{day:02d},{region},\"${day * m * 10.5:,.2f}\",{day % 5 or ''}")
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+
+def test_refresh_updates_saved_cube(tmp_path, monkeypatch):
+    from execution.dashboard_cube import build_cube
+    from execution.dashboard_data_processor import DashboardDataProcessor, ProcessorConfig
+    from execution.generate_dashboard import DashboardGenerator
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "clients" / "acme").mkdir(parents=True)
+    export = tmp_path / "export.csv"
+    for months in ([1, 2], [1, 2, 3]):
+        _monthly_export(export, months)
+        DashboardDataProcessor(ProcessorConfig(
+            client_id="acme", file_path=export, write_csv=True, incremental=True,
+        )).run()
+        if months == [1, 2]:
+            _generator("web").run()
+
+    def no_rows(self, columns=None):
+        raise AssertionError("rows read despite a current cube")
+
+    with monkeypatch.context() as m:
+        m.setattr(DashboardGenerator, "_read_rows", no_rows)
+        generator = _generator("web")
+        generator.load()
+    cube = generator.cube
+    rebuilt = build_cube(generator._rows(), generator.schema, generator._rows(), cube["source"])
+
+    assert cube["row_count"] == rebuilt["row_count"] == 60
+    for col, stats in rebuilt["measures"].items():
+        assert cube["measures"][col] == pytest.approx(stats)
+    assert cube["monthly"]["periods"] == rebuilt["monthly"]["periods"] == ["2026-01", "2026-02", "2026-03"]
+    assert cube["monthly"]["sums"] == pytest.approx(rebuilt["monthly"]["sums"])
+    for dim, rollup in rebuilt["by_dimension"].items():
+        merged = cube["by_dimension"][dim]
+        for col, sums in rollup["sums"].items():
+            assert dict(zip(merged["labels"], merged["sums"][col])) == pytest.approx(dict(zip(rollup["labels"], sums)))
+    assert cube["preview_html"] == rebuilt["preview_html"]
+
+
+def test_lttb_keeps_ends_and_spikes():
+    from execution.dashboard_payload import compact_numbers, lttb
+
+    values = [float(i % 7) for i in range(500)]
+    values[123], values[400] = 90.0, -50.0
+    kept = lttb(values, 50)
+    assert len(kept) == 50 and kept == sorted(kept)
+    assert kept[0] == 0 and kept[-1] == 499 and {123, 400} <= set(kept)
+    assert lttb(values[:10], 50) == list(range(10))
+    assert compact_numbers([120.0, 3007.456, float("nan"), -0.004]) == [120, 3007.46, None, -0.0]
+
+
+def test_web_payload_fits_budget(tmp_path, monkeypatch):
+    import json
+    import execution.generate_dashboard as generate_dashboard
+    from execution.dashboard_cube import build_cube
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "clients" / "acme").mkdir(parents=True)
+    months = pd.period_range("1900-01", periods=1500, freq="M")
+    df = pd.DataFrame({
+        "sale_amount": [float(i % 12) * 10 + 5 for i in range(3000)],
+        "order_date": months.repeat(2).to_timestamp(),
+        "region": pd.Categorical([f"R{i % 40}" for i in range(3000)]),
+    })
+    monkeypatch.setattr(generate_dashboard, "PAYLOAD_BUDGET_BYTES", 12_000)
+    generator = _generator("web")
+    generator.cube = build_cube(df, {}, df, {})
+    html = generator.generate_web().read_text(encoding="utf-8")
+
+    data = html.split('id="chartData">', 1)[1].split("</script>", 1)[0]
+    assert len(data.encode("utf-8")) <= 12_000
+    report = generator.web_report
+    assert report["chart_data_bytes"] == len(data.encode("utf-8"))
+    assert report["html_bytes"] == len(html.encode("utf-8"))
+    assert report["trend_periods"] == 1500 and 60 <= report["trend_points"] <= 500
+
+    payload = json.loads(data)
+    category = payload["category"]
+    assert len(category["labels"]) == 11 and category["labels"][-1] == "Other"
+    assert sum(category["values"]) == pytest.approx(df["sale_amount"].sum())
+    assert payload["trend"]["labels"][0] == "1900-01" and payload["trend"]["labels"][-1] == "2024-12"
+
+
+def test_pbi_build_loads_every_column(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    processed = _processed_client(tmp_path, monkeypatch)
+
+    outputs = _generator("pbi").run()
+
+    exported = pd.read_csv(outputs["data_model"])
+    assert list(exported.columns) == pd.read_parquet(processed / "cleaned_data.parquet").columns.tolist()
+    assert len(exported) == 17
+
+
+def test_all_formats_share_one_load(tmp_path, monkeypatch):
+    from execution.generate_dashboard import DashboardGenerator
+
+    _processed_client(tmp_path, monkeypatch, write_csv=True)
+    # PBI and Tableau share file names, so single-format builds get their own versions
+    singles = {fmt: _generator(fmt, version=v).run() for v, fmt in enumerate(("web", "pbi", "tableau"), 1)}
+
+    reads = []
+    real_read_rows = DashboardGenerator._read_rows
+    monkeypatch.setattr(DashboardGenerator, "_read_rows",
+                        lambda self, columns=None: reads.append(columns) or real_read_rows(self, columns))
+    generator = _generator("all", version=9)
+    assert generator.config.formats == ["web", "pbi", "tableau"]
+    outputs = generator.run()
+
+    assert reads == [None]  # Cube reused; full table read once for both exports
+    for fmt, files in singles.items():
+        for key, path in files.items():
+            built = outputs[f"{fmt}/{key}"]
+            assert built.parent.name == fmt
+            assert built.read_bytes() == path.read_bytes()
+    model, source = outputs["pbi/data_model"].stat(), outputs["tableau/data_source"].stat()
+    assert (model.st_ino, model.st_dev) == (source.st_ino, source.st_dev)
+
+
+def test_format_list_is_validated(tmp_path, monkeypatch):
+    from execution.generate_dashboard import DashboardConfig
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "clients" / "acme").mkdir(parents=True)
+    assert DashboardConfig(client_id="acme", format="Tableau, web", title="x").format == "web,tableau"
+    with pytest.raises(ValueError, match="all"):
+        DashboardConfig(client_id="acme", format="web,pdf", title="x")
+
+
+def test_csv_only_output_still_loads(tmp_path, monkeypatch):
+    processed = _processed_client(tmp_path, monkeypatch, write_csv=True)
+    shutil.rmtree(processed / "cleaned_data.parquet", ignore_errors=True)
+
+    generator = _generator("web")
+    generator.load()
+
+    assert generator.cube["kinds"]["order_date"] == "datetime"
+    assert generator.cube["row_count"] == 17
+    df = generator._rows()
+    assert len(df.columns) == 9
+    assert pd.api.types.is_datetime64_any_dtype(df["order_date"].dtype)
@@ -0,0 +1,240 @@
+"""
+tests/unit/test_google_maps_scraper.py
+Unit tests for execution/google_maps_scraper.py
+
+Tests:
+- Place Details are fetched concurrently and once per place_id across niches
+- Cached details are reused by later runs; failed lookups are not cached
+- A shorter --details-ttl-days applies to details cached with a longer one
+- scrape_niche keeps the first keyword that found a place
+- Geocode and paginated text searches replay offline from recorded responses
+  and from the cache, skipping page-token sleeps
+- A shorter --search-ttl-days (or geocode TTL) applies to responses cached
+  with a longer one
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pytest.importorskip("requests")
+
+RECORDED = Path(__file__).resolve().parents[1] / "fixtures" / "google_places" / "recorded_responses.json"
+
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class _FakeSession:
+    """Answers Place Details requests; place_ids starting with 'bad' fail."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        pid = params["place_id"]
+        with self._lock:
+            self.calls.append(pid)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        if pid.startswith("bad"):
+            return _FakeResponse({"status": "NOT_FOUND"})
+        return _FakeResponse({"status": "OK", "result": {
+            "place_id": pid, "name": pid.upper(), "business_status": "OPERATIONAL",
+            "website": "https://x.com", "user_ratings_total": 5,
+        }})
+
+
+def _cache(tmp_path):
+    from execution.shared.api_cache import ApiCache, CachePolicy
+    return ApiCache("google_places", policies={"place_details": CachePolicy(ttl=3600)},
+                    db_path=tmp_path / "cache.sqlite")
+
+
+def test_enrich_is_concurrent_and_coalesced():
+    from execution.google_maps_scraper import PlaceDetailsEnricher
+    session = _FakeSession(delay=0.05)
+    enricher = PlaceDetailsEnricher("key", workers=4, session=session)
+
+    first = enricher.enrich([f"p{i}" for i in range(8)] + ["p0"])
+    second = enricher.enrich(["p1", "p2", "p8"])  # another niche
+
+    assert len(first) == 8 and second["p8"]["name"] == "P8"
+    assert sorted(session.calls) == sorted(f"p{i}" for i in range(9))
+    assert session.peak == 4
+    assert enricher.stats["coalesced"] == 2
+
+
+def test_details_cache_persists_and_skips_failures(tmp_path):
+    from execution.google_maps_scraper import PlaceDetailsEnricher
+    PlaceDetailsEnricher("key", cache=_cache(tmp_path), session=_FakeSession()).enrich(["p1", "bad1"])
+
+    session = _FakeSession()
+    enricher = PlaceDetailsEnricher("key", cache=_cache(tmp_path), session=session)
+    details = enricher.enrich(["p1", "bad1", "p2"])
+
+    assert sorted(session.calls) == ["bad1", "p2"]
+    assert details["p1"]["name"] == "P1" and details["bad1"] == {}
+    assert enricher.stats["cache_hits"] == 1
+
+
+def test_shorter_details_ttl_refetches(tmp_path):
+    import execution.google_maps_scraper as gms
+    from execution.shared.api_cache import DAY
+    db_path = tmp_path / "cache.sqlite"
+
+    def enrich(ttl_days):
+        cache = gms.places_cache(details_ttl_days=ttl_days, db_path=db_path)
+        session = _FakeSession()
+        details = gms.PlaceDetailsEnricher("key", cache=cache, session=session).enrich(["p1"])
+        cache.close()
+        return session.calls, details
+
+    enrich(30)
+    time.sleep(0.1)
+    assert enrich(30)[0] == []
+    calls, details = enrich(0.05 / DAY)  # Written under 30 days, now older than the TTL
+    assert calls == ["p1"] and details["p1"]["name"] == "P1"
+
+
+def test_scrape_niche_attributes_first_keyword(tmp_path, monkeypatch):
+    import execution.google_maps_scraper as gms
+    results = {"med spa": ["p1", "p2"], "botox": ["p2", "bad1", "p3"]}
+    monkeypatch.setattr(gms, "search_places", lambda kw, *a, **kw_: [
+        {"place_id": pid} for pid in results[kw.split(" near ")[0]]
+    ])
+    niche = {"id": "med_spa", "label": "Med Spa", "google_maps_keywords": ["med spa", "botox"]}
+    config = {"geography": {"anchor_zip": "30022"}, "thresholds": {"hot_immediate_contact": 70}}
+
+    enricher = gms.PlaceDetailsEnricher("key", session=_FakeSession())
+    rows = gms.scrape_niche(niche, config, 0.0, 0.0, 1000, "key", tmp_path, enricher=enricher)
+
+    assert {r["place_id"]: r["search_keyword"] for r in rows} == {
+        "p1": "med spa", "p2": "med spa", "p3": "botox",
+    }
+    assert len(list(tmp_path.glob("leads_med_spa_*.csv"))) == 1
+
+
+class _ReplaySession:
+    """Serves recorded Google Maps API responses; never touches the network."""
+
+    def __init__(self):
+        self.recorded = json.loads(RECORDED.read_text())
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        if "geocode" in url:
+            self.calls.append("geocode")
+            return _FakeResponse(self.recorded["geocode"])
+        if "textsearch" in url:
+            self.calls.append("textsearch")
+            page = 1 if "pagetoken" in params else 0
+            return _FakeResponse(self.recorded["textsearch"][page])
+        self.calls.append("details")
+        return _FakeResponse(self.recorded["details"][params["place_id"]])
+
+
+def test_offline_run_from_recorded_responses_and_cache(tmp_path, monkeypatch):
+    import execution.google_maps_scraper as gms
+    sleeps = []
+    monkeypatch.setattr(gms.time, "sleep", sleeps.append)
+    cache = gms.places_cache(db_path=tmp_path / "cache.sqlite")
+
+    def run(session):
+        coords = gms.zip_to_latlng("30022", "key", session=session, cache=cache)
+        places = gms.search_places("med spa near 30022", *coords, 40000, "key",
+                                   session=session, cache=cache)
+        return coords, places
+
+    live = _ReplaySession()
+    coords, places = run(live)
+    assert coords == (34.0297, -84.2436)
+    assert [p["place_id"] for p in places] == ["ChIJ-med-spa-1", "ChIJ-med-spa-2", "ChIJ-med-spa-3"]
+    assert live.calls == ["geocode", "textsearch", "textsearch"] and sleeps == [2]
+
+    replay = _ReplaySession()
+    assert run(replay) == (coords, places)
+    assert replay.calls == [] and sleeps == [2]
+    # One geocode plus a two-page search saved
+    assert cache.stats["saved_usd"] == pytest.approx(gms.GEOCODE_COST_USD + 2 * gms.TEXT_SEARCH_COST_USD)
+
+
+def test_shorter_search_ttl_refetches(tmp_path, monkeypatch):
+    import execution.google_maps_scraper as gms
+    from execution.shared.api_cache import DAY
+    sleep = time.sleep
+    monkeypatch.setattr(gms.time, "sleep", lambda s: None)  # Page-token delays
+    db_path = tmp_path / "cache.sqlite"
+
+    def run(search_ttl_days):
+        cache = gms.places_cache(search_ttl_days=search_ttl_days, db_path=db_path)
+        session = _ReplaySession()
+        coords = gms.zip_to_latlng("30022", "key", session=session, cache=cache)
+        gms.search_places("med spa near 30022", *coords, 40000, "key", session=session, cache=cache)
+        cache.close()
+        return session.calls
+
+    assert run(14) == ["geocode", "textsearch", "textsearch"]
+    sleep(0.1)
+    assert run(14) == []
+    # Searches written under 14 days are now older than the TTL; the geocode is still fresh
+    assert run(0.05 / DAY) == ["textsearch", "textsearch"]
+    monkeypatch.setattr(gms, "GEOCODE_TTL_DAYS", 0.05 / DAY)
+    assert run(14) == ["geocode"]
+
+
+def test_failed_search_is_not_cached(tmp_path):
+    import execution.google_maps_scraper as gms
+    cache = gms.places_cache(db_path=tmp_path / "cache.sqlite")
+    session = _ReplaySession()
+    session.recorded["textsearch"][0] = {"status": "OVER_QUERY_LIMIT"}
+
+    assert gms.search_places("botox", 0.0, 0.0, 1000, "key", session=session, cache=cache) == []
+    assert cache.get("text_search", {"query": "botox", "location": "0.0,0.0",
+                                     "radius": 1000, "type": "establishment"}) is None
+
+
+def test_scrape_niche_rerun_is_served_from_cache(tmp_path, monkeypatch):
+    import execution.google_maps_scraper as gms
+    monkeypatch.setattr(gms.time, "sleep", lambda s: None)
+    cache = gms.places_cache(db_path=tmp_path / "cache.sqlite")
+    niche = {"id": "med_spa", "label": "Med Spa", "google_maps_keywords": ["med spa"]}
+    config = {"geography": {"anchor_zip": "30022"}, "thresholds": {"hot_immediate_contact": 70}}
+
+    def run():
+        session = _ReplaySession()
+        enricher = gms.PlaceDetailsEnricher("key", cache=cache, session=session)
+        rows = gms.scrape_niche(niche, config, 34.0297, -84.2436, 40000, "key",
+                                tmp_path / "out", enricher=enricher)
+        return rows, session.calls
+
+    rows, calls = run()
+    assert calls.count("details") == 3
+    assert [r["business_name"] for r in rows] == ["Glow Med Spa", "Radiance Aesthetics"]
+
+    rerun_rows, rerun_calls = run()
+    assert rerun_calls == []
+    assert [r["place_id"] for r in rerun_rows] == [r["place_id"] for r in rows]
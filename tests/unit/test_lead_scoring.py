@@ -0,0 +1,91 @@
+"""
+tests/unit/test_lead_scoring.py
+Unit tests for execution/lead_scoring.py
+
+Tests:
+- score_places matches google_maps_scraper.score_lead row for row
+- score_research_leads matches LeadResearchOrchestrator._calculate_lead_score
+- Section caps come from the config's scoring_model weights
+- Target titles compile into one case-sensitive substring regex
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+pd = pytest.importorskip("pandas")
+
+LOCAL_CONFIG = ROOT / "config" / "local_lead_gen_config.json"
+TEST_CONFIG = ROOT / "config" / "test_config.json"
+
+
+def _random_details(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    details = []
+    for i in range(n):
+        detail = {"place_id": f"p{i}"}
+        if rng.random() < 0.7:
+            detail["website"] = rng.choice(["https://x.com", ""])
+        if rng.random() < 0.7:
+            detail["formatted_phone_number"] = "(770) 555-0100"
+        if rng.random() < 0.9:
+            detail["business_status"] = rng.choice(["OPERATIONAL", "CLOSED_TEMPORARILY"])
+        if rng.random() < 0.8:
+            detail["user_ratings_total"] = rng.choice([0, 5, 19, 20, 49, 50, 99, 100, 800])
+        if rng.random() < 0.8:
+            detail["rating"] = rng.choice([0, 1.5, 3.99, 4.0, 4.8])
+        details.append(detail)
+    return details
+
+
+def test_score_places_matches_score_lead():
+    from execution.google_maps_scraper import score_lead
+    from execution.lead_scoring import ScoringModel, score_places
+
+    config = json.loads(LOCAL_CONFIG.read_text())
+    details = _random_details(500)
+    scores = score_places(pd.DataFrame(details), ScoringModel.from_config(config))
+    assert scores.tolist() == [score_lead(d, config) for d in details]
+
+
+def test_caps_follow_scoring_model_weights():
+    from execution.google_maps_scraper import score_lead
+    from execution.lead_scoring import ScoringModel, score_places
+
+    config = {"scoring_model": {"icp_fit": {"weight": 10}, "reachability": {"weight": 5}}}
+    detail = {"website": "https://x.com", "formatted_phone_number": "1", "business_status": "OPERATIONAL",
+              "user_ratings_total": 10}
+    model = ScoringModel.from_config(config)
+    assert (model.icp_cap, model.signal_cap, model.reach_cap) == (10, 40, 5)
+    assert score_places(pd.DataFrame([detail]), model).tolist() == [score_lead(detail, config)] == [40]
+
+
+def test_score_research_leads_matches_orchestrator():
+    from execution.lead_research_orchestrator import LeadResearchOrchestrator
+    from execution.lead_scoring import ScoringModel, score_research_leads
+
+    orchestrator = LeadResearchOrchestrator("test", str(TEST_CONFIG))
+    leads = orchestrator._generate_mock_leads(40)
+    scores = score_research_leads(pd.DataFrame(leads), ScoringModel.from_config(orchestrator.config))
+
+    for i, lead in enumerate(leads):
+        expected = orchestrator._calculate_lead_score(lead)
+        assert scores["total"][i] == expected["total"]
+        assert {k: scores[k][i] for k in expected["breakdown"]} == expected["breakdown"]
+
+
+def test_title_pattern_is_substring_and_case_sensitive():
+    from execution.lead_scoring import ScoringModel
+
+    model = ScoringModel.from_config({"icp": {"target_titles": ["VP Sales", "Founder", "C++ Lead"]}})
+    titles = pd.Series(["Senior VP Sales East", "Co-Founder", "founder", "C++ Lead", None])
+    assert model.title_matches(titles).tolist() == [True, True, False, True, False]
+    assert not ScoringModel.from_config({}).title_matches(titles).any()
@@ -0,0 +1,202 @@
+"""
+tests/unit/test_log_store.py
+Unit tests for execution/shared/log_store.py
+
+Tests:
+- Segments rotate at UTC midnight and past the size limit, and closed
+  segments are gzipped one member per hour (zcat-readable)
+- Window and level queries return exactly what a full scan filters to,
+  decompressing only the hours they need and not opening the indexes of
+  segments from other days
+- An open segment is read through its index plus the unindexed tail
+- Older logs/<date>.log files are still read; anneal.log is not
+- A forked child writes its own segment and leaves the parent's alone
+- Segments older than LOG_RETENTION_DAYS are pruned as new ones open
+- check_health.check_recent_errors counts today's errors from the store
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add repo root to path so 'execution' is importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+DAY0 = datetime(2026, 10, 15, 21, 30, tzinfo=timezone.utc).timestamp()
+LEVELS = ["INFO", "INFO", "WARNING", "INFO", "ERROR", "DEBUG", "INFO", "CRITICAL"]
+
+
+class _Formatter(logging.Formatter):
+    def format(self, record):
+        ts = datetime.fromtimestamp(record.created, timezone.utc).isoformat()
+        return json.dumps({"ts": ts, "level": record.levelname, "msg": record.getMessage()})
+
+
+def _store(directory, max_bytes=None):
+    from execution.shared.log_store import LogStoreHandler
+
+    handler = LogStoreHandler(directory, max_bytes=max_bytes)
+    handler.setFormatter(_Formatter())
+    return handler
+
+
+def _emit(handler, n, start=DAY0, step=97.0):
+    """n records every `step` seconds from 21:30 UTC, across midnight."""
+    for i in range(n):
+        level = LEVELS[i % len(LEVELS)]
+        handler.handle(logging.makeLogRecord({
+            "msg": f"record {i}", "levelname": level, "levelno": getattr(logging, level),
+            "created": start + i * step,
+        }))
+
+
+def test_rotation_and_compression(tmp_path):
+    handler = _store(tmp_path, max_bytes=20_000)
+    _emit(handler, 400)  # ~10.8 hours, ~100 bytes a record
+    handler.close()
+
+    assert not list(tmp_path.glob("*.log"))
+    segments = sorted(tmp_path.glob("*.log.gz"))
+    assert len(segments) >= 3
+    assert {p.name[:10] for p in segments} == {"2026-10-15", "2026-10-16"}
+
+    lines = [json.loads(line) for p in segments for line in gzip.open(p, "rt", encoding="utf-8")]
+    assert [e["msg"] for e in lines] == [f"record {i}" for i in range(400)]
+
+    index = json.loads((tmp_path / segments[0].name.replace(".log.gz", ".idx.json")).read_text())
+    assert index["compressed"] and index["segment"] == segments[0].name
+    assert [b["hour"] for b in index["hours"]][:3] == ["2026-10-15T21", "2026-10-15T22", "2026-10-15T23"]
+    assert sum(b["counts"].get("ERROR", 0) for b in index["hours"]) == len(index["levels"]["ERROR"])
+
+
+def test_queries_match_full_scan(tmp_path, monkeypatch):
+    import execution.shared.log_store as log_store
+
+    handler = _store(tmp_path, max_bytes=20_000)
+    _emit(handler, 400)
+    handler.close()
+    everything = list(log_store.iter_records(tmp_path))
+    assert len(everything) == 400
+
+    since = datetime(2026, 10, 16, 1, 15, tzinfo=timezone.utc)
+    until = since + timedelta(hours=2)
+    for levels in (None, ["ERROR", "CRITICAL"], ["info"]):
+        wanted = {lvl.upper() for lvl in levels} if levels else None
+        expected = [
+            e for e in everything
+            if since <= datetime.fromisoformat(e["ts"]) < until and (wanted is None or e["level"] in wanted)
+        ]
+        assert list(log_store.iter_records(tmp_path, since, until, levels)) == expected
+
+    decompressed, loaded = [], []
+    real_read_block, real_load_index = log_store._read_block, log_store._load_index
+    monkeypatch.setattr(log_store, "_read_block",
+                        lambda f, block, compressed: decompressed.append(block["hour"]) or
+                        real_read_block(f, block, compressed))
+    monkeypatch.setattr(log_store, "_load_index",
+                        lambda path: loaded.append(path.name) or real_load_index(path))
+    errors = list(log_store.iter_records(tmp_path, since, until, ["ERROR"]))
+    assert errors and set(decompressed) <= {"2026-10-16T01", "2026-10-16T02", "2026-10-16T03"}
+    assert loaded and all(name.startswith("2026-10-16") for name in loaded)
+
+
+def test_open_segment_reads_unindexed_tail(tmp_path):
+    from execution.shared.log_store import iter_records
+
+    handler = _store(tmp_path)
+    _emit(handler, 30, step=1.0)  # All in one hour: the index is written once, at the first record
+    try:
+        (segment,) = tmp_path.glob("*.log")
+        index = json.loads(next(tmp_path.glob("*.idx.json")).read_text())
+        assert index["bytes"] < segment.stat().st_size
+
+        assert len(list(iter_records(tmp_path))) == 30
+        assert [e["msg"] for e in iter_records(tmp_path, levels=["ERROR", "CRITICAL"])] == [
+            "record 4", "record 7", "record 12", "record 15", "record 20", "record 23", "record 28",
+        ]
+    finally:
+        handler.close()
+
+
+def test_reads_legacy_day_files(tmp_path):
+    from execution.shared.log_store import iter_records
+
+    legacy = [{"ts": "2026-10-14T10:00:00+00:00", "level": "ERROR", "msg": "old failure"},
+              {"ts": "2026-10-14T10:05:00+00:00", "level": "INFO", "msg": "old info"}]
+    (tmp_path / "2026-10-14.log").write_text("".join(json.dumps(e) + "\n" for e in legacy), encoding="utf-8")
+    (tmp_path / "anneal.log").write_text(json.dumps(legacy[0]) + "\n", encoding="utf-8")
+
+    assert list(iter_records(tmp_path, levels=["ERROR"])) == legacy[:1]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_starts_own_segment(tmp_path):
+    from execution.shared.log_store import iter_records
+
+    handler = _store(tmp_path)
+    _emit(handler, 3, step=1.0)
+    pid = os.fork()
+    if pid == 0:
+        try:
+            _emit(handler, 2, start=DAY0 + 10, step=1.0)
+            handler.close()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    _emit(handler, 2, start=DAY0 + 20, step=1.0)
+    handler.close()
+
+    indexes = [json.loads(p.read_text()) for p in sorted(tmp_path.glob("*.idx.json"))]
+    assert sorted(index["pid"] for index in indexes) == sorted([os.getpid(), pid])
+    assert all(index["compressed"] for index in indexes)
+    by_pid = {index["pid"]: index["segment"] for index in indexes}
+    parent_lines = gzip.open(tmp_path / by_pid[os.getpid()], "rt", encoding="utf-8").read().splitlines()
+    assert [json.loads(line)["msg"] for line in parent_lines] == [
+        "record 0", "record 1", "record 2", "record 0", "record 1"]
+    assert len(list(iter_records(tmp_path))) == 7
+
+
+def test_old_segments_are_pruned(tmp_path, monkeypatch):
+    from execution.shared.log_store import iter_records
+
+    monkeypatch.setenv("LOG_RETENTION_DAYS", "7")
+    (tmp_path / "2026-09-01.log").write_text("", encoding="utf-8")
+    for days in (0, 5, 9):
+        handler = _store(tmp_path)
+        _emit(handler, 2, start=DAY0 + days * 86400, step=1.0)
+        handler.close()
+    assert len(list(tmp_path.glob("*.log.gz"))) == 2  # Day 0 went when day 9 began
+
+    handler = _store(tmp_path)
+    _emit(handler, 1, start=DAY0 + 9 * 86400 + 60, step=1.0)
+    handler.close()
+    days = sorted(p.name[:10] for p in tmp_path.glob("*.log.gz"))
+    assert days == ["2026-10-20", "2026-10-24", "2026-10-24"]
+    assert sorted(p.name[:10] for p in tmp_path.glob("*.idx.json")) == days
+    assert (tmp_path / "2026-09-01.log").exists()
+    assert len(list(iter_records(tmp_path))) == 5
+
+
+def test_check_recent_errors_uses_store(tmp_path, monkeypatch):
+    import scripts.check_health as check_health
+
+    monkeypatch.setattr(check_health, "LOGS_DIR", tmp_path)
+    assert check_health.check_recent_errors()[0].level == check_health.OK
+
+    handler = _store(tmp_path)
+    now = datetime.now(timezone.utc).timestamp()
+    _emit(handler, 16, start=now - 15, step=1.0)
+    handler.close()
+
+    (check,) = check_health.check_recent_errors()
+    assert check.level == check_health.WARN
+    assert check.message == "4 ERROR/CRITICAL entries today"
+    assert check.detail.endswith("record 15")
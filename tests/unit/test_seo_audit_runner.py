@@ -0,0 +1,64 @@
+"""
+tests/unit/test_seo_audit_runner.py
+Unit tests for execution/seo_audit_runner.py
+
+Tests:
+- Audit modules run concurrently (latency ~ slowest module, not the sum)
+- run_audit() refuses to run inside a running event loop, pointing at
+  run_audit_async()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+httpx = pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    monkeypatch.setenv("DATAFORSEO_USERNAME", "test@example.com")
+    monkeypatch.setenv("DATAFORSEO_PASSWORD", "test_password")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    import execution.seo_audit_runner as runner
+    return runner
+
+
+def _ok(result):
+    return httpx.Response(200, json={"tasks": [{"status_code": 20000, "result": result}]})
+
+
+def test_modules_run_concurrently(runner):
+    async def handler(request):
+        await asyncio.sleep(0.2)
+        return _ok([{"items": [{}]}])
+
+    async def go():
+        client = runner.AsyncDataForSEOClient(transport=httpx.MockTransport(handler))
+        async with client:
+            return await runner.run_audit_async(
+                "example.com", ["widgets"], ["on_page", "speed", "backlinks", "keywords"], client=client
+            )
+
+    start = time.perf_counter()
+    report = asyncio.run(go())
+    elapsed = time.perf_counter() - start
+
+    assert report["status"] == "success"
+    assert report["data"]["domain"] == "https://example.com"
+    assert elapsed < 0.6  # four 0.2s modules, not 0.8s in sequence
+
+
+def test_run_audit_inside_running_loop(runner):
+    async def go():
+        with pytest.raises(RuntimeError, match="run_audit_async"):
+            runner.run_audit("example.com")
+
+    asyncio.run(go())
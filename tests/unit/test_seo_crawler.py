@@ -0,0 +1,280 @@
+"""
+tests/unit/test_seo_crawler.py
+Unit tests for execution/seo_crawler.py
+
+Tests:
+- ResponseCache stores validated responses and sends conditional headers
+- A 304 is served from the cached body
+- LRU eviction keeps the cache under max_bytes
+- A blob is deleted once no URL refers to it; concurrent stores of one body
+  don't collide on a temp file
+- A 304 whose body has gone missing is fetched again without validators
+- A cached parse is only reused under the key it was stored with
+- CrawlEngine keeps at most `concurrency` requests in flight, paces each
+  host with its own token bucket, fetches every URL once however often it
+  is linked, and stops at max_pages
+- CrawlEngine keeps www/non-www and http/https forms of the start host in
+  scope, fetching a page once whichever of them links to it, and drops
+  other hosts and paths outside the start path
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+requests = pytest.importorskip("requests")
+
+
+def _response(status: int, body: bytes = b"", headers: dict | None = None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body
+    resp.headers.update(headers or {})
+    resp.encoding = "utf-8"
+    return resp
+
+
+class _FakeSession:
+    """Replays queued responses and records request headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent_headers.append(headers or {})
+        return self.responses.pop(0)
+
+
+class _SiteSession:
+    """
+    Serves a link graph (url -> linked urls, as JSON) and records every
+    request, its start time per host and the peak number in flight.
+    """
+
+    def __init__(self, links, delay=0.0):
+        self.links = links
+        self.delay = delay
+        self.requested = []
+        self.started = {}
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, **kwargs):
+        with self._lock:
+            self.requested.append(url)
+            self.started.setdefault(url.split("/")[2], []).append(time.monotonic())
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return _response(200, json.dumps(self.links.get(url, [])).encode())
+
+
+def _handle(url, response):
+    return {"url": url}, json.loads(response.content)
+
+
+class TestResponseCache:
+    def test_uncached_url_has_no_conditional_headers(self, tmp_path):
+        from execution.seo_crawler import ResponseCache
+        assert ResponseCache(tmp_path).conditional_headers("https://x.com/") == {}
+
+    def test_response_without_validators_not_stored(self, tmp_path):
+        from execution.seo_crawler import ResponseCache
+        cache = ResponseCache(tmp_path)
+        cache.store("https://x.com/", _response(200, b"<html></html>"))
+        assert cache.conditional_headers("https://x.com/") == {}
+
+    def test_revalidation_roundtrip(self, tmp_path):
+        from execution.seo_crawler import ResponseCache, cached_get
+        cache = ResponseCache(tmp_path)
+        session = _FakeSession(
+            _response(200, b"<title>Hi</title>", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+            _response(304, headers={"ETag": '"v1"'}),
+        )
+
+        first = cached_get(session, "https://x.com/", cache)
+        assert not getattr(first, "from_cache", False)
+        cache.store_parsed("https://x.com/", [{"title": "Hi"}, []])
+        cache.save()
+
+        # A fresh instance reads the persisted index
+        cache = ResponseCache(tmp_path)
+        second = cached_get(session, "https://x.com/", cache)
+        assert session.sent_headers[1]["If-None-Match"] == '"v1"'
+        assert "If-Modified-Since" in session.sent_headers[1]
+        assert second.status_code == 200
+        assert second.from_cache is True
+        assert second.text == "<title>Hi</title>"
+        assert cache.parsed("https://x.com/") == [{"title": "Hi"}, []]
+        assert cache.stats["hits"] == 1
+
+    def test_lru_eviction(self, tmp_path):
+        from execution.seo_crawler import ResponseCache
+        cache = ResponseCache(tmp_path, max_bytes=250)
+        for i in range(3):
+            cache.store(f"https://x.com/{i}", _response(200, bytes([i]) * 100, {"ETag": f'"{i}"'}))
+            time.sleep(0.02)  # distinct last_used stamps on coarse clocks
+        # Touch page 0 so page 1 is the least recently used
+        cache.revalidated("https://x.com/0", _response(304))
+        cache.save()
+
+        assert cache.conditional_headers("https://x.com/1") == {}
+        assert cache.conditional_headers("https://x.com/0")
+        assert cache.conditional_headers("https://x.com/2")
+        assert len(list(cache.blobs_dir.iterdir())) == 2
+
+    def test_replaced_body_releases_blob(self, tmp_path):
+        from execution.seo_crawler import ResponseCache
+        cache = ResponseCache(tmp_path)
+        cache.store("https://x.com/a", _response(200, b"shared", {"ETag": '"1"'}))
+        cache.store("https://x.com/b", _response(200, b"shared", {"ETag": '"1"'}))
+        cache.store("https://x.com/a", _response(200, b"new a", {"ETag": '"2"'}))
+        assert len(list(cache.blobs_dir.iterdir())) == 2  # "shared" is still used by b
+
+        cache.store("https://x.com/b", _response(200, b"new b", {"ETag": '"2"'}))
+        cache.save()
+        # A fresh instance counts references from the saved index
+        cache = ResponseCache(tmp_path)
+        cache.store("https://x.com/a", _response(200, b"new b", {"ETag": '"3"'}))
+        assert sorted(p.read_bytes() for p in cache.blobs_dir.iterdir()) == [b"new b"]
+
+    def test_concurrent_stores_of_one_body(self, tmp_path):
+        from execution.seo_crawler import ResponseCache
+        cache = ResponseCache(tmp_path)
+        barrier = threading.Barrier(16)
+        errors = []
+
+        def store(i):
+            barrier.wait()
+            try:
+                cache.store(f"https://x.com/{i}", _response(200, b"same page" * 1000, {"ETag": '"1"'}))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=store, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert [p.read_bytes() for p in cache.blobs_dir.iterdir()] == [b"same page" * 1000]
+
+    def test_304_with_missing_blob_refetches(self, tmp_path):
+        from execution.seo_crawler import ResponseCache, cached_get
+        cache = ResponseCache(tmp_path)
+        cache.store("https://x.com/", _response(200, b"old", {"ETag": '"v1"'}))
+        for blob in cache.blobs_dir.iterdir():
+            blob.unlink()
+        session = _FakeSession(_response(304, headers={"ETag": '"v1"'}),
+                               _response(200, b"fresh", {"ETag": '"v2"'}))
+
+        response = cached_get(session, "https://x.com/", cache, headers={"Accept": "text/html"})
+        assert response.status_code == 200 and response.content == b"fresh"
+        assert session.sent_headers == [{"Accept": "text/html", "If-None-Match": '"v1"'},
+                                        {"Accept": "text/html"}]
+        assert cache.conditional_headers("https://x.com/") == {"If-None-Match": '"v2"'}
+
+    def test_parsed_is_keyed(self, tmp_path):
+        from execution.seo_crawler import ResponseCache
+        cache = ResponseCache(tmp_path)
+        cache.store("https://x.com/", _response(200, b"page", {"ETag": '"1"'}))
+        cache.store_parsed("https://x.com/", [{"page_score": 80}, []], key="v1")
+        assert cache.parsed("https://x.com/", "v1") == [{"page_score": 80}, []]
+        assert cache.parsed("https://x.com/", "v2") is None
+        assert cache.parsed("https://x.com/") is None
+
+
+class TestCrawlEngine:
+    def test_concurrency_is_bounded(self):
+        from execution.seo_crawler import CrawlEngine
+        pages = [f"https://x.com/p{i}" for i in range(20)]
+        session = _SiteSession({"https://x.com": pages}, delay=0.05)
+        engine = CrawlEngine("https://x.com", concurrency=3, per_host_rps=1000, session=session)
+
+        records = engine.crawl(_handle, max_pages=100)
+        assert len(records) == 21
+        assert session.peak == 3
+
+    def test_each_host_is_paced(self):
+        from execution.seo_crawler import CrawlEngine
+        pages = [f"https://x.com/p{i}" for i in range(10)]
+        session = _SiteSession({})
+        engine = CrawlEngine("https://x.com", concurrency=10, per_host_rps=5, session=session)
+
+        engine.crawl(_handle, seeds=pages, follow_links=False)
+        # A burst of 5, then 5 a second
+        started = sorted(session.started["x.com"])
+        assert started[-1] - started[0] >= 0.9
+        assert engine.stats["throttle_wait_s"] > 0
+
+        # Another host has a bucket of its own
+        start = time.monotonic()
+        engine.fetch("https://y.com/")
+        assert time.monotonic() - start < 0.1
+
+    def test_frontier_fetches_each_url_once(self):
+        from execution.seo_crawler import CrawlEngine
+        links = {
+            "https://x.com": ["https://x.com/a", "https://x.com/b", "https://x.com/a"],
+            "https://x.com/a": ["https://x.com", "https://x.com/b", "https://x.com/a"],
+            "https://x.com/b": ["https://x.com/a", "https://x.com/c", "https://other.com/"],
+            "https://x.com/c": ["https://x.com/b"],
+        }
+        session = _SiteSession(links, delay=0.01)
+        engine = CrawlEngine("https://x.com", concurrency=4, per_host_rps=1000, session=session)
+
+        records = engine.crawl(_handle, max_pages=100)
+        assert sorted(session.requested) == sorted(links)
+        assert sorted(r["url"] for r in records) == sorted(links)
+
+    def test_stops_at_max_pages(self):
+        from execution.seo_crawler import CrawlEngine
+        pages = [f"https://x.com/p{i}" for i in range(30)]
+        session = _SiteSession({"https://x.com": pages}, delay=0.01)
+        engine = CrawlEngine("https://x.com", concurrency=4, per_host_rps=1000, session=session)
+
+        records = engine.crawl(_handle, max_pages=7)
+        assert len(records) == 7
+        assert len(session.requested) == 7
+
+    def test_scope_matches_normalised_host(self):
+        from execution.seo_crawler import CrawlEngine, site_key
+        assert site_key("http://WWW.X.com:443/a") == site_key("https://x.com") == "x.com"
+
+        links = {
+            "https://x.com/shop": ["http://www.x.com/shop/a", "https://X.com:443/shop/b",
+                                   "https://x.com/blog", "https://other.com/shop", "https://shop.x.com/shop"],
+        }
+        session = _SiteSession(links)
+        engine = CrawlEngine("https://x.com/shop", concurrency=2, per_host_rps=1000, session=session)
+
+        engine.crawl(_handle, max_pages=100)
+        assert sorted(session.requested) == ["http://www.x.com/shop/a", "https://X.com:443/shop/b",
+                                             "https://x.com/shop"]
+
+    def test_page_linked_by_several_host_forms_is_fetched_once(self):
+        from execution.seo_crawler import CrawlEngine
+        links = {
+            "https://x.com": ["https://www.x.com/a", "https://x.com/a", "http://x.com/a",
+                              "https://www.x.com/b?page=2", "https://x.com/b?page=2", "https://x.com/b"],
+            "https://www.x.com/a": ["https://www.x.com/", "https://x.com/b"],
+        }
+        session = _SiteSession(links)
+        engine = CrawlEngine("https://x.com", concurrency=2, per_host_rps=1000, session=session)
+
+        records = engine.crawl(_handle, max_pages=4)
+        assert sorted(session.requested) == ["https://www.x.com/a", "https://www.x.com/b?page=2",
+                                             "https://x.com", "https://x.com/b"]
+        assert len(records) == 4
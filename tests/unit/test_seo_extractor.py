@@ -0,0 +1,85 @@
+"""
+tests/unit/test_seo_extractor.py
+Unit tests for execution/seo_extractor.py
+
+Tests:
+- Streaming extractor matches the BeautifulSoup reference on saved fixtures
+- Link classification, alt-less images and JSON-LD detection
+- Word count joins adjacent text nodes like get_text()
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+FIXTURES_DIR = Path(__file__).resolve().parents[1] / "fixtures" / "seo_pages"
+
+
+@pytest.mark.parametrize("fixture", sorted(FIXTURES_DIR.glob("*.html")), ids=lambda p: p.name)
+def test_matches_soup_reference(fixture):
+    pytest.importorskip("bs4")
+    from execution.seo_extractor import extract_page_fields, extract_with_soup
+
+    html = fixture.read_text(encoding="utf-8", errors="replace")
+    assert extract_page_fields(html, "example.com") == extract_with_soup(html, "example.com")
+
+
+class TestExtractPageFields:
+    HTML = """
+    <html><head>
+      <title> Widgets &amp; Co </title>
+      <meta name="description" content="  Best widgets in town.  ">
+      <script type="application/ld+json">{"@type": "Organization"}</script>
+      <style>.hidden { display: none }</style>
+    </head><body>
+      <h1>Main <span>heading</span></h1>
+      <h2>First</h2><h2>Second</h2>
+      <img src="/a.png" alt="A"><img src="/b.png"><img src="/c.png" alt="">
+      <a href="/about">About</a>
+      <a href="https://example.com/contact">Contact</a>
+      <a href="https://other.org/">Other</a>
+      <a href="mailto:hi@example.org">Mail</a>
+      <a name="anchor">No href</a>
+      <p>alpha</p><p>beta</p>
+      <script>var ignored = "words words words";</script>
+    </body></html>
+    """
+
+    def _fields(self):
+        from execution.seo_extractor import extract_page_fields
+        return extract_page_fields(self.HTML, "example.com")
+
+    def test_title_and_description(self):
+        fields = self._fields()
+        assert fields["title"] == "Widgets & Co"
+        assert fields["description"] == "Best widgets in town."
+
+    def test_headings_include_nested_text(self):
+        fields = self._fields()
+        assert fields["h1_tags"] == ["Main heading"]
+        assert fields["h2_tags"] == ["First", "Second"]
+
+    def test_images_without_alt(self):
+        fields = self._fields()
+        assert fields["images_total"] == 3
+        assert fields["images_without_alt"] == ["/b.png", "/c.png"]
+
+    def test_link_classification(self):
+        fields = self._fields()
+        assert fields["internal_links_count"] == 2
+        assert fields["external_links_count"] == 1
+        assert len(fields["hrefs"]) == 4
+
+    def test_json_ld_detected(self):
+        assert self._fields()["has_schema"] is True
+
+    def test_word_count_skips_script_and_joins_text_nodes(self):
+        # "alphabeta" is one word because adjacent text nodes are concatenated
+        from execution.seo_extractor import extract_page_fields
+        fields = extract_page_fields("<p>alpha</p><p>beta</p><script>words here</script>", "x")
+        assert fields["word_count"] == 1
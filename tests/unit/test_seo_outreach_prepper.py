@@ -0,0 +1,80 @@
+"""
+tests/unit/test_seo_outreach_prepper.py
+Unit tests for execution/seo_outreach_prepper.py
+
+Tests:
+- Batch audits run in-process with at most `workers` in flight
+- Each finished domain is checkpointed; a resumed run skips them and retries failures
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def prepper():
+    import execution.seo_outreach_prepper as prepper
+    return prepper
+
+
+def _fake_audit(log, fail=()):
+    state = {"in_flight": 0, "peak": 0}
+
+    async def run_audit_async(url, keywords=None, modules=None, competitors=None, client=None):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        log.append(url)
+        if any(f in url for f in fail):
+            raise RuntimeError("DataForSEO timeout")
+        return {"status": "success", "data": {"score": 70, "improvements": ["Missing H1."]}}
+
+    return run_audit_async, state
+
+
+def test_batch_is_bounded_and_checkpointed(prepper, monkeypatch, tmp_path):
+    calls = []
+    fake, state = _fake_audit(calls, fail=("b.com",))
+    monkeypatch.setattr(prepper, "run_audit_async", fake)
+    checkpoint = tmp_path / "run.jsonl"
+    drafts = []
+
+    targets = ["a.com", "b.com", "https://c.com/", "A.com"] + [f"x{i}.com" for i in range(6)]
+    counts = asyncio.run(prepper.run_batch(targets, checkpoint, workers=3,
+                                           on_draft=drafts.append, client=object()))
+
+    assert counts == {"total": 9, "skipped": 0, "ok": 8, "failed": 1}
+    assert state["peak"] == 3
+    assert len(drafts) == 9
+    records = [json.loads(line) for line in checkpoint.read_text().splitlines()]
+    assert {r["domain"] for r in records if r["status"] == "ok"} >= {"a.com", "c.com"}
+    assert "a.com" in next(r["email"] for r in records if r["domain"] == "a.com")
+
+
+def test_resume_skips_finished_domains(prepper, monkeypatch, tmp_path):
+    checkpoint = tmp_path / "run.jsonl"
+    checkpoint.write_text(
+        json.dumps({"domain": "a.com", "status": "ok"}) + "\n"
+        + json.dumps({"domain": "b.com", "status": "error"}) + "\n"
+        + '{"domain": "c.c'  # torn line from a crash
+    )
+    calls = []
+    fake, _ = _fake_audit(calls)
+    monkeypatch.setattr(prepper, "run_audit_async", fake)
+
+    counts = asyncio.run(prepper.run_batch(["a.com", "b.com", "c.com"], checkpoint, client=object()))
+
+    assert sorted(calls) == ["https://b.com", "https://c.com"]
+    assert counts["skipped"] == 1 and counts["ok"] == 2
+    assert prepper.load_checkpoint(checkpoint) == {"a.com", "b.com", "c.com"}
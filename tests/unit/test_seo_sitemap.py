@@ -0,0 +1,137 @@
+"""
+tests/unit/test_seo_sitemap.py
+Unit tests for execution/seo_sitemap.py
+
+Tests:
+- <lastmod> parsing (date-only, Z suffix, invalid)
+- Delta planning against a previous report
+- iter_sitemap follows sitemap indexes (nested, and looping back on
+  themselves), reads .xml.gz sitemaps, and detaches each parsed entry
+  from the root
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+requests = pytest.importorskip("requests")
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def _urlset(*locs):
+    urls = "".join(f"<url><loc>{loc}</loc><lastmod>2026-01-0{i + 1}</lastmod></url>"
+                   for i, loc in enumerate(locs))
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{urls}</urlset>'.encode()
+
+
+def _index(*locs):
+    sitemaps = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex {NS}>{sitemaps}</sitemapindex>'.encode()
+
+
+class _SitemapSession:
+    """Serves fixed bodies by URL (404 otherwise) and records what was fetched."""
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        resp = requests.Response()
+        resp.status_code = 200 if url in self.bodies else 404
+        resp.raw = io.BytesIO(self.bodies.get(url, b""))
+        return resp
+
+
+class TestParseLastmod:
+    def test_date_only_is_end_of_day(self):
+        from execution.seo_sitemap import parse_lastmod
+        assert parse_lastmod("2026-01-05") > parse_lastmod("2026-01-05T23:00:00Z")
+
+    def test_z_suffix_is_utc(self):
+        from execution.seo_sitemap import parse_lastmod
+        assert parse_lastmod("2026-01-05T10:00:00Z").utcoffset().total_seconds() == 0
+
+    def test_invalid_returns_none(self):
+        from execution.seo_sitemap import parse_lastmod
+        assert parse_lastmod("last tuesday") is None
+        assert parse_lastmod(None) is None
+
+
+class TestPlanDelta:
+    PREVIOUS = {
+        "analysis_date": "2026-03-01T09:00:00+00:00",
+        "pages": [
+            {"url": "https://x.com/a", "page_score": 80},
+            {"url": "https://x.com/b", "page_score": 60},
+            {"url": "https://x.com/c", "page_score": 70},
+        ],
+    }
+
+    def test_without_previous_report_crawls_everything(self):
+        from execution.seo_sitemap import plan_delta
+        to_crawl, carried = plan_delta([("https://x.com/a", None), ("https://x.com/a", None)], None)
+        assert to_crawl == ["https://x.com/a"]
+        assert carried == []
+
+    def test_splits_changed_and_unchanged(self):
+        from execution.seo_sitemap import plan_delta
+        entries = [
+            ("https://x.com/a", "2026-02-01"),            # unchanged -> carried
+            ("https://x.com/b", "2026-03-02T00:00:00Z"),  # changed after report
+            ("https://x.com/c", None),                    # no lastmod -> crawl
+            ("https://x.com/d", "2020-01-01"),            # new page -> crawl
+        ]
+        to_crawl, carried = plan_delta(entries, self.PREVIOUS)
+        assert to_crawl == ["https://x.com/b", "https://x.com/c", "https://x.com/d"]
+        assert [p["url"] for p in carried] == ["https://x.com/a"]
+
+
+class TestIterSitemap:
+    def test_plain_urlset(self):
+        from execution.seo_sitemap import iter_sitemap
+        session = _SitemapSession({"https://x.com/sitemap.xml": _urlset("https://x.com/a", "https://x.com/b")})
+        assert list(iter_sitemap(session, "https://x.com/sitemap.xml")) == [
+            ("https://x.com/a", "2026-01-01"), ("https://x.com/b", "2026-01-02")]
+
+    def test_index_with_gzipped_sitemap(self):
+        from execution.seo_sitemap import iter_sitemap
+        session = _SitemapSession({
+            "https://x.com/sitemap.xml": _index("https://x.com/pages.xml", "https://x.com/posts.xml.gz"),
+            "https://x.com/pages.xml": _urlset("https://x.com/a"),
+            "https://x.com/posts.xml.gz": gzip.compress(_urlset("https://x.com/p1", "https://x.com/p2")),
+        })
+        assert [loc for loc, _ in iter_sitemap(session, "https://x.com/sitemap.xml")] == [
+            "https://x.com/a", "https://x.com/p1", "https://x.com/p2"]
+
+    def test_nested_indexes_are_visited_once(self):
+        from execution.seo_sitemap import iter_sitemap
+        session = _SitemapSession({
+            "https://x.com/sitemap.xml": _index("https://x.com/blog/index.xml", "https://x.com/missing.xml"),
+            "https://x.com/blog/index.xml": _index("https://x.com/blog/2026.xml", "https://x.com/sitemap.xml"),
+            "https://x.com/blog/2026.xml": _urlset("https://x.com/blog/hello"),
+        })
+        assert list(iter_sitemap(session, "https://x.com/sitemap.xml")) == [("https://x.com/blog/hello", "2026-01-01")]
+        assert session.requested == ["https://x.com/sitemap.xml", "https://x.com/blog/index.xml",
+                                     "https://x.com/blog/2026.xml", "https://x.com/missing.xml"]
+
+    def test_parsed_entries_are_detached(self):
+        from execution.seo_sitemap import _iter_elements, _local
+        session = _SitemapSession({"https://x.com/s.xml": _urlset(*[f"https://x.com/{i}" for i in range(50)])})
+        response = session.get("https://x.com/s.xml")
+
+        # A small chunk size spreads the body over many feeds
+        elements = list(_iter_elements(response, chunk_size=64))
+        root = elements[-1]
+        assert _local(root.tag) == "urlset"
+        assert sum(_local(e.tag) == "url" for e in elements) == 50
+        assert len(root) == 0
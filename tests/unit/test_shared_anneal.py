@@ -0,0 +1,133 @@
+"""
+tests/unit/test_shared_anneal.py
+Unit tests for execution/shared/anneal.py
+
+Tests:
+- Failures, resolutions, known issues and learnings behave as they did
+  with the JSON-lines file (latest unresolved failure is the one resolved)
+- An existing anneal.log is imported once, and export_jsonl writes the
+  same format back
+- Concurrent writers from several threads and processes lose nothing
+- check_health reads unresolved failures from the store
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add repo root to path so 'execution' is importable
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture
+def anneal(tmp_path, monkeypatch):
+    import execution.shared.anneal as anneal_module
+
+    monkeypatch.setattr(anneal_module, "_ANNEAL_DB", tmp_path / "anneal.db")
+    monkeypatch.setattr(anneal_module, "_ANNEAL_LOG", tmp_path / "anneal.log")
+    yield anneal_module
+    with anneal_module._lock:
+        db = anneal_module._connections.pop(tmp_path / "anneal.db", None)
+    if db is not None:
+        db.close()
+
+
+def test_failures_and_resolutions(anneal):
+    logger = anneal.AnnealLogger
+    logger.record_failure(script="a.py", error="first", context={"n": 1})
+    logger.record_failure(script="b.py", error="other")
+    logger.record_failure(script="a.py", error="second")
+
+    logger.record_resolution(script="a.py", resolution="fixed", learning="check tokens")
+    logger.record_resolution(script="missing.py", resolution="nothing to resolve")
+
+    issues = logger.get_known_issues()
+    assert [(i["script"], i["error"]) for i in issues] == [("a.py", "first"), ("b.py", "other")]
+    assert issues[0]["context"] == {"n": 1} and issues[0]["resolved"] is False
+    assert "resolved_ts" not in issues[0]
+    assert [i["error"] for i in logger.get_known_issues("a.py")] == ["first"]
+
+    (learning,) = logger.get_learnings()
+    assert (learning["error"], learning["resolution"], learning["learning"]) == ("second", "fixed", "check tokens")
+    assert learning["resolved"] is True and learning["resolved_ts"]
+
+    logger.record_resolution(script="a.py", resolution="fixed too")
+    assert [e["error"] for e in logger.get_learnings()] == ["first", "second"]
+    assert [e["error"] for e in logger.get_learnings(limit=1)] == ["second"]
+
+
+def test_imports_and_exports_jsonl(anneal, tmp_path):
+    legacy = [
+        {"ts": "2026-09-01T10:00:00+00:00", "type": "FAILURE", "script": "a.py", "directive": "",
+         "error": "timeout", "context": {"url": "x"}, "resolved": True, "resolution": "retry",
+         "learning": "add backoff", "resolved_ts": "2026-09-02T10:00:00+00:00"},
+        {"ts": "2026-09-03T10:00:00+00:00", "type": "FAILURE", "script": "b.py", "directive": "d.md",
+         "error": "401", "context": {}, "resolved": False, "resolution": None, "learning": None},
+    ]
+    (tmp_path / "anneal.log").write_text(
+        json.dumps(legacy[0]) + "\nnot json\n\n" + json.dumps(legacy[1]) + "\n", encoding="utf-8")
+
+    assert anneal.AnnealLogger.get_known_issues() == legacy[1:]
+    assert anneal.AnnealLogger.get_learnings() == legacy[:1]
+
+    anneal.AnnealLogger.record_failure(script="c.py", error="new")
+    out = tmp_path / "export.jsonl"
+    assert anneal.AnnealLogger.export_jsonl(out) == 3
+    exported = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert exported[:2] == legacy and exported[2]["error"] == "new"
+
+    # Exporting over anneal.log does not import it again
+    anneal.AnnealLogger.export_jsonl()
+    with anneal._lock:
+        anneal._connections.pop(tmp_path / "anneal.db").close()
+    assert len(anneal.AnnealLogger.get_known_issues()) == 2
+
+
+def test_concurrent_writers(anneal, tmp_path):
+    writer = (
+        "import logging, sys; sys.path.insert(0, sys.argv[1])\n"
+        "logging.disable(logging.CRITICAL)\n"
+        "from pathlib import Path\n"
+        "import execution.shared.anneal as a\n"
+        "a._ANNEAL_DB = Path(sys.argv[2])\n"
+        "a._ANNEAL_LOG = a._ANNEAL_DB.with_suffix('.log')\n"
+        "for i in range(25):\n"
+        "    a.AnnealLogger.record_failure(script=f'proc{sys.argv[3]}.py', error=str(i))\n"
+    )
+    procs = [subprocess.Popen([sys.executable, "-c", writer, str(REPO_ROOT), str(tmp_path / "anneal.db"), str(n)],
+                              stderr=subprocess.DEVNULL) for n in range(3)]
+    threads = [threading.Thread(target=lambda n=n: [
+        anneal.AnnealLogger.record_failure(script=f"thread{n}.py", error=str(i)) for i in range(25)
+    ]) for n in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(proc.wait(timeout=60) == 0 for proc in procs)
+
+    issues = anneal.AnnealLogger.get_known_issues()
+    assert len(issues) == 150
+    assert len(anneal.AnnealLogger.get_known_issues("proc1.py")) == 25
+
+
+def test_check_health_reads_store(anneal, tmp_path, monkeypatch):
+    import scripts.check_health as check_health
+
+    monkeypatch.setattr(check_health, "ANNEAL_DB", tmp_path / "anneal.db")
+    monkeypatch.setattr(check_health, "ANNEAL_LOG", tmp_path / "anneal.log")
+    assert check_health.check_anneal_log()[0].level == check_health.OK
+
+    anneal.AnnealLogger.record_failure(script="a.py", error="boom")
+    anneal.AnnealLogger.record_failure(script="b.py", error="boom")
+    anneal.AnnealLogger.record_resolution(script="b.py", resolution="fixed")
+
+    (check,) = check_health.check_anneal_log()
+    assert (check.level, check.message, check.detail) == (
+        check_health.WARN, "1 unresolved failure(s) in anneal store", "a.py")
@@ -0,0 +1,130 @@
+"""
+tests/unit/test_shared_logger.py
+Unit tests for execution/shared/logger.py
+
+Tests:
+- JSON lines carry the record's creation time, message and extra fields
+- Queued mode writes the same lines as synchronous mode once flushed, and
+  freezes %-args at call time
+- The drop policy discards past capacity and reports how many it dropped
+- Loggers keep writing (inline) after the listener is stopped
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# Add repo root to path so 'execution' is importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+@pytest.fixture
+def logs_dir(tmp_path, monkeypatch):
+    import execution.shared.logger as shared_logger
+
+    monkeypatch.setattr(shared_logger, "LOGS_DIR", tmp_path)
+    console = open(tmp_path / "console.txt", "w", encoding="utf-8")
+    monkeypatch.setattr(sys, "stderr", console)
+    yield tmp_path
+    shared_logger.stop_queued_logging()
+    console.close()
+
+
+def _lines(logs_dir: Path) -> list[dict]:
+    from execution.shared.log_store import iter_records
+    return list(iter_records(logs_dir))
+
+
+def _close(log: logging.Logger) -> None:
+    handlers = list(log.handlers)
+    for handler in log.handlers:
+        handlers += getattr(getattr(handler, "listener", None), "handlers", ())
+    for handler in handlers:
+        handler.close()
+    log.handlers.clear()
+
+
+def test_json_line_fields(logs_dir):
+    from execution.shared.logger import _JSONFormatter
+
+    record = logging.makeLogRecord({
+        "name": "shared.test", "levelname": "INFO", "levelno": logging.INFO,
+        "msg": "Invoice %s created", "args": ("INV-001",), "created": 1_790_000_000.25,
+        "client": "nexairi", "amount": 12.5,
+    })
+    line = json.loads(_JSONFormatter().format(record))
+
+    assert line == {
+        "ts": datetime.fromtimestamp(1_790_000_000.25, timezone.utc).isoformat(),
+        "level": "INFO", "logger": "shared.test", "msg": "Invoice INV-001 created",
+        "client": "nexairi", "amount": 12.5,
+    }
+
+
+def test_queued_matches_sync(logs_dir):
+    from execution.shared.logger import get_logger, stop_queued_logging
+
+    pages = ["a"]
+    for name, queued in (("sync", False), ("queued", True)):
+        log = get_logger(f"test.logger.{name}", level="INFO", queued=queued)
+        log.info("Fetched %s", pages, extra={"status": 200})
+        pages.append("b")  # Mutated after the call: the logged message must not change
+        log.debug("Not logged at INFO")
+        log.warning("Slow page", extra={"ms": 950})
+        pages.pop()
+    stop_queued_logging()
+    for name in ("sync", "queued"):
+        _close(logging.getLogger(f"test.logger.{name}"))
+
+    lines = _lines(logs_dir)
+    for line in lines:
+        line.pop("ts")
+    sync = [line for line in lines if line.pop("logger") == "test.logger.sync"]
+    assert sync == [
+        {"level": "INFO", "msg": "Fetched ['a']", "status": 200},
+        {"level": "WARNING", "msg": "Slow page", "ms": 950},
+    ]
+    assert lines == sync + sync
+
+
+def test_drop_policy_counts(logs_dir):
+    from execution.shared.logger import _BoundedQueueHandler
+
+    log_queue = queue.SimpleQueue()
+    handler = _BoundedQueueHandler(log_queue, capacity=2, policy="drop")
+    handler.listener = type("Idle", (), {"flush_soon": lambda self: None})()
+    log = logging.getLogger("test.logger.drop")
+    log.propagate = False
+    log.addHandler(handler)
+
+    for i in range(5):
+        log.warning("record %d", i)
+    assert (log_queue.qsize(), handler.dropped_total) == (2, 3)
+
+    log_queue.get_nowait()
+    log.warning("after")
+    queued = [log_queue.get_nowait() for _ in range(log_queue.qsize())]
+    assert [r.getMessage() for r in queued] == [
+        "record 1", "Log queue full: dropped 3 record(s)", "after",
+    ]
+    assert queued[1].dropped == 3 and handler.dropped == 0
+    log.removeHandler(handler)
+
+
+def test_logging_after_stop(logs_dir):
+    from execution.shared.logger import get_logger, stop_queued_logging
+
+    log = get_logger("test.logger.late", queued=True)
+    log.info("before stop")
+    stop_queued_logging()
+    log.info("after stop")
+    _close(log)
+
+    assert [line["msg"] for line in _lines(logs_dir)] == ["before stop", "after stop"]
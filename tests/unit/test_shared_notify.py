@@ -0,0 +1,138 @@
+"""
+tests/unit/test_shared_notify.py
+Unit tests for execution/shared/notify.py
+
+Tests:
+- Alerts are sent on the dispatcher thread, not the caller's, to every
+  configured channel through a pooled session
+- Repeats of a failure are counted and sent as one summary ("N× Type in
+  `script`"); different errors are not merged, and a storm that outlasts
+  several windows is counted in full
+- Each channel is held to its rate limit
+- flush_notifications() delivers everything still queued
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add repo root to path so 'execution' is importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+@pytest.fixture
+def notify(monkeypatch):
+    import execution.shared.notify as notify_module
+
+    sent = []
+
+    def sender(channel):
+        def send(*args, session=None):
+            sent.append((channel, args[-1], threading.current_thread().name, session is not None))
+            return True
+        return send
+
+    monkeypatch.setattr(notify_module, "_get_settings", lambda: SimpleNamespace(
+        notifications_enabled=True, telegram_bot_token="token", telegram_chat_id="chat",
+        slack_webhook_url="https://hooks.slack.invalid/x",
+    ))
+    monkeypatch.setitem(notify_module._SENDERS, "telegram", sender("telegram"))
+    monkeypatch.setitem(notify_module._SENDERS, "slack", sender("slack"))
+    monkeypatch.setattr(notify_module, "_dispatcher_instance", None)
+    notify_module._bursts.clear()
+    monkeypatch.setattr(notify_module, "sent", sent, raising=False)
+    yield notify_module
+    notify_module.flush_notifications(timeout=5)
+    notify_module._bursts.clear()
+
+
+def test_sent_in_background(notify):
+    assert notify.send_failure_alert(script="create_qbo_invoice", error="Auth expired", error_type="AuthExpiredError")
+    notify.send_info("Batch done", details={"count": 3})
+    assert notify.flush_notifications(timeout=5)
+
+    assert sorted((channel, thread, pooled) for channel, _, thread, pooled in notify.sent) == [
+        ("slack", "shared.notify", True), ("slack", "shared.notify", True),
+        ("telegram", "shared.notify", True), ("telegram", "shared.notify", True),
+    ]
+    texts = [text for channel, text, _, _ in notify.sent if channel == "telegram"]
+    assert "Auth expired" in texts[0] and "Batch done" in texts[1]
+
+
+def test_repeats_coalesced(notify):
+    for i in range(37):
+        notify.send_failure_alert(script="create_qbo_invoice", error=f"QBO 503 for INV-{i}", error_type="APIError")
+    notify.send_failure_alert(script="create_qbo_invoice", error="Token expired", error_type="AuthExpiredError")
+    notify.send_failure_alert(script="sync_leads", error="QBO 503", error_type="APIError")
+    assert notify.flush_notifications(timeout=5)
+
+    texts = [text for channel, text, _, _ in notify.sent if channel == "slack"]
+    assert len(texts) == 4
+    assert "INV-0" in texts[0] and "Token expired" in texts[1] and "sync_leads" in texts[2]
+    assert texts[3].startswith("🔴 *5 Cypress — 37× APIError in `create_qbo_invoice`*")
+    assert "INV-36" in texts[3]
+
+    # After its window closed, the failure alerts again
+    notify.send_failure_alert(script="create_qbo_invoice", error="QBO 503 again", error_type="APIError")
+    assert notify.flush_notifications(timeout=5)
+    assert "QBO 503 again" in notify.sent[-1][1]
+
+
+def test_summary_sent_when_window_closes(notify, monkeypatch):
+    monkeypatch.setenv("NOTIFY_COALESCE_SECONDS", "0.3")
+    for _ in range(3):
+        notify.send_failure_alert(script="scrape", error="timeout", error_type="APIError")
+
+    deadline = time.monotonic() + 5
+    while len(notify.sent) < 4 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert [text.split("\n")[0] for channel, text, _, _ in notify.sent if channel == "telegram"] == [
+        "🔴 *5 Cypress — Script Failure*", "🔴 *5 Cypress — 3× APIError in `scrape`*",
+    ]
+
+
+def test_sustained_storm_counts_every_failure(notify, monkeypatch):
+    monkeypatch.setitem(notify.CHANNEL_RATES, "telegram", (1000.0, 1000))
+    monkeypatch.setitem(notify.CHANNEL_RATES, "slack", (1000.0, 1000))
+    monkeypatch.setenv("NOTIFY_COALESCE_SECONDS", "0.05")
+    calls = 0
+    end = time.monotonic() + 0.5  # ~10 window boundaries
+    while time.monotonic() < end:
+        notify.send_failure_alert(script="qbo_sync", error=f"HTTP 503 #{calls}", error_type="APIError")
+        calls += 1
+        time.sleep(0.0005)
+    assert notify.flush_notifications(timeout=5)
+
+    counted = 0
+    for channel, text, _, _ in notify.sent:
+        if channel != "telegram":
+            continue
+        summary = re.match(r"🔴 \*5 Cypress — (\d+)× APIError", text)
+        # A summary's count includes its burst's first alert, sent on its own
+        counted += int(summary.group(1)) - 1 if summary else 1
+    assert counted == calls
+    assert sum("× APIError" in text for channel, text, _, _ in notify.sent if channel == "telegram") > 2
+
+
+def test_rate_limited_per_channel(notify, monkeypatch):
+    monkeypatch.setitem(notify.CHANNEL_RATES, "telegram", (20.0, 2))
+    monkeypatch.setattr(notify, "_get_settings", lambda: SimpleNamespace(
+        notifications_enabled=True, telegram_bot_token="token", telegram_chat_id="chat", slack_webhook_url="",
+    ))
+    stamps = []
+    monkeypatch.setitem(notify._SENDERS, "telegram", lambda *args, session=None: stamps.append(time.monotonic()))
+
+    for i in range(8):
+        notify.send_info(f"message {i}")
+    assert notify.flush_notifications(timeout=5)
+
+    assert len(stamps) == 8
+    # 2 at once, then 20 a second: the last 6 take at least 0.3s
+    assert stamps[-1] - stamps[0] >= 0.27
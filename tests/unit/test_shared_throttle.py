@@ -0,0 +1,185 @@
+"""
+tests/unit/test_shared_throttle.py
+Unit tests for execution/shared/throttle.py and its use in with_retry
+
+Tests:
+- Consecutive failures open the circuit; with_retry then fails fast without
+  calling the function, lets one trial through after open_seconds, and a
+  successful trial closes the circuit
+- A RateLimitError's retry_after holds back every thread, not just the caller
+- A burst of simultaneous 429s cuts the rate once, and the callers wait
+  about retry_after, not minutes
+- Threads hammering a rate-limited provider settle near its limit
+- SQLite state (THROTTLE_STATE) is shared between throttles of different
+  processes
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add repo root to path so 'execution' is importable
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+@pytest.fixture
+def throttles(monkeypatch):
+    import execution.shared.throttle as throttle_module
+
+    monkeypatch.setattr(throttle_module, "_throttles", {})
+    return throttle_module
+
+
+def test_circuit_opens_and_recovers(throttles):
+    from execution.shared.errors import APIError, CircuitOpenError
+    from execution.shared.retry import RetryConfig, with_retry
+
+    throttles._throttles["qbo"] = throttles.ProviderThrottle("qbo", failure_threshold=3, open_seconds=0.3)
+    config = RetryConfig(max_attempts=2, base_delay=0.0, exponential_base=1.0, jitter=False)
+    calls = []
+
+    def down():
+        calls.append("down")
+        raise APIError("503 Service Unavailable", provider="qbo", status_code=503)
+
+    with pytest.raises(APIError):
+        with_retry(down, config=config, provider="qbo")
+    with pytest.raises(CircuitOpenError) as exc_info:  # Third failure opens it on the first attempt
+        with_retry(down, config=config, provider="qbo")
+    assert len(calls) == 3 and 0 < exc_info.value.ctx["retry_after"] <= 0.3
+
+    with pytest.raises(CircuitOpenError):
+        with_retry(down, config=config, provider="qbo")
+    assert len(calls) == 3  # Failed fast
+
+    time.sleep(0.35)
+    assert with_retry(lambda: "ok", config=config, provider="qbo") == "ok"
+    assert throttles._throttles["qbo"].snapshot()["circuit"] == throttles.CLOSED
+
+
+def test_half_open_allows_one_trial(throttles):
+    from execution.shared.errors import APIError, CircuitOpenError
+
+    throttle = throttles.ProviderThrottle("qbo", failure_threshold=1, open_seconds=0.2)
+    throttle.acquire()
+    throttle.record_failure(APIError("down", provider="qbo"))
+    time.sleep(0.25)
+
+    throttle.acquire()  # The trial
+    with pytest.raises(CircuitOpenError):
+        throttle.acquire()
+    throttle.record_failure(APIError("still down", provider="qbo"))
+    assert throttle.snapshot()["circuit"] == throttles.OPEN
+
+
+def test_retry_after_pauses_every_thread(throttles):
+    from execution.shared.errors import RateLimitError
+
+    throttle = throttles.ProviderThrottle("serp", rate=100.0)
+    throttle.record_failure(RateLimitError("429", provider="serp", retry_after=0.3))
+    assert throttle.snapshot()["rate"] == 50.0
+
+    start = time.monotonic()
+    waited = []
+
+    def call():
+        throttle.acquire()
+        waited.append(time.monotonic() - start)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert min(waited) >= 0.28
+
+
+def test_simultaneous_429s_cut_rate_once(throttles):
+    from execution.shared.errors import RateLimitError
+
+    throttle = throttles.ProviderThrottle("dataforseo")
+    barrier = threading.Barrier(12)
+
+    def refused():
+        barrier.wait()
+        throttle.record_failure(RateLimitError("429", provider="dataforseo", retry_after=0.3))
+
+    threads = [threading.Thread(target=refused) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert throttle.snapshot()["rate"] == 15.0
+
+    start = time.monotonic()
+    waited = []
+
+    def call():
+        throttle.acquire()
+        waited.append(time.monotonic() - start)
+
+    threads = [threading.Thread(target=call) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # The 0.3s pause, then 12 tokens at 15 a second
+    assert 0.25 <= min(waited) and max(waited) <= 0.3 + 12 / 15 + 0.2
+
+
+def test_rate_converges_to_provider_limit(throttles):
+    from execution.shared.errors import RateLimitError
+    from execution.shared.retry import RetryConfig, with_retry
+
+    limit = 40  # Requests a second the provider allows, enforced as 10 in any 0.25s
+    throttles._throttles["api"] = throttles.ProviderThrottle("api", rate=200.0)
+    lock = threading.Lock()
+    window: list[float] = []
+    served, refused = [], []
+
+    def provider():
+        now = time.monotonic()
+        with lock:
+            while window and window[0] <= now - 0.25:
+                window.pop(0)
+            if len(window) >= limit // 4:
+                refused.append(now)
+                raise RateLimitError("429", provider="api", retry_after=0.05)
+            window.append(now)
+            served.append(now)
+
+    config = RetryConfig(max_attempts=50, jitter=False)
+    stop = time.monotonic() + 2.0
+
+    def client():
+        while time.monotonic() < stop:
+            with_retry(provider, config=config, provider="api")
+
+    threads = [threading.Thread(target=client) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    settled = [t for t in served if t > stop - 1.0]
+    assert 0.75 * limit <= len(settled) <= 1.1 * limit
+    assert len(refused) < len(served) / 4
+
+
+def test_sqlite_state_shared(throttles, tmp_path):
+    from execution.shared.errors import APIError, CircuitOpenError
+
+    path = tmp_path / "throttle.sqlite"
+    first = throttles.ProviderThrottle("qbo", failure_threshold=1, open_seconds=60, state_path=path)
+    second = throttles.ProviderThrottle("qbo", failure_threshold=1, open_seconds=60, state_path=path)
+
+    first.acquire()
+    first.record_failure(APIError("down", provider="qbo"))
+    with pytest.raises(CircuitOpenError):
+        second.acquire()
+    assert second.snapshot()["circuit"] == throttles.OPEN